@@ -0,0 +1,152 @@
+"""
+Benchmark de búsqueda en la base de conocimiento: puntuación por subcadenas (implementación
+anterior de KnowledgeRepository.search_relevant_context) contra el índice BM25 y, si NumPy está
+instalado, contra la búsqueda vectorial e híbrida.
+
+Genera un corpus sintético de secciones con el vocabulario de la base de conocimiento incluida
+y mide el tiempo por consulta de cada método.
+
+Uso (desde baba-chatbot-python):
+    PYTHONPATH=src python benchmarks/kb_retrieval.py [--sections 10000] [--queries 500]
+"""
+import os
+import time
+import random
+import argparse
+import statistics
+from typing import Callable, Dict, List, Tuple
+
+# La capa de aplicación debe inicializarse antes que las integraciones (igual que en la API)
+from baba_chatbot.application import conversation  # noqa: F401
+from baba_chatbot.integrations.llm import KnowledgeRepository
+from baba_chatbot.integrations.llm.bm25_index import Bm25Index
+from baba_chatbot.integrations.llm.vector_index import HashedVectorIndex, numpy_available
+
+
+DEFAULT_KB_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "rag", "kb_sources")
+
+
+def legacy_search(documents: Dict[str, str], query: str, max_chunks: int) -> List[str]:
+    """
+    Puntuación anterior: divide y pasa a minúsculas cada documento en cada consulta
+    y suma un punto por palabra de la consulta contenida en la sección.
+    """
+    query_words = set(
+        word.lower()
+        for word in query.replace(',', ' ').replace('.', ' ')
+        .replace('?', ' ').replace('!', ' ').split()
+        if len(word) > 3
+    )
+    if not query_words:
+        return []
+
+    relevant_sections: List[Tuple[str, int]] = []
+    for content in documents.values():
+        for section in legacy_split(content):
+            section_lower = section.lower()
+            score = sum(1 for word in query_words if word in section_lower)
+            if score > 0:
+                relevant_sections.append((section, score))
+
+    top_sections = sorted(relevant_sections, key=lambda x: x[1], reverse=True)[:max_chunks]
+    return [section for section, _ in top_sections]
+
+
+def legacy_split(content: str) -> List[str]:
+    """División en secciones por encabezados ## y ### (igual que el repositorio)."""
+    sections: List[str] = []
+    current: List[str] = []
+    for line in content.split('\n'):
+        if (line.startswith('## ') or line.startswith('### ')) and current:
+            text = '\n'.join(current).strip()
+            if len(text) > 50:
+                sections.append(text)
+            current = []
+        current.append(line)
+    if current:
+        text = '\n'.join(current).strip()
+        if len(text) > 50:
+            sections.append(text)
+    return sections
+
+
+def build_corpus(vocabulary: List[str], sections: int, documents: int, seed: int) -> Dict[str, str]:
+    """Genera documentos markdown sintéticos con secciones de longitud variable."""
+    rng = random.Random(seed)
+    corpus: Dict[str, List[str]] = {f"doc{index}.md": [] for index in range(documents)}
+    names = list(corpus)
+
+    for index in range(sections):
+        words = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(20, 200)))
+        corpus[names[index % documents]].append(f"## Sección {index}\n{words}\n")
+
+    return {name: '\n'.join(parts) for name, parts in corpus.items()}
+
+
+def measure(search: Callable[[str], object], queries: List[str]) -> Tuple[float, float, float]:
+    """Ejecuta las consultas y devuelve (media, p50, p95) en milisegundos."""
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return statistics.fmean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de búsqueda en la base de conocimiento")
+    parser.add_argument("--kb-path", default=DEFAULT_KB_PATH, help="Base de conocimiento para el vocabulario")
+    parser.add_argument("--sections", type=int, default=10000, help="Secciones del corpus sintético")
+    parser.add_argument("--documents", type=int, default=100, help="Documentos del corpus sintético")
+    parser.add_argument("--queries", type=int, default=500, help="Consultas a medir")
+    parser.add_argument("--legacy-queries", type=int, default=50, help="Consultas a medir con el método anterior")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    repository = KnowledgeRepository(args.kb_path)
+    vocabulary = [word for section in repository._snapshot.sections for word in section.text.split()]
+    if not vocabulary:
+        raise SystemExit(f"No documents found in {args.kb_path}")
+
+    corpus = build_corpus(vocabulary, args.sections, args.documents, args.seed)
+    sections = [section for content in corpus.values() for section in legacy_split(content)]
+
+    rng = random.Random(args.seed + 1)
+    queries = [
+        ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 12)))
+        for _ in range(args.queries)
+    ]
+
+    started = time.perf_counter()
+    index = Bm25Index.from_texts(sections)
+    build_seconds = time.perf_counter() - started
+
+    print(f"Corpus: {len(sections)} sections, {index.vocabulary_size} terms "
+          f"(BM25 build {build_seconds:.2f}s)")
+
+    results = {
+        "legacy substring": measure(
+            lambda query: legacy_search(corpus, query, 3), queries[:args.legacy_queries]
+        ),
+        "bm25": measure(lambda query: index.search(query, 3), queries)
+    }
+
+    if numpy_available():
+        started = time.perf_counter()
+        vectors = HashedVectorIndex(sections)
+        print(f"Vectors: {vectors.matrix.shape} ({vectors.matrix.nbytes / 2**20:.1f} MiB, "
+              f"build {time.perf_counter() - started:.2f}s)")
+
+        results["vector"] = measure(lambda query: vectors.search(query, 3), queries)
+        results["hybrid"] = measure(
+            lambda query: vectors.hybrid_search(query, index.search(query, 15), 3, 0.5), queries
+        )
+
+    for name, (mean, p50, p95) in results.items():
+        print(f"{name:>18}: mean {mean:8.3f}ms  p50 {p50:8.3f}ms  p95 {p95:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark del envío de mensajes a Twilio contra un servidor local que imita la API de mensajes.
+
+El servidor responde con una latencia fija, devuelve 429 o 503 en una fracción de las solicitudes
+y registra el orden en que llega cada mensaje. Se envían varios segmentos a cada destinatario
+y se mide el tiempo total con distintos límites de concurrencia, verificando que cada
+destinatario reciba sus segmentos en orden y cuántas conexiones se abrieron.
+
+Uso (desde baba-chatbot-python):
+    PYTHONPATH=src python benchmarks/twilio_sender.py [--recipients 50] [--segments 3]
+"""
+import json
+import logging
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from baba_chatbot.integrations.twilio import TwilioClient
+
+
+class FakeTwilioServer:
+    """Servidor HTTP/1.1 mínimo con keep-alive que imita POST .../Messages.json."""
+
+    def __init__(self, latency_seconds: float, error_rate: float, seed: int = 7):
+        self._latency_seconds = latency_seconds
+        self._error_rate = error_rate
+        self._random = random.Random(seed)
+        self._server = None
+        self.received: Dict[str, List[str]] = {}
+        self.connections = 0
+        self.errors = 0
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                form = parse_qs((await reader.readexactly(int(headers.get("content-length", 0)))).decode())
+                await asyncio.sleep(self._latency_seconds)
+
+                if self._random.random() < self._error_rate:
+                    self.errors += 1
+                    status, body = self._random.choice([("429 Too Many Requests", "{}"), ("503 Service Unavailable", "{}")])
+                else:
+                    to = form["To"][0]
+                    self.received.setdefault(to, []).append(form["Body"][0])
+                    status, body = "201 Created", json.dumps({"sid": f"SM{sum(map(len, self.received.values()))}"})
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\nRetry-After: 0\r\n\r\n{body}".encode()
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(recipients: int, segments: int, concurrency: int, latency: float, error_rate: float) -> Tuple[float, FakeTwilioServer, Dict[str, float]]:
+    server = FakeTwilioServer(latency, error_rate)
+    base_url = await server.start()
+    client = TwilioClient("ACbench", "token", "whatsapp:+10000000000", base_url=base_url,
+                          max_concurrency=concurrency, max_retries=5, backoff_seconds=0.01)
+
+    async def conversation(number: int) -> None:
+        # Cada segmento se envía en cuanto "está listo", como en el streaming de respuestas
+        sends = [
+            asyncio.create_task(client.send_message(f"whatsapp:+52{number:04d}", f"segmento {segment}"))
+            for segment in range(segments)
+        ]
+        await asyncio.gather(*sends)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(conversation(number) for number in range(recipients)))
+    elapsed = time.perf_counter() - started
+
+    metrics = client.get_metrics()
+    await client.aclose()
+    await server.stop()
+    return elapsed, server, metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=50)
+    parser.add_argument("--segments", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="Latencia del servidor en segundos")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Fracción de respuestas 429/503")
+    args = parser.parse_args()
+
+    # Los reintentos se cuentan en las métricas; sus advertencias no se muestran
+    logging.getLogger("baba_chatbot").setLevel(logging.ERROR)
+
+    expected = [f"segmento {segment}" for segment in range(args.segments)]
+    print(f"{args.recipients} destinatarios x {args.segments} segmentos, latencia {args.latency * 1000:.0f} ms, "
+          f"errores {args.error_rate:.0%}")
+    for concurrency in (1, 4, 16):
+        elapsed, server, metrics = asyncio.run(
+            run(args.recipients, args.segments, concurrency, args.latency, args.error_rate)
+        )
+        in_order = all(messages == expected for messages in server.received.values())
+        delivered = sum(map(len, server.received.values()))
+        print(
+            f"concurrencia {concurrency:>3}: {elapsed:6.2f}s  entregados {delivered}  "
+            f"reintentos {metrics['twilio_retries_total']:.0f}  conexiones {server.connections}  "
+            f"en orden: {'sí' if in_order else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,24 +14,56 @@ class Settings(BaseSettings):
     # Configuración general
     app_name: str = "Baba Chatbot"
     debug: bool = False
+    admin_token: str = ""
     
     # Twilio
     twilio_account_sid: str = ""
     twilio_auth_token: str = ""
     twilio_phone_number: str = ""
+    twilio_api_base_url: str = "https://api.twilio.com"
+    twilio_max_concurrency: int = 10
+    twilio_max_retries: int = 3
+    webhook_async_processing: bool = False
+    webhook_workers: int = 8
+    webhook_queue_max_size: int = 256
+    webhook_idempotency_max_entries: int = 10000
+    webhook_idempotency_ttl_seconds: float = 3600.0
     
     # OpenAI
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
     openai_temperature: float = 0.7
+    llm_tool_cache_max_entries: int = 1024
+    llm_tool_cache_ttl_seconds: float = 300.0
+    llm_streaming: bool = False
     
     # Catálogo
     catalog_file_path: str = "./data/catalog/cars_extract.json"
     catalog_csv_file_path: Optional[str] = None
+    catalog_columnar_store: bool = False
+    catalog_snapshot_file_path: Optional[str] = None
+    catalog_reload_interval_seconds: float = 0.0
+    catalog_delta_file_path: Optional[str] = None
+    catalog_delta_interval_seconds: float = 2.0
     
     # RAG
     knowledge_base_path: str = "./config/rag/kb_sources"
+    knowledge_base_retrieval_mode: str = "keyword"
+    knowledge_base_hybrid_vector_weight: float = 0.5
+    knowledge_base_vector_dimensions: int = 2048
+    knowledge_base_vector_index_path: Optional[str] = None
+    knowledge_base_index_file_path: Optional[str] = None
     prompts_path: str = "./config/prompts"
+    knowledge_base_reload_interval_seconds: float = 5.0
+    prompts_reload_interval_seconds: float = 5.0
+    
+    # Sesiones de conversación
+    session_store_backend: str = "memory"
+    session_max_turns: int = 6
+    session_ttl_seconds: float = 86400.0
+    session_max_sessions: int = 10000
+    session_sqlite_path: str = "./data/sessions.db"
+    session_redis_url: str = "redis://localhost:6379/0"
     
     class Config:
         env_file = ".env"
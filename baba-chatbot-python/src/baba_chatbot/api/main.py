@@ -3,13 +3,28 @@ Aplicación principal FastAPI.
 Punto de entrada de la API REST para el chatbot Baba.
 """
 import os
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from .routes import twilio_router
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from .routes import (
+    twilio_router,
+    admin_router,
+    catalog_repository,
+    knowledge_repository,
+    prompt_repository,
+    llm_client,
+    message_workers,
+    twilio_client,
+    idempotency_store,
+    session_store
+)
 from .dependencies import get_settings
+from .metrics import render_prometheus
+from ..integrations.storage import PollingFileWatcher
 
 
 # Configurar logging
@@ -25,10 +40,87 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """
     Gestor del ciclo de vida de la aplicación.
+    Inicia la precarga del catálogo en segundo plano para no retrasar el arranque
+    y, si están configurados, los observadores que recargan el catálogo cuando cambian sus
+    archivos, que aplican los deltas nuevos del feed del catálogo y que recargan la base de
+    conocimiento y los prompts cuando cambian sus archivos. Con el procesamiento asíncrono
+    del webhook, inicia los workers de mensajes y al apagar espera a que vacíen la cola.
     """
     logger.info("Starting Baba Chatbot API...")
+    settings = get_settings()
+    warmup_task = asyncio.create_task(warm_up_repositories())
+
+    catalog_watcher = None
+    if settings.catalog_reload_interval_seconds > 0:
+        catalog_watcher = PollingFileWatcher(
+            catalog_repository.source_paths,
+            catalog_repository.reload,
+            interval_seconds=settings.catalog_reload_interval_seconds,
+            name="catalog"
+        )
+        catalog_watcher.start()
+
+    delta_watcher = None
+    if catalog_repository.delta_file_path:
+        delta_watcher = PollingFileWatcher(
+            [catalog_repository.delta_file_path],
+            catalog_repository.apply_deltas,
+            interval_seconds=settings.catalog_delta_interval_seconds,
+            name="catalog deltas"
+        )
+        delta_watcher.start()
+
+    content_watchers = []
+    if settings.knowledge_base_reload_interval_seconds > 0:
+        content_watchers.append(PollingFileWatcher(
+            knowledge_repository.source_paths,
+            knowledge_repository.reload,
+            interval_seconds=settings.knowledge_base_reload_interval_seconds,
+            name="knowledge base"
+        ))
+    if settings.prompts_reload_interval_seconds > 0:
+        content_watchers.append(PollingFileWatcher(
+            prompt_repository.source_paths,
+            prompt_repository.reload,
+            interval_seconds=settings.prompts_reload_interval_seconds,
+            name="prompts"
+        ))
+    for watcher in content_watchers:
+        watcher.start()
+
+    if message_workers is not None:
+        message_workers.start()
+
     yield
+
     logger.info("Shutting down Baba Chatbot API...")
+    if message_workers is not None:
+        await message_workers.stop()
+    if twilio_client is not None:
+        await twilio_client.aclose()
+    if session_store is not None:
+        await session_store.close()
+    if catalog_watcher is not None:
+        await catalog_watcher.stop()
+    if delta_watcher is not None:
+        await delta_watcher.stop()
+    for watcher in content_watchers:
+        await watcher.stop()
+
+    warmup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup_task
+
+
+async def warm_up_repositories() -> None:
+    """
+    Precarga el catálogo de vehículos antes de la primera solicitud.
+    La base de conocimiento se carga al construir su repositorio.
+    """
+    try:
+        await catalog_repository.warm_up()
+    except Exception as ex:
+        logger.error(f"Error warming up catalog: {ex}")
 
 
 # Crear aplicación FastAPI
@@ -54,6 +146,7 @@ app.add_middleware(
 
 # Registrar rutas
 app.include_router(twilio_router, prefix="/v1/webhook/twilio", tags=["Twilio Webhook"])
+app.include_router(admin_router, prefix="/v1/admin", tags=["Admin"])
 
 
 @app.get("/", tags=["Root"])
@@ -72,11 +165,37 @@ async def root():
 async def health_check():
     """
     Endpoint de verificación de salud.
+    Responde 503 mientras el catálogo o la base de conocimiento no estén cargados.
     """
-    return {
-        "status": "healthy",
-        "service": "baba-chatbot-api"
+    checks = {
+        "catalog": catalog_repository.is_loaded,
+        "knowledge_base": knowledge_repository.is_loaded
     }
+    ready = all(checks.values())
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "healthy" if ready else "starting",
+            "service": "baba-chatbot-api",
+            "checks": checks
+        }
+    )
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Endpoint de métricas en formato Prometheus.
+    """
+    return PlainTextResponse(render_prometheus({
+        **catalog_repository.get_metrics(),
+        **llm_client.get_metrics(),
+        **(message_workers.get_metrics("webhook") if message_workers is not None else {}),
+        **(twilio_client.get_metrics() if twilio_client is not None else {}),
+        **(idempotency_store.get_metrics("webhook_idempotency") if idempotency_store is not None else {}),
+        **(session_store.get_metrics("sessions") if session_store is not None else {})
+    }))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+"""
+Cola acotada de mensajes entrantes procesados por un grupo fijo de workers en segundo plano.
+Permite responder el webhook de inmediato y procesar el mensaje después; cuando la cola está
+llena, submit lo rechaza para que el llamador aplique contrapresión.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MessageWorkerPool(Generic[T]):
+    """
+    Grupo de workers asíncronos que consumen una cola acotada.
+    Cada elemento se procesa con el handler en el event loop actual; como máximo hay
+    workers elementos en proceso y max_size elementos esperando.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[None]],
+        workers: int = 8,
+        max_size: int = 256,
+        name: str = "messages"
+    ):
+        """
+        Inicializa el grupo de workers.
+
+        Args:
+            handler: Función asíncrona que procesa un elemento
+            workers: Cantidad de elementos procesados en paralelo
+            max_size: Elementos que pueden esperar en la cola
+            name: Nombre descriptivo para los logs y métricas
+
+        Raises:
+            ValueError: Si workers o max_size no son positivos
+        """
+        if workers <= 0 or max_size <= 0:
+            raise ValueError("workers and max_size must be positive")
+
+        self._handler = handler
+        self._workers = workers
+        self._max_size = max_size
+        self._name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self._enqueued = 0
+        self._rejected = 0
+        self._processed = 0
+        self._failed = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Indica si los workers están iniciados."""
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Crea la cola e inicia los workers en el event loop actual."""
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"{self._name}-worker-{number}")
+            for number in range(self._workers)
+        ]
+        logger.info(f"Started {self._workers} {self._name} workers (queue size: {self._max_size})")
+
+    def submit(self, item: T) -> bool:
+        """
+        Encola un elemento sin esperar.
+
+        Args:
+            item: Elemento a procesar
+
+        Returns:
+            True si se encoló; False si la cola está llena o los workers no están iniciados
+        """
+        if not self._tasks:
+            return False
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            logger.warning(f"{self._name} queue is full ({self._max_size} pending)")
+            return False
+
+        self._enqueued += 1
+        return True
+
+    async def stop(self, drain_timeout_seconds: float = 10.0) -> None:
+        """
+        Espera a que se procesen los elementos pendientes (hasta drain_timeout_seconds)
+        y detiene los workers.
+
+        Args:
+            drain_timeout_seconds: Segundos máximos de espera para vaciar la cola
+        """
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Stopping {self._name} workers with {self._queue.qsize()} messages still queued"
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        """Bucle de un worker: toma elementos de la cola y los procesa uno por uno."""
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._handler(item)
+                self._processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                self._failed += 1
+                logger.error(f"Error processing queued {self._name}: {ex}")
+            finally:
+                self._queue.task_done()
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        """
+        Obtiene métricas de la cola y los workers.
+
+        Args:
+            prefix: Prefijo de los nombres de las métricas
+
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return {
+            f"{prefix}_queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            f"{prefix}_queue_capacity": self._max_size,
+            f"{prefix}_workers": len(self._tasks),
+            f"{prefix}_enqueued_total": self._enqueued,
+            f"{prefix}_rejected_total": self._rejected,
+            f"{prefix}_processed_total": self._processed,
+            f"{prefix}_failed_total": self._failed
+        }
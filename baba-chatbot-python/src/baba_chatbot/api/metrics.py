@@ -0,0 +1,25 @@
+"""
+Exposición de métricas en formato de texto de Prometheus.
+"""
+from typing import Dict
+
+
+def render_prometheus(metrics: Dict[str, float], prefix: str = "baba_") -> str:
+    """
+    Convierte un diccionario de métricas al formato de exposición de Prometheus.
+    Las métricas terminadas en "_total" se publican como counter y el resto como gauge.
+
+    Args:
+        metrics: Diccionario de nombre de métrica a valor
+        prefix: Prefijo para los nombres de las métricas
+
+    Returns:
+        Texto en formato de exposición de Prometheus
+    """
+    lines = []
+    for name, value in metrics.items():
+        metric_type = "counter" if name.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {prefix}{name} {metric_type}")
+        lines.append(f"{prefix}{name} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -2,14 +2,19 @@
 Rutas y endpoints de la API.
 """
 import logging
-from fastapi import APIRouter, Form, HTTPException
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+from fastapi import APIRouter, Form, Header, HTTPException
 from fastapi.responses import Response
 
 from .dependencies import get_settings
-from ..application.conversation.orchestrator import ConversationOrchestrator
+from .message_queue import MessageWorkerPool
+from ..application.conversation.orchestrator import ConversationOrchestrator, ConversationResponse
 from ..application.conversation.guardrails import GuardrailsValidator
 from ..integrations.llm import LlmClient, KnowledgeRepository, PromptRepository
 from ..integrations.catalog import CatalogRepository
+from ..integrations.caching import IdempotencyStore, MemoryIdempotencyBackend
+from ..integrations.sessions import SessionStore, create_session_store
+from ..integrations.twilio import TwilioClient
 
 
 logger = logging.getLogger(__name__)
@@ -17,15 +22,28 @@ logger = logging.getLogger(__name__)
 # Router para Twilio
 twilio_router = APIRouter()
 
+# Router de administración
+admin_router = APIRouter()
+
 # Inicializar dependencias (en una aplicación real, usar inyección de dependencias)
 settings = get_settings()
 
 # Inicializar servicios
-knowledge_repository = KnowledgeRepository(settings.knowledge_base_path)
+knowledge_repository = KnowledgeRepository(
+    settings.knowledge_base_path,
+    retrieval_mode=settings.knowledge_base_retrieval_mode,
+    hybrid_vector_weight=settings.knowledge_base_hybrid_vector_weight,
+    vector_dimensions=settings.knowledge_base_vector_dimensions,
+    vector_index_path=settings.knowledge_base_vector_index_path,
+    index_file_path=settings.knowledge_base_index_file_path
+)
 prompt_repository = PromptRepository(settings.prompts_path)
 catalog_repository = CatalogRepository(
     settings.catalog_file_path,
-    settings.catalog_csv_file_path
+    settings.catalog_csv_file_path,
+    columnar=settings.catalog_columnar_store,
+    delta_file_path=settings.catalog_delta_file_path,
+    snapshot_file_path=settings.catalog_snapshot_file_path
 )
 
 llm_client = LlmClient(
@@ -33,7 +51,9 @@ llm_client = LlmClient(
     model=settings.openai_model,
     temperature=settings.openai_temperature,
     knowledge_repository=knowledge_repository,
-    catalog_repository=catalog_repository
+    catalog_repository=catalog_repository,
+    tool_cache_max_entries=settings.llm_tool_cache_max_entries,
+    tool_cache_ttl_seconds=settings.llm_tool_cache_ttl_seconds
 )
 
 guardrails_validator = GuardrailsValidator()
@@ -43,6 +63,172 @@ orchestrator = ConversationOrchestrator(
     guardrails_validator=guardrails_validator
 )
 
+# Historial reciente de cada usuario (por número de teléfono) que se envía al LLM
+session_store: Optional[SessionStore] = None
+if settings.session_max_turns > 0:
+    session_store = create_session_store(
+        settings.session_store_backend,
+        max_turns=settings.session_max_turns,
+        ttl_seconds=settings.session_ttl_seconds,
+        max_sessions=settings.session_max_sessions,
+        sqlite_path=settings.session_sqlite_path,
+        redis_url=settings.session_redis_url
+    )
+
+ERROR_MESSAGE = "Lo siento, hubo un error procesando tu mensaje. Por favor intenta de nuevo."
+
+# TwiML vacío: confirma el webhook sin responder (la respuesta se envía después por la API de Twilio)
+EMPTY_TWIML = """<?xml version="1.0" encoding="UTF-8"?>
+<Response></Response>"""
+
+
+async def generate_reply(
+    user_id: str,
+    user_message: str,
+    on_segment: Optional[Callable[[str], Awaitable[None]]] = None
+) -> ConversationResponse:
+    """
+    Genera la respuesta a un mensaje del usuario con el orquestador, enviándole el historial
+    reciente del usuario y agregando el turno a su sesión si la respuesta fue exitosa.
+    
+    Args:
+        user_id: Identificador del usuario (número de teléfono)
+        user_message: Mensaje del usuario
+        on_segment: Recibe cada párrafo validado si la respuesta se genera en streaming (opcional)
+        
+    Returns:
+        Resultado del orquestador
+    """
+    # Obtener el prompt del sistema (precompuesto en memoria, sin leer archivos)
+    system_prompt = await prompt_repository.get_composed_system_prompt()
+
+    # Un fallo del almacén de sesiones no impide responder: se continúa sin historial
+    conversation_history: Optional[List[str]] = None
+    if session_store is not None:
+        try:
+            conversation_history = await session_store.get_history(user_id) or None
+        except Exception as ex:
+            logger.error(f"Error loading conversation history for user {user_id}: {ex}")
+
+    # Procesar mensaje a través del orquestador
+    conversation_result = await orchestrator.process_message(
+        user_id=user_id,
+        user_message=user_message,
+        system_prompt=system_prompt,
+        conversation_history=conversation_history,
+        on_segment=on_segment
+    )
+
+    if session_store is not None and conversation_result.success:
+        try:
+            await session_store.append_turn(user_id, user_message, conversation_result.message)
+        except Exception as ex:
+            logger.error(f"Error saving conversation turn for user {user_id}: {ex}")
+
+    # Logging adicional
+    if conversation_result.requires_escalation:
+        logger.warning(
+            f"Conversation requires human escalation for user {user_id}. "
+            f"Flags: {[f.value for f in conversation_result.moderation_flags]}"
+        )
+
+    if conversation_result.has_pii_violations:
+        logger.warning(f"PII detected and masked in response for user {user_id}")
+
+    logger.info(f"Generated AI response for {user_id}: {conversation_result.success}")
+
+    return conversation_result
+
+
+class IncomingMessage(NamedTuple):
+    """Mensaje entrante pendiente de procesar en segundo plano."""
+    user_id: str
+    body: str
+    message_sid: Optional[str]
+
+
+async def process_queued_message(message: IncomingMessage) -> None:
+    """
+    Procesa un mensaje encolado y envía la respuesta por la API de Twilio.
+    Con streaming habilitado, cada párrafo validado se envía en cuanto está listo.
+    
+    Args:
+        message: Mensaje entrante
+    """
+    async def send(body: str) -> None:
+        await twilio_client.send_message(message.user_id, body)
+
+    try:
+        conversation_result = await generate_reply(
+            message.user_id,
+            message.body,
+            on_segment=send if settings.llm_streaming else None
+        )
+    except Exception as ex:
+        logger.error(f"Error processing queued message {message.message_sid}: {ex}")
+        await send(ERROR_MESSAGE)
+        return
+
+    if not conversation_result.streamed:
+        await send(conversation_result.message)
+
+
+# Procesamiento asíncrono del webhook: se responde de inmediato y el mensaje se procesa en segundo plano
+twilio_client: Optional[TwilioClient] = None
+message_workers: Optional[MessageWorkerPool[IncomingMessage]] = None
+if settings.webhook_async_processing:
+    twilio_client = TwilioClient(
+        settings.twilio_account_sid,
+        settings.twilio_auth_token,
+        settings.twilio_phone_number,
+        base_url=settings.twilio_api_base_url,
+        max_concurrency=settings.twilio_max_concurrency,
+        max_retries=settings.twilio_max_retries
+    )
+    message_workers = MessageWorkerPool(
+        process_queued_message,
+        workers=settings.webhook_workers,
+        max_size=settings.webhook_queue_max_size,
+        name="webhook messages"
+    )
+
+# Reintentos de Twilio: cada MessageSid se procesa una sola vez y los duplicados reciben la misma respuesta
+idempotency_store: Optional[IdempotencyStore] = None
+if settings.webhook_idempotency_max_entries > 0:
+    idempotency_store = IdempotencyStore(MemoryIdempotencyBackend(
+        max_entries=settings.webhook_idempotency_max_entries,
+        ttl_seconds=settings.webhook_idempotency_ttl_seconds
+    ))
+
+
+async def build_twiml_response(user_id: str, user_message: str, message_sid: Optional[str]) -> str:
+    """
+    Atiende un mensaje entrante: lo encola para procesarlo en segundo plano (TwiML vacío)
+    o genera la respuesta en línea.
+    
+    Args:
+        user_id: Identificador del usuario (número de teléfono)
+        user_message: Mensaje del usuario
+        message_sid: ID del mensaje de Twilio
+        
+    Returns:
+        Respuesta TwiML para Twilio
+    """
+    if message_workers is not None:
+        if message_workers.submit(IncomingMessage(user_id, user_message, message_sid)):
+            return EMPTY_TWIML
+
+        # Contrapresión: con la cola llena se responde en línea y Twilio espera la respuesta
+        logger.warning(f"Processing message {message_sid} inline, webhook queue is not accepting messages")
+
+    conversation_result = await generate_reply(user_id, user_message)
+
+    # Crear respuesta TwiML
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Message>{conversation_result.message}</Message>
+</Response>"""
+
 
 @twilio_router.post("/incoming", response_class=Response)
 async def incoming_message(
@@ -54,6 +240,10 @@ async def incoming_message(
     """
     Procesa mensajes SMS/WhatsApp entrantes desde Twilio.
     Valida el contenido, genera una respuesta mediante IA y aplica guardrails de seguridad.
+    Con WEBHOOK_ASYNC_PROCESSING el webhook se confirma de inmediato con TwiML vacío y la
+    respuesta se envía desde un worker; si la cola está llena, el mensaje se procesa aquí mismo.
+    Los reintentos de Twilio con el mismo MessageSid no repiten el procesamiento: esperan la
+    respuesta en curso o reciben la que ya se generó.
     
     Args:
         From: Número de teléfono del remitente
@@ -66,54 +256,30 @@ async def incoming_message(
     """
     logger.info(f"Received message from {From}: {Body}")
 
-    try:
-        # Obtener el prompt del sistema
-        system_prompt = await prompt_repository.get_system_prompt()
-
-        if not system_prompt:
-            logger.warning("System prompt is empty, using default")
-            system_prompt = "Eres Baba, un asistente virtual de Kavak que ayuda a clientes a encontrar vehículos."
-
-        user_id = From or "unknown"
-        user_message = Body or ""
-
-        # Procesar mensaje a través del orquestador
-        conversation_result = await orchestrator.process_message(
-            user_id=user_id,
-            user_message=user_message,
-            system_prompt=system_prompt,
-            conversation_history=None
-        )
-
-        # Logging adicional
-        if conversation_result.requires_escalation:
-            logger.warning(
-                f"Conversation requires human escalation for user {user_id}. "
-                f"Flags: {[f.value for f in conversation_result.moderation_flags]}"
-            )
-
-        if conversation_result.has_pii_violations:
-            logger.warning(f"PII detected and masked in response for user {user_id}")
+    user_id = From or "unknown"
+    user_message = Body or ""
 
-        logger.info(f"Generated AI response for {From}: {conversation_result.success}")
+    async def respond() -> str:
+        return await build_twiml_response(user_id, user_message, MessageSid)
 
-        # Crear respuesta TwiML
-        twiml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Message>{conversation_result.message}</Message>
-</Response>"""
+    try:
+        if MessageSid and idempotency_store is not None:
+            twiml_response = await idempotency_store.run(MessageSid, respond)
+        else:
+            twiml_response = await respond()
 
+        # Sin respuesta: otro worker atiende este MessageSid y responderá por su cuenta
         return Response(
-            content=twiml_response,
+            content=twiml_response if twiml_response is not None else EMPTY_TWIML,
             media_type="application/xml"
         )
 
     except Exception as ex:
         logger.error(f"Error processing incoming message: {ex}")
 
-        error_twiml = """<?xml version="1.0" encoding="UTF-8"?>
+        error_twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
-    <Message>Lo siento, hubo un error procesando tu mensaje. Por favor intenta de nuevo.</Message>
+    <Message>{ERROR_MESSAGE}</Message>
 </Response>"""
 
         return Response(
@@ -121,3 +287,28 @@ async def incoming_message(
             media_type="application/xml"
         )
 
+
+@admin_router.post("/catalog/reload")
+async def reload_catalog(x_admin_token: Optional[str] = Header(None)):
+    """
+    Recarga el catálogo de vehículos sin reiniciar el servicio.
+    Requiere el encabezado X-Admin-Token con el valor configurado en ADMIN_TOKEN.
+    
+    Args:
+        x_admin_token: Token de administración
+        
+    Returns:
+        Resultado de la recarga y métricas del catálogo
+    """
+    if not settings.admin_token or x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    reloaded = await catalog_repository.reload()
+
+    if not reloaded:
+        raise HTTPException(status_code=500, detail="Catalog reload failed")
+
+    return {
+        "status": "reloaded",
+        "metrics": catalog_repository.get_metrics()
+    }
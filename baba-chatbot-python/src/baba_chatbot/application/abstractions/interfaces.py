@@ -3,13 +3,14 @@ Interfaces para los servicios de la aplicación.
 Define contratos para LLM, Catálogo y Validadores de Guardrails.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 from ...domain.entities import Vehicle
-from ...domain.value_objects import VehicleQuery
+from ...domain.value_objects import CatalogFacets, VehicleQuery
 from ..conversation.guardrails.content_moderation_result import (
     ContentModerationResult,
     GuardrailsValidationResult
 )
+from ..conversation.guardrails.streaming_validator import StreamingResponseValidator
 
 
 class ILlmClient(ABC):
@@ -38,6 +39,26 @@ class ILlmClient(ABC):
         """
         pass
 
+    async def stream_response(
+        self,
+        system_prompt: str,
+        user_message: str,
+        conversation_history: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Genera una respuesta entregando el texto a medida que se produce.
+        Por defecto entrega la respuesta completa de generate_response en un solo fragmento.
+        
+        Args:
+            system_prompt: Prompt del sistema con instrucciones
+            user_message: Mensaje del usuario
+            conversation_history: Historial de conversación (opcional)
+            
+        Yields:
+            Fragmentos de texto de la respuesta
+        """
+        yield await self.generate_response(system_prompt, user_message, conversation_history)
+
     @abstractmethod
     async def generate_structured_response(self, prompt: str, response_type: type):
         """
@@ -58,16 +79,26 @@ class ICatalogRepository(ABC):
     Repositorio para búsqueda y consulta del catálogo de vehículos.
     """
 
+    @property
     @abstractmethod
-    async def search_vehicles(self, query: VehicleQuery) -> List[Vehicle]:
+    def revision(self) -> int:
+        """
+        Revisión del contenido del catálogo. Cambia cada vez que el catálogo se recarga
+        o se le aplican cambios, así que sirve para invalidar resultados en caché.
+        """
+        pass
+
+    @abstractmethod
+    async def search_vehicles(self, query: VehicleQuery) -> Sequence[Vehicle]:
         """
         Busca vehículos en el catálogo según criterios especificados.
         
         Args:
-            query: Criterios de búsqueda
+            query: Criterios de búsqueda, orden y paginación
             
         Returns:
-            Lista de vehículos que coinciden con los criterios
+            Secuencia con la página de vehículos que coinciden con los criterios;
+            si la implementación conoce el total de coincidencias lo expone en su atributo total
         """
         pass
 
@@ -84,6 +115,32 @@ class ICatalogRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Optional[Vehicle]]:
+        """
+        Obtiene varios vehículos por su ID o stock_id en una sola consulta.
+        
+        Args:
+            vehicle_ids: IDs o stock_ids de los vehículos
+            
+        Returns:
+            Vehículos en el mismo orden de los IDs (None para los que no existen)
+        """
+        pass
+
+    @abstractmethod
+    async def get_catalog_facets(self, query: VehicleQuery) -> CatalogFacets:
+        """
+        Obtiene conteos por marca, modelo, año y rango de precio de los vehículos que cumplen el query.
+        
+        Args:
+            query: Criterios de búsqueda (se ignoran orden y paginación)
+            
+        Returns:
+            Facetas del catálogo para los filtros
+        """
+        pass
+
 
 class IGuardrailsValidator(ABC):
     """
@@ -116,6 +173,16 @@ class IGuardrailsValidator(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_stream_validator(self) -> StreamingResponseValidator:
+        """
+        Crea un validador incremental para una respuesta recibida por streaming.
+        
+        Returns:
+            Validador nuevo (uno por respuesta)
+        """
+        pass
+
     @abstractmethod
     def validate_response_quality(self, response: str) -> bool:
         """
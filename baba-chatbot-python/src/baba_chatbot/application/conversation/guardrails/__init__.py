@@ -7,6 +7,7 @@ from .content_moderation_result import (
     ModerationFlag,
     ModerationSeverity
 )
+from .streaming_validator import StreamingResponseValidator
 from .guardrails_validator import GuardrailsValidator
 
 __all__ = [
@@ -14,6 +15,7 @@ __all__ = [
     "GuardrailsValidationResult",
     "ModerationFlag",
     "ModerationSeverity",
+    "StreamingResponseValidator",
     "GuardrailsValidator"
 ]
 
@@ -4,7 +4,7 @@ validación de calidad y prevención de promesas no autorizadas.
 """
 import re
 import logging
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set, Tuple
 from ...abstractions.interfaces import IGuardrailsValidator
 from .content_moderation_result import (
     ContentModerationResult,
@@ -12,6 +12,7 @@ from .content_moderation_result import (
     ModerationFlag,
     ModerationSeverity
 )
+from .streaming_validator import StreamingResponseValidator
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,9 @@ class GuardrailsValidator(IGuardrailsValidator):
     validación de calidad y prevención de promesas no autorizadas.
     """
 
+    # Longitud máxima de una respuesta del LLM (caracteres)
+    MAX_RESPONSE_LENGTH = 1000
+
     # Patrones regex para detección de PII
     CREDIT_CARD_PATTERN = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
     PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
@@ -112,7 +116,8 @@ class GuardrailsValidator(IGuardrailsValidator):
         """
         Valida la respuesta del LLM verificando longitud, PII, promesas no autorizadas,
         información inventada y contenido inapropiado.
-        Enmascara automáticamente datos sensibles detectados.
+        Enmascara automáticamente datos sensibles detectados. El exceso de longitud y las
+        violaciones de find_blocking_violation la invalidan siempre, igual que en streaming.
         
         Args:
             response: Respuesta del LLM a validar
@@ -135,7 +140,7 @@ class GuardrailsValidator(IGuardrailsValidator):
         logger.debug("Validating LLM response")
 
         # Validar longitud
-        if len(response) > 1000:
+        if len(response) > self.MAX_RESPONSE_LENGTH:
             result.violations.append("Response too long (>200 words)")
             logger.warning("Response exceeds maximum length")
 
@@ -143,50 +148,10 @@ class GuardrailsValidator(IGuardrailsValidator):
             result.violations.append("Response too short")
             logger.warning("Response is too short")
 
-        pii_detected = False
-
-        # Detectar y enmascarar tarjetas de crédito
-        if self.CREDIT_CARD_PATTERN.search(response):
-            result.violations.append("Credit card number detected")
-            result.cleaned_content = self.CREDIT_CARD_PATTERN.sub(
-                "[TARJETA OCULTA]",
-                result.cleaned_content
-            )
-            pii_detected = True
-            logger.warning("Credit card number detected and masked")
-
-        # Detectar y enmascarar INE/CURP
-        if self.INE_PATTERN.search(response) or self.CURP_PATTERN.search(response):
-            result.violations.append("INE/CURP detected")
-            result.cleaned_content = self.INE_PATTERN.sub("[ID OCULTO]", result.cleaned_content)
-            result.cleaned_content = self.CURP_PATTERN.sub("[CURP OCULTO]", result.cleaned_content)
-            pii_detected = True
-            logger.warning("INE/CURP detected and masked")
-
-        # Detectar y enmascarar teléfonos no autorizados
-        phone_matches = self.PHONE_PATTERN.finditer(response)
-        for match in phone_matches:
-            phone = match.group().replace("-", "").replace(".", "")
-            if phone not in self.ALLOWED_KAVAK_PHONES:
-                result.violations.append("Unauthorized phone number detected")
-                result.cleaned_content = result.cleaned_content.replace(
-                    match.group(),
-                    "[TELÉFONO OCULTO]"
-                )
-                pii_detected = True
-                logger.warning("Unauthorized phone number detected and masked")
-
-        # Detectar y enmascarar emails no autorizados
-        email_matches = self.EMAIL_PATTERN.finditer(response)
-        for match in email_matches:
-            if match.group().lower() not in self.ALLOWED_KAVAK_EMAILS:
-                result.violations.append("Unauthorized email detected")
-                result.cleaned_content = result.cleaned_content.replace(
-                    match.group(),
-                    "[EMAIL OCULTO]"
-                )
-                pii_detected = True
-                logger.warning("Unauthorized email detected and masked")
+        # Detectar y enmascarar datos personales
+        result.cleaned_content, pii_violations = self.mask_pii(response)
+        result.violations.extend(pii_violations)
+        pii_detected = bool(pii_violations)
 
         # Detectar promesas no autorizadas
         unauthorized_promises = self._detect_unauthorized_promises(response)
@@ -215,6 +180,11 @@ class GuardrailsValidator(IGuardrailsValidator):
             if not pii_detected or len(result.violations) > 3:
                 result.is_valid = False
 
+        # Las violaciones bloqueantes invalidan la respuesta aunque se haya detectado PII;
+        # son las mismas que cortan la generación en streaming, así ambos modos deciden igual
+        if len(response) > self.MAX_RESPONSE_LENGTH or self.find_blocking_violation(response) is not None:
+            result.is_valid = False
+
         logger.info(
             f"Response validation completed. "
             f"IsValid: {result.is_valid}, Violations: {len(result.violations)}"
@@ -222,6 +192,96 @@ class GuardrailsValidator(IGuardrailsValidator):
 
         return result
 
+    def mask_pii(self, response: str) -> Tuple[str, List[str]]:
+        """
+        Enmascara tarjetas de crédito, INE/CURP y teléfonos y emails no autorizados.
+
+        Args:
+            response: Texto a revisar
+
+        Returns:
+            Tupla con (texto enmascarado, violaciones detectadas)
+        """
+        cleaned_content = response
+        violations: List[str] = []
+
+        # Detectar y enmascarar tarjetas de crédito
+        if self.CREDIT_CARD_PATTERN.search(response):
+            violations.append("Credit card number detected")
+            cleaned_content = self.CREDIT_CARD_PATTERN.sub("[TARJETA OCULTA]", cleaned_content)
+            logger.warning("Credit card number detected and masked")
+
+        # Detectar y enmascarar INE/CURP
+        if self.INE_PATTERN.search(response) or self.CURP_PATTERN.search(response):
+            violations.append("INE/CURP detected")
+            cleaned_content = self.INE_PATTERN.sub("[ID OCULTO]", cleaned_content)
+            cleaned_content = self.CURP_PATTERN.sub("[CURP OCULTO]", cleaned_content)
+            logger.warning("INE/CURP detected and masked")
+
+        # Detectar y enmascarar teléfonos no autorizados
+        for match in self.PHONE_PATTERN.finditer(response):
+            phone = match.group().replace("-", "").replace(".", "")
+            if phone not in self.ALLOWED_KAVAK_PHONES:
+                violations.append("Unauthorized phone number detected")
+                cleaned_content = cleaned_content.replace(match.group(), "[TELÉFONO OCULTO]")
+                logger.warning("Unauthorized phone number detected and masked")
+
+        # Detectar y enmascarar emails no autorizados
+        for match in self.EMAIL_PATTERN.finditer(response):
+            if match.group().lower() not in self.ALLOWED_KAVAK_EMAILS:
+                violations.append("Unauthorized email detected")
+                cleaned_content = cleaned_content.replace(match.group(), "[EMAIL OCULTO]")
+                logger.warning("Unauthorized email detected and masked")
+
+        return cleaned_content, violations
+
+    def find_blocking_violation(self, response: str) -> Optional[Tuple[str, bool]]:
+        """
+        Busca en un fragmento de respuesta una violación que por sí sola invalida la respuesta
+        completa (aunque contenga PII): promesas no autorizadas, información inventada o contenido
+        inapropiado (odio, violencia, contenido sexual o lenguaje ofensivo). Como son patrones
+        locales, encontrarlos en un fragmento basta para cortar la generación.
+
+        Args:
+            response: Fragmento de la respuesta
+
+        Returns:
+            Tupla con (violación, requiere escalamiento humano) o None si no hay violaciones
+        """
+        unauthorized_promises = self._detect_unauthorized_promises(response)
+        if unauthorized_promises:
+            return unauthorized_promises[0], True
+
+        if self._contains_invented_information(response):
+            return "Potentially invented vehicle information", False
+
+        response_lower = response.lower()
+        for keywords, flag in (
+            (self.HATE_SPEECH_KEYWORDS, ModerationFlag.HATE_SPEECH),
+            (self.VIOLENCE_KEYWORDS, ModerationFlag.VIOLENCE),
+            (self.SEXUAL_CONTENT_KEYWORDS, ModerationFlag.SEXUAL_CONTENT)
+        ):
+            if self._contains_keywords(response_lower, keywords):
+                return f"Inappropriate content in response: {flag.value}", False
+
+        if self._contains_offensive_language(response_lower):
+            return f"Inappropriate content in response: {ModerationFlag.HARASSMENT.value}", False
+
+        return None
+
+    def create_stream_validator(self) -> StreamingResponseValidator:
+        """
+        Crea un validador incremental para una respuesta recibida por streaming.
+
+        Returns:
+            Validador nuevo (uno por respuesta)
+        """
+        return StreamingResponseValidator(
+            self.find_blocking_violation,
+            lambda text: self.mask_pii(text)[0],
+            self.MAX_RESPONSE_LENGTH
+        )
+
     def _detect_unauthorized_promises(self, response: str) -> List[str]:
         """
         Detecta promesas o compromisos no autorizados en las respuestas.
@@ -0,0 +1,155 @@
+"""
+Validación incremental de respuestas del LLM recibidas por streaming.
+Revisa el texto a medida que llega, sobre ventanas que se solapan, para cortar la generación
+en cuanto aparece una violación que invalida la respuesta, y libera los párrafos completos
+(con PII enmascarada) para poder enviarlos antes de que termine la generación.
+"""
+import re
+from typing import Callable, List, Optional, Tuple
+
+
+# Texto ya revisado que se vuelve a incluir en la siguiente ventana (mayor que cualquier patrón)
+SCAN_OVERLAP = 128
+
+_WHITESPACE = re.compile(r'\s')
+_PARAGRAPH_BREAK = "\n\n"
+
+# (violación, requiere escalamiento) o None
+BlockingViolation = Optional[Tuple[str, bool]]
+
+
+class StreamingResponseValidator:
+    """
+    Valida una respuesta por fragmentos. Se crea una instancia por respuesta con
+    GuardrailsValidator.create_stream_validator().
+
+    Solo se revisa el prefijo de palabras completas (hasta el último espacio), así los patrones
+    con límites de palabra no coinciden con palabras a medio llegar. Los párrafos se liberan
+    cuando llega el salto de párrafo que los cierra: ningún patrón de PII cruza una línea en
+    blanco, así que enmascarar un párrafo da el mismo resultado que enmascarar el texto completo.
+    """
+
+    def __init__(
+        self,
+        find_blocking_violation: Callable[[str], BlockingViolation],
+        mask_pii: Callable[[str], str],
+        max_length: int
+    ):
+        """
+        Inicializa el validador incremental.
+
+        Args:
+            find_blocking_violation: Busca en un texto una violación que invalida la respuesta
+            mask_pii: Enmascara los datos personales de un texto
+            max_length: Longitud máxima de la respuesta; al superarla se corta la generación
+        """
+        self._find_blocking_violation = find_blocking_violation
+        self._mask_pii = mask_pii
+        self._max_length = max_length
+        self._text = ""
+        self._scanned = 0
+        self._released = 0
+        self.violation: Optional[str] = None
+        self.requires_human_escalation = False
+
+    @property
+    def text(self) -> str:
+        """Texto recibido hasta el momento."""
+        return self._text
+
+    @property
+    def aborted(self) -> bool:
+        """Indica si se detectó una violación y la generación debe cortarse."""
+        return self.violation is not None
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Agrega un fragmento de la respuesta y revisa el texto nuevo.
+
+        Args:
+            chunk: Fragmento recibido del LLM
+
+        Returns:
+            Párrafos completos listos para enviar (vacío si se detectó una violación)
+        """
+        if self.aborted or not chunk:
+            return []
+
+        self._text += chunk
+        if len(self._text) > self._max_length:
+            self.violation = f"Response too long (>{self._max_length} characters)"
+            return []
+
+        # Prefijo estable: hasta el último espacio (las palabras siguientes pueden seguir creciendo)
+        stable = self._stable_end()
+        if not self._scan(stable):
+            return []
+
+        return self._release(self._text.rfind(_PARAGRAPH_BREAK, self._released, stable))
+
+    def finish(self) -> List[str]:
+        """
+        Revisa el resto del texto al terminar la generación.
+
+        Returns:
+            Párrafos pendientes listos para enviar (vacío si se detectó una violación)
+        """
+        if self.aborted or not self._scan(len(self._text)):
+            return []
+
+        return self._release(len(self._text))
+
+    def _stable_end(self) -> int:
+        """Posición siguiente al último espacio del texto (0 si aún no hay ninguno)."""
+        for position in range(len(self._text) - 1, self._scanned - 1, -1):
+            if self._text[position].isspace():
+                return position + 1
+        return self._scanned
+
+    def _scan(self, end: int) -> bool:
+        """
+        Busca violaciones en el texto nuevo hasta end, solapando con lo ya revisado
+        y empezando en un inicio de palabra.
+
+        Args:
+            end: Fin del texto a revisar
+
+        Returns:
+            True si no se detectaron violaciones
+        """
+        if end <= self._scanned:
+            return True
+
+        start = max(0, self._scanned - SCAN_OVERLAP)
+        if start:
+            match = _WHITESPACE.search(self._text, start, self._scanned)
+            start = match.end() if match else self._scanned
+
+        found = self._find_blocking_violation(self._text[start:end])
+        self._scanned = end
+        if found is None:
+            return True
+
+        self.violation, self.requires_human_escalation = found
+        return False
+
+    def _release(self, end: int) -> List[str]:
+        """
+        Libera el texto pendiente hasta end dividido en párrafos, con PII enmascarada.
+
+        Args:
+            end: Fin del texto a liberar (-1 si no hay nada que liberar)
+
+        Returns:
+            Párrafos no vacíos
+        """
+        if end <= self._released:
+            return []
+
+        pending = self._text[self._released:end]
+        self._released = end
+        return [
+            self._mask_pii(paragraph.strip())
+            for paragraph in pending.split(_PARAGRAPH_BREAK)
+            if paragraph.strip()
+        ]
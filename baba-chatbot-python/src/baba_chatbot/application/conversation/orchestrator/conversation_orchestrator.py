@@ -3,14 +3,25 @@ Orquestador de conversaciones que gestiona el flujo completo de validaciones,
 generación de respuestas y sistema de reincidencia.
 """
 import logging
-from typing import List, Optional, Dict
+from typing import Awaitable, Callable, List, Optional, Dict
 from dataclasses import dataclass, field
 from ...abstractions.interfaces import ILlmClient, IGuardrailsValidator
 from ..guardrails.content_moderation_result import ModerationFlag, ModerationSeverity
+from ..guardrails.streaming_validator import StreamingResponseValidator
 
 
 logger = logging.getLogger(__name__)
 
+# Avisos que cierran una respuesta ya entregada en parte por streaming cuando no pasa los
+# guardrails finales (en lugar del mensaje de error completo, que contradiría lo enviado)
+PARTIAL_RESPONSE_NOTICE = (
+    "Disculpa, no pude completar mi respuesta. "
+    "¿Podrías darme más detalles sobre lo que buscas?"
+)
+PARTIAL_RESPONSE_ESCALATION_NOTICE = (
+    "Para completar tu consulta te conectaré con un asesor especializado. Dame un momento..."
+)
+
 
 @dataclass
 class ConversationResponse:
@@ -22,6 +33,8 @@ class ConversationResponse:
     requires_escalation: bool = False
     moderation_flags: List[ModerationFlag] = field(default_factory=list)
     has_pii_violations: bool = False
+    # True si el mensaje ya se entregó por partes con on_segment
+    streamed: bool = False
 
     def __post_init__(self):
         """Asegura que moderation_flags sea una lista mutable."""
@@ -56,17 +69,25 @@ class ConversationOrchestrator:
         user_id: str,
         user_message: str,
         system_prompt: str,
-        conversation_history: Optional[List[str]] = None
+        conversation_history: Optional[List[str]] = None,
+        on_segment: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> ConversationResponse:
         """
         Procesa un mensaje del usuario a través del pipeline completo de validación,
         generación de respuesta y verificación de guardrails.
         
+        Con on_segment la respuesta se genera en streaming: el texto se valida a medida que
+        llega, los párrafos ya validados (con PII enmascarada) se entregan sin esperar a que
+        termine la generación y una violación bloqueante la corta de inmediato. Si después de
+        entregar algún párrafo la respuesta no pasa las validaciones finales, se entrega un
+        aviso breve y la respuesta se marca como entregada (streamed).
+        
         Args:
             user_id: Identificador del usuario
             user_message: Mensaje del usuario
             system_prompt: Prompt del sistema con instrucciones
             conversation_history: Historial de conversación opcional
+            on_segment: Recibe cada párrafo validado de la respuesta (opcional)
             
         Returns:
             Respuesta procesada con el resultado de todas las validaciones
@@ -115,19 +136,51 @@ class ConversationOrchestrator:
             )
 
         # Generar respuesta del LLM
+        stream_validator: Optional[StreamingResponseValidator] = None
+        pending_segments: List[str] = []
+        segments_sent = 0
+
+        async def send_segment(segment: str) -> None:
+            nonlocal segments_sent
+            await on_segment(segment)
+            segments_sent += 1
+
         try:
-            llm_response = await self._llm_client.generate_response(
-                system_prompt,
-                user_message,
-                conversation_history
-            )
+            if on_segment is None:
+                llm_response = await self._llm_client.generate_response(
+                    system_prompt,
+                    user_message,
+                    conversation_history
+                )
+            else:
+                stream_validator = await self._stream_llm_response(
+                    system_prompt,
+                    user_message,
+                    conversation_history,
+                    send_segment
+                )
+                pending_segments = stream_validator.finish()
+                llm_response = stream_validator.text
         except Exception as ex:
             logger.error(f"Error generating LLM response for user {user_id}: {ex}")
             
-            return ConversationResponse(
+            return await self._close_partial_stream(ConversationResponse(
                 success=False,
                 message="Lo siento, tuve un problema técnico. ¿Podrías intentar de nuevo?",
                 requires_escalation=False
+            ), segments_sent, on_segment)
+
+        # Generación cortada por una violación detectada durante el streaming
+        if stream_validator is not None and stream_validator.aborted:
+            logger.error(
+                f"Streamed LLM response aborted for user {user_id} after "
+                f"{len(stream_validator.text)} characters. Violation: {stream_validator.violation}"
+            )
+
+            return await self._close_partial_stream(
+                self._invalid_response(stream_validator.requires_human_escalation),
+                segments_sent,
+                on_segment
             )
 
         # Validar respuesta del LLM
@@ -139,23 +192,10 @@ class ConversationOrchestrator:
                 f"Violations: {response_validation.violations}"
             )
 
-            if response_validation.requires_human_escalation:
-                return ConversationResponse(
-                    success=False,
-                    message=(
-                        "Déjame conectarte con un asesor especializado que podrá ayudarte mejor. "
-                        "Dame un momento..."
-                    ),
-                    requires_escalation=True
-                )
-
-            return ConversationResponse(
-                success=False,
-                message=(
-                    "Disculpa, déjame reformular eso. "
-                    "¿Podrías ser más específico sobre lo que necesitas?"
-                ),
-                requires_escalation=False
+            return await self._close_partial_stream(
+                self._invalid_response(response_validation.requires_human_escalation),
+                segments_sent,
+                on_segment
             )
 
         # Usar contenido limpio (con PII enmascarada)
@@ -165,14 +205,14 @@ class ConversationOrchestrator:
         if not self._guardrails_validator.validate_response_quality(final_response):
             logger.warning(f"Response failed quality validation for user {user_id}")
             
-            return ConversationResponse(
+            return await self._close_partial_stream(ConversationResponse(
                 success=False,
                 message=(
                     "¿Podrías darme más detalles sobre lo que buscas? "
                     "Así puedo ayudarte mejor."
                 ),
                 requires_escalation=False
-            )
+            ), segments_sent, on_segment)
 
         logger.info(f"Successfully processed message for user {user_id}")
 
@@ -186,11 +226,116 @@ class ConversationOrchestrator:
             for v in response_validation.violations
         )
 
+        # Entregar los párrafos que quedaban pendientes al terminar el streaming
+        for segment in pending_segments:
+            await send_segment(segment)
+
         return ConversationResponse(
             success=True,
             message=final_response,
             requires_escalation=False,
-            has_pii_violations=has_pii_violations
+            has_pii_violations=has_pii_violations,
+            streamed=stream_validator is not None
+        )
+
+    async def _stream_llm_response(
+        self,
+        system_prompt: str,
+        user_message: str,
+        conversation_history: Optional[List[str]],
+        on_segment: Callable[[str], Awaitable[None]]
+    ) -> StreamingResponseValidator:
+        """
+        Genera la respuesta en streaming validándola por fragmentos y entregando los
+        párrafos validados. Si se detecta una violación bloqueante cierra el stream,
+        lo que corta la generación en el LLM.
+        
+        Args:
+            system_prompt: Prompt del sistema con instrucciones
+            user_message: Mensaje del usuario
+            conversation_history: Historial de conversación opcional
+            on_segment: Recibe cada párrafo validado de la respuesta
+            
+        Returns:
+            Validador con el texto recibido y la violación detectada (si la hubo)
+        """
+        stream_validator = self._guardrails_validator.create_stream_validator()
+        stream = self._llm_client.stream_response(system_prompt, user_message, conversation_history)
+        try:
+            async for chunk in stream:
+                for segment in stream_validator.feed(chunk):
+                    await on_segment(segment)
+                if stream_validator.aborted:
+                    break
+        finally:
+            await stream.aclose()
+
+        return stream_validator
+
+    @staticmethod
+    async def _close_partial_stream(
+        response: ConversationResponse,
+        segments_sent: int,
+        on_segment: Optional[Callable[[str], Awaitable[None]]]
+    ) -> ConversationResponse:
+        """
+        Cierra una respuesta fallida de la que ya se entregaron párrafos por streaming:
+        en lugar del mensaje de error completo se entrega un aviso breve que la da por
+        terminada, y la respuesta se marca como entregada.
+        
+        Args:
+            response: Respuesta fallida
+            segments_sent: Párrafos ya entregados con on_segment
+            on_segment: Receptor de los párrafos (None sin streaming)
+            
+        Returns:
+            La misma respuesta si no se entregó nada; si no, la respuesta con el aviso
+        """
+        if not segments_sent or on_segment is None:
+            return response
+
+        notice = (
+            PARTIAL_RESPONSE_ESCALATION_NOTICE if response.requires_escalation
+            else PARTIAL_RESPONSE_NOTICE
+        )
+        await on_segment(notice)
+
+        return ConversationResponse(
+            success=False,
+            message=notice,
+            requires_escalation=response.requires_escalation,
+            moderation_flags=response.moderation_flags,
+            streamed=True
+        )
+
+    @staticmethod
+    def _invalid_response(requires_human_escalation: bool) -> ConversationResponse:
+        """
+        Respuesta para una generación del LLM que no pasó los guardrails.
+        
+        Args:
+            requires_human_escalation: Si la violación requiere escalar a un asesor
+            
+        Returns:
+            Respuesta de escalamiento o de reformulación
+        """
+        if requires_human_escalation:
+            return ConversationResponse(
+                success=False,
+                message=(
+                    "Déjame conectarte con un asesor especializado que podrá ayudarte mejor. "
+                    "Dame un momento..."
+                ),
+                requires_escalation=True
+            )
+
+        return ConversationResponse(
+            success=False,
+            message=(
+                "Disculpa, déjame reformular eso. "
+                "¿Podrías ser más específico sobre lo que necesitas?"
+            ),
+            requires_escalation=False
         )
 
     def reset_violation_count(self, user_id: str) -> None:
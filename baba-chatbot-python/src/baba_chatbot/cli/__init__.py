@@ -0,0 +1,3 @@
+"""
+Comandos de línea de comandos para tareas operativas (compilación de snapshots e índices)
+"""
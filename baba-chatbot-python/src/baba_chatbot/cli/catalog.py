@@ -0,0 +1,110 @@
+"""
+Comando `baba-catalog`: compila el catálogo (CSV/JSON) a un snapshot binario columnar
+que los workers de la API mapean con mmap al arrancar, sin volver a parsear los archivos.
+
+Uso:
+    baba-catalog build [--csv RUTA] [--json RUTA] [--output RUTA]
+"""
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from typing import List, Optional
+
+# La capa de aplicación debe inicializarse antes que las integraciones (igual que en la API)
+from ..application import conversation  # noqa: F401
+from ..api.dependencies import get_settings
+from ..integrations.catalog import CatalogRepository
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_FILE_PATH = "./data/catalog/catalog.bin"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos del comando.
+
+    Returns:
+        Parser configurado con sus subcomandos
+    """
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(
+        prog="baba-catalog",
+        description="Herramientas del catálogo de vehículos"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Compila el catálogo a un snapshot binario")
+    build.add_argument(
+        "--csv",
+        default=settings.catalog_csv_file_path,
+        help="Archivo CSV del catálogo (por defecto CATALOG_CSV_FILE_PATH)"
+    )
+    build.add_argument(
+        "--json",
+        default=settings.catalog_file_path,
+        help="Archivo JSON del catálogo (por defecto CATALOG_FILE_PATH)"
+    )
+    build.add_argument(
+        "--output",
+        default=settings.catalog_snapshot_file_path or DEFAULT_SNAPSHOT_FILE_PATH,
+        help="Snapshot a generar (por defecto CATALOG_SNAPSHOT_FILE_PATH)"
+    )
+
+    return parser
+
+
+async def build_snapshot(csv_path: Optional[str], json_path: str, output_path: str) -> int:
+    """
+    Carga el catálogo desde sus archivos de origen y lo compila a un snapshot binario.
+
+    Args:
+        csv_path: Archivo CSV del catálogo (opcional)
+        json_path: Archivo JSON del catálogo
+        output_path: Snapshot a generar
+
+    Returns:
+        Tamaño del snapshot en bytes
+    """
+    repository = CatalogRepository(json_path, csv_path, columnar=True)
+    return await repository.export_snapshot_file(output_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada del comando.
+
+    Args:
+        argv: Argumentos de línea de comandos (por defecto sys.argv)
+
+    Returns:
+        Código de salida del proceso
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = build_parser().parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        try:
+            size = asyncio.run(build_snapshot(args.csv, args.json, args.output))
+        except Exception as ex:
+            logger.error(f"Error building catalog snapshot: {ex}")
+            return 1
+
+        logger.info(
+            f"Catalog snapshot written to {args.output} "
+            f"({size / 1024 / 1024:.1f} MB in {time.perf_counter() - started:.2f}s)"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Comando `baba-kb`: compila la base de conocimiento (documentos markdown) a un índice binario
+con las secciones, los postings BM25 y los vectores de n-gramas, que los workers de la API
+mapean con mmap al arrancar sin volver a leer ni analizar los documentos.
+
+Uso:
+    baba-kb build [--kb-path RUTA] [--output RUTA] [--no-vectors] [--vector-dimensions N]
+"""
+import sys
+import time
+import logging
+import argparse
+from typing import List, Optional
+
+# La capa de aplicación debe inicializarse antes que las integraciones (igual que en la API)
+from ..application import conversation  # noqa: F401
+from ..api.dependencies import get_settings
+from ..integrations.llm import KnowledgeRepository
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_FILE_PATH = "./config/rag/kb_index.bin"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos del comando.
+
+    Returns:
+        Parser configurado con sus subcomandos
+    """
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(
+        prog="baba-kb",
+        description="Herramientas de la base de conocimiento"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Compila la base de conocimiento a un índice binario")
+    build.add_argument(
+        "--kb-path",
+        default=settings.knowledge_base_path,
+        help="Directorio de documentos markdown (por defecto KNOWLEDGE_BASE_PATH)"
+    )
+    build.add_argument(
+        "--output",
+        default=settings.knowledge_base_index_file_path or DEFAULT_INDEX_FILE_PATH,
+        help="Índice a generar (por defecto KNOWLEDGE_BASE_INDEX_FILE_PATH)"
+    )
+    build.add_argument(
+        "--no-vectors",
+        action="store_true",
+        help="No incluir los vectores de n-gramas (sin ellos el índice no requiere NumPy)"
+    )
+    build.add_argument(
+        "--vector-dimensions",
+        type=int,
+        default=settings.knowledge_base_vector_dimensions,
+        help="Dimensión de los vectores (por defecto KNOWLEDGE_BASE_VECTOR_DIMENSIONS)"
+    )
+
+    return parser
+
+
+def build_index(kb_path: str, output_path: str, include_vectors: bool, vector_dimensions: int) -> int:
+    """
+    Carga la base de conocimiento desde sus documentos y la compila a un índice binario.
+
+    Args:
+        kb_path: Directorio de documentos markdown
+        output_path: Índice a generar
+        include_vectors: Incluir los vectores de n-gramas
+        vector_dimensions: Dimensión de los vectores
+
+    Returns:
+        Tamaño del índice en bytes
+
+    Raises:
+        ValueError: Si no se encontraron documentos
+    """
+    repository = KnowledgeRepository(kb_path, vector_dimensions=vector_dimensions)
+    if not repository.get_stats()[0]:
+        raise ValueError(f"No documents found in {kb_path}")
+
+    return repository.export_index_file(output_path, include_vectors=include_vectors)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada del comando.
+
+    Args:
+        argv: Argumentos de línea de comandos (por defecto sys.argv)
+
+    Returns:
+        Código de salida del proceso
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = build_parser().parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        try:
+            size = build_index(args.kb_path, args.output, not args.no_vectors, args.vector_dimensions)
+        except Exception as ex:
+            logger.error(f"Error building knowledge base index: {ex}")
+            return 1
+
+        logger.info(
+            f"Knowledge base index written to {args.output} "
+            f"({size / 1024 / 1024:.1f} MB in {time.perf_counter() - started:.2f}s)"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
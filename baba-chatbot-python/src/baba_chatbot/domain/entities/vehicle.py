@@ -3,8 +3,8 @@ Entidad de dominio que representa un vehículo disponible en el catálogo.
 Incluye características técnicas, especificaciones, estado y certificación.
 """
 from enum import Enum
-from typing import List, Optional
-from dataclasses import dataclass, field
+from typing import Optional, Tuple
+from dataclasses import dataclass
 
 
 class VehicleStatus(Enum):
@@ -15,10 +15,11 @@ class VehicleStatus(Enum):
     MAINTENANCE = "maintenance"
 
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     """
     Entidad de dominio que representa un vehículo disponible en el catálogo.
+    Usa __slots__ para reducir la memoria por instancia en catálogos grandes.
     """
     id: str
     brand: str
@@ -34,7 +35,7 @@ class Vehicle:
     seats: int = 0
     engine: str = ""
     horsepower: int = 0
-    features: List[str] = field(default_factory=list)
+    features: Tuple[str, ...] = ()
     location: str = ""
     status: VehicleStatus = VehicleStatus.AVAILABLE
     certification_score: float = 0.0
@@ -82,6 +83,61 @@ class Vehicle:
             status=VehicleStatus.AVAILABLE
         )
 
+    @staticmethod
+    def create_with_details(
+        vehicle_id: str,
+        brand: str,
+        model: str,
+        year: int,
+        price: float,
+        version: Optional[str] = None,
+        mileage: Optional[int] = None,
+        length: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        has_bluetooth: Optional[bool] = None,
+        has_carplay: Optional[bool] = None,
+        stock_id: Optional[str] = None
+    ) -> 'Vehicle':
+        """
+        Crea un vehículo con los datos básicos y sus detalles en una sola construcción.
+        Equivale a create() seguido de update_details(), sin asignar cada atributo dos veces.
+        
+        Args:
+            vehicle_id: Identificador único del vehículo
+            brand: Marca del vehículo
+            model: Modelo del vehículo
+            year: Año del vehículo
+            price: Precio del vehículo
+            version: Versión del vehículo
+            mileage: Kilometraje del vehículo
+            length: Longitud del vehículo en mm
+            width: Ancho del vehículo en mm
+            height: Altura del vehículo en mm
+            has_bluetooth: Si tiene Bluetooth
+            has_carplay: Si tiene CarPlay
+            stock_id: ID de stock
+            
+        Returns:
+            Nueva instancia de Vehicle
+        """
+        return Vehicle(
+            vehicle_id,
+            brand,
+            model,
+            year,
+            price,
+            version="" if version is None else version,
+            mileage=0 if mileage is None else mileage,
+            status=VehicleStatus.AVAILABLE,
+            length=length,
+            width=width,
+            height=height,
+            has_bluetooth=has_bluetooth,
+            has_carplay=has_carplay,
+            stock_id="" if stock_id is None else stock_id
+        )
+
     def update_details(
         self,
         version: Optional[str] = None,
@@ -1,7 +1,8 @@
 """
 Value Objects del dominio
 """
-from .vehicle_query import VehicleQuery
+from .vehicle_query import VehicleQuery, VehicleSortOrder
+from .catalog_facets import CatalogFacets
 
-__all__ = ["VehicleQuery"]
+__all__ = ["VehicleQuery", "VehicleSortOrder", "CatalogFacets"]
 
@@ -0,0 +1,25 @@
+"""
+Value Object con los agregados (facetas) del catálogo para un conjunto de filtros.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(slots=True)
+class CatalogFacets:
+    """
+    Conteos y rangos de los vehículos que cumplen una consulta:
+    cantidad por marca, modelo, año y rango de precio, y mínimos/máximos de precio, año y kilometraje.
+    """
+    total: int = 0
+    brands: Dict[str, int] = field(default_factory=dict)
+    models: Dict[str, int] = field(default_factory=dict)
+    years: Dict[int, int] = field(default_factory=dict)
+    price_bands: Dict[float, int] = field(default_factory=dict)
+    price_band_width: float = 100000.0
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_mileage: Optional[int] = None
+    max_mileage: Optional[int] = None
@@ -1,14 +1,36 @@
 """
 Value Object que representa una consulta de búsqueda de vehículos.
 """
+from enum import Enum
 from dataclasses import dataclass
-from typing import Optional
+from typing import Hashable, Optional, Tuple
 
 
-@dataclass
+class VehicleSortOrder(Enum):
+    """Criterio de ordenamiento de los resultados de búsqueda"""
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    YEAR_ASC = "year_asc"
+    YEAR_DESC = "year_desc"
+    MILEAGE_ASC = "mileage_asc"
+    MILEAGE_DESC = "mileage_desc"
+
+    @property
+    def field(self) -> str:
+        """Campo por el que se ordena (price, year o mileage)."""
+        return self.value.rsplit("_", 1)[0]
+
+    @property
+    def descending(self) -> bool:
+        """Indica si el orden es descendente."""
+        return self.value.endswith("_desc")
+
+
+@dataclass(slots=True)
 class VehicleQuery:
     """
-    Value Object que encapsula los criterios de búsqueda de vehículos.
+    Value Object que encapsula los criterios de búsqueda de vehículos,
+    su ordenamiento y la página de resultados solicitada.
     """
     brand: Optional[str] = None
     model: Optional[str] = None
@@ -17,10 +39,14 @@ class VehicleQuery:
     min_year: Optional[int] = None
     max_year: Optional[int] = None
     max_mileage: Optional[int] = None
+    sort_by: Optional[VehicleSortOrder] = None
+    offset: int = 0
+    limit: Optional[int] = None
 
     def has_any_filter(self) -> bool:
         """
         Verifica si la consulta tiene algún filtro aplicado.
+        El ordenamiento y la paginación no cuentan como filtros.
         
         Returns:
             True si al menos un filtro está definido, False en caso contrario
@@ -35,3 +61,29 @@ class VehicleQuery:
             self.max_mileage is not None
         ])
 
+    def cache_key(self) -> Tuple[Hashable, ...]:
+        """
+        Obtiene una forma canónica y hashable de la consulta para usarla como clave de caché.
+        Las marcas y modelos se comparan sin distinguir mayúsculas ni espacios repetidos
+        y los números enteros y decimales equivalentes producen la misma clave.
+        
+        Returns:
+            Tupla con los filtros, el ordenamiento y la página solicitada
+        """
+        return (
+            _canonical_text(self.brand),
+            _canonical_text(self.model),
+            self.min_price,
+            self.max_price,
+            self.min_year,
+            self.max_year,
+            self.max_mileage,
+            self.sort_by.value if self.sort_by else None,
+            self.offset,
+            self.limit
+        )
+
+
+def _canonical_text(value: Optional[str]) -> Optional[str]:
+    """Normaliza un texto de búsqueda a minúsculas con espacios simples."""
+    return " ".join(value.lower().split()) if value is not None else None
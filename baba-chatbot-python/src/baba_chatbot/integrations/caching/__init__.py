@@ -0,0 +1,12 @@
+"""
+Cachés en memoria para resultados reutilizables entre conversaciones
+"""
+from .ttl_lru_cache import TtlLruCache
+from .idempotency_store import IdempotencyBackend, IdempotencyStore, MemoryIdempotencyBackend
+
+__all__ = [
+    "TtlLruCache",
+    "IdempotencyBackend",
+    "IdempotencyStore",
+    "MemoryIdempotencyBackend"
+]
@@ -0,0 +1,226 @@
+"""
+Ejecución idempotente de operaciones identificadas por una clave (por ejemplo el MessageSid
+de Twilio). Las solicitudes repetidas mientras la original sigue en proceso esperan su
+resultado en lugar de repetir el trabajo, y las posteriores reciben el resultado guardado.
+El resultado se guarda en un backend intercambiable: en memoria para un solo proceso o uno
+compartido para varios workers.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional
+from .ttl_lru_cache import TtlLruCache
+
+
+logger = logging.getLogger(__name__)
+
+# Marca que indica que la clave está reservada por una operación en curso
+PENDING = "\x00pending"
+
+
+class IdempotencyBackend(ABC):
+    """
+    Almacenamiento de resultados por clave con expiración.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Obtiene el valor de una clave.
+
+        Args:
+            key: Clave de la operación
+
+        Returns:
+            Resultado guardado, PENDING si está reservada o None si no existe
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, key: str) -> bool:
+        """
+        Reserva una clave si no existe (de forma atómica para todos los workers que comparten el backend).
+
+        Args:
+            key: Clave de la operación
+
+        Returns:
+            True si se reservó; False si ya existía
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        """
+        Guarda el resultado de una clave.
+
+        Args:
+            key: Clave de la operación
+            value: Resultado
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """
+        Libera una clave reservada cuya operación falló, para que se pueda reintentar.
+
+        Args:
+            key: Clave de la operación
+        """
+        pass
+
+
+class MemoryIdempotencyBackend(IdempotencyBackend):
+    """
+    Backend en memoria del proceso, acotado y con expiración (TtlLruCache).
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        """
+        Inicializa el backend.
+
+        Args:
+            max_entries: Claves guardadas como máximo (se descartan las menos usadas)
+            ttl_seconds: Segundos que se conserva cada resultado
+        """
+        self._entries: TtlLruCache[str] = TtlLruCache(max_entries, ttl_seconds)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    async def claim(self, key: str) -> bool:
+        if self._entries.get(key) is not None:
+            return False
+        self._entries.set(key, PENDING)
+        return True
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries.set(key, value)
+
+    async def release(self, key: str) -> None:
+        self._entries.pop(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IdempotencyStore:
+    """
+    Ejecuta operaciones idempotentes por clave sobre un IdempotencyBackend.
+    Las solicitudes repetidas en el mismo proceso se unen a la operación en curso; si la
+    clave la reservó otro proceso, se espera a que su resultado aparezca en el backend.
+    """
+
+    def __init__(
+        self,
+        backend: IdempotencyBackend,
+        wait_timeout_seconds: float = 15.0,
+        poll_interval_seconds: float = 0.25
+    ):
+        """
+        Inicializa el almacén.
+
+        Args:
+            backend: Backend de resultados
+            wait_timeout_seconds: Espera máxima por el resultado de otro proceso
+            poll_interval_seconds: Intervalo de consulta al backend mientras se espera
+        """
+        self._backend = backend
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.coalesced = 0
+        self.replayed = 0
+        self.computed = 0
+
+    async def run(self, key: str, operation: Callable[[], Awaitable[str]]) -> Optional[str]:
+        """
+        Ejecuta la operación una sola vez por clave.
+
+        Args:
+            key: Clave de la operación
+            operation: Operación a ejecutar si la clave no tiene resultado
+
+        Returns:
+            Resultado de la operación (propio, de la operación en curso o guardado), o None si
+            otro proceso la tiene reservada y no terminó dentro de wait_timeout_seconds
+
+        Raises:
+            Exception: La excepción de la operación (las solicitudes unidas a ella también la reciben)
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            logger.info(f"Duplicate request {key} joined the one in progress")
+            return await asyncio.shield(in_flight)
+
+        # Se registra antes del primer await para que los duplicados concurrentes se unan a esta
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._resolve(key, operation)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            # Evita el aviso de excepción no recuperada si nadie se unió a la operación
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _resolve(self, key: str, operation: Callable[[], Awaitable[str]]) -> Optional[str]:
+        """Obtiene el resultado guardado, espera al proceso que reservó la clave o ejecuta la operación."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait_timeout_seconds
+
+        while True:
+            stored = await self._backend.get(key)
+            if stored is not None and stored != PENDING:
+                self.replayed += 1
+                logger.info(f"Replaying stored result for duplicate request {key}")
+                return stored
+
+            if stored is None and await self._backend.claim(key):
+                return await self._execute(key, operation)
+
+            # Reservada por otro proceso: esperar su resultado
+            if loop.time() >= deadline:
+                logger.warning(f"Timed out waiting for request {key} handled by another worker")
+                return None
+            await asyncio.sleep(self._poll_interval_seconds)
+
+    async def _execute(self, key: str, operation: Callable[[], Awaitable[str]]) -> str:
+        """Ejecuta la operación con la clave reservada y guarda su resultado."""
+        self.computed += 1
+        try:
+            result = await operation()
+        except BaseException:
+            await self._backend.release(key)
+            raise
+
+        await self._backend.set(key, result)
+        return result
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        """
+        Obtiene métricas del almacén.
+
+        Args:
+            prefix: Prefijo de los nombres de métrica
+
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return {
+            f"{prefix}_in_flight": len(self._in_flight),
+            f"{prefix}_computed_total": self.computed,
+            f"{prefix}_coalesced_total": self.coalesced,
+            f"{prefix}_replayed_total": self.replayed
+        }
@@ -0,0 +1,128 @@
+"""
+Caché LRU acotada con expiración por antigüedad (TTL).
+Pensada para usarse desde el event loop: no es segura entre hilos.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+V = TypeVar('V')
+
+
+class TtlLruCache(Generic[V]):
+    """
+    Caché de a lo sumo max_entries valores. Al llenarse descarta el menos usado
+    recientemente y un valor deja de devolverse ttl_seconds después de guardarse.
+    Lleva la cuenta de aciertos, fallos y descartes para exponerlos como métricas.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entries: Cantidad máxima de valores guardados (0 deshabilita la caché)
+            ttl_seconds: Segundos que un valor sigue vigente (0 o menos: sin expiración)
+            clock: Reloj monótono en segundos (configurable para pruebas)
+        """
+        self._max_entries = max(0, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[float, V]]' = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        """Indica si la caché guarda valores."""
+        return self._max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Obtiene un valor vigente y lo marca como usado recientemente.
+
+        Args:
+            key: Clave del valor
+
+        Returns:
+            Valor guardado o None si no existe o expiró
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < self._clock():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Guarda un valor, descartando el menos usado recientemente si la caché está llena.
+
+        Args:
+            key: Clave del valor
+            value: Valor a guardar
+        """
+        if not self._max_entries:
+            return
+
+        expires_at = self._clock() + self._ttl_seconds if self._ttl_seconds > 0 else float('inf')
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """
+        Descarta un valor.
+
+        Args:
+            key: Clave del valor
+
+        Returns:
+            Valor descartado o None si no existía
+        """
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Descarta todos los valores guardados (las métricas se conservan)."""
+        self._entries.clear()
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        """
+        Obtiene las métricas de la caché.
+
+        Args:
+            prefix: Prefijo de los nombres de métrica
+
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return {
+            f"{prefix}_entries": len(self._entries),
+            f"{prefix}_hits_total": self.hits,
+            f"{prefix}_misses_total": self.misses,
+            f"{prefix}_evictions_total": self.evictions
+        }
@@ -1,7 +1,26 @@
 """
 Integración con catálogo de vehículos
 """
+from .catalog_index import CatalogIndex
 from .catalog_repository import CatalogRepository
+from .catalog_snapshot import CatalogSnapshot
+from .columnar_catalog import ColumnarCatalog, VehicleView
+from .mapped_catalog import MappedCatalog, write_catalog_file
+from .term_matcher import TermMatcher, fold_text
+from .vehicle_fragments import VehicleFragments, serialize_vehicle, vehicle_payload
 
-__all__ = ["CatalogRepository"]
+__all__ = [
+    "CatalogIndex",
+    "CatalogRepository",
+    "CatalogSnapshot",
+    "ColumnarCatalog",
+    "MappedCatalog",
+    "TermMatcher",
+    "VehicleFragments",
+    "VehicleView",
+    "fold_text",
+    "serialize_vehicle",
+    "vehicle_payload",
+    "write_catalog_file"
+]
 
@@ -0,0 +1,621 @@
+"""
+Índice en memoria sobre el catálogo de vehículos.
+Mantiene buckets hash por marca y modelo (normalizados y con corrección de errores) y arreglos ordenados por precio, año y kilometraje
+para que una búsqueda cueste en proporción a las coincidencias y no al tamaño del catálogo.
+Admite altas, cambios y bajas incrementales para aplicar deltas sin reconstruirse.
+"""
+import math
+import heapq
+import logging
+from array import array
+from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from itertools import compress, islice, repeat
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from ...domain.entities import Vehicle
+from ...domain.value_objects import CatalogFacets, VehicleQuery
+from .term_matcher import BRAND_ALIASES, TermMatcher, fold_text
+
+
+logger = logging.getLogger(__name__)
+
+# Ancho de los rangos de precio de las facetas
+PRICE_BAND_WIDTH = 100000.0
+
+
+class _Filter(NamedTuple):
+    """Filtro preparado: tamaño, generador de candidatos y verificación por posición."""
+    size: int
+    candidates: Callable[[], List[int]]
+    check: Callable[[int], bool]
+    column: str
+    bounds: Optional[Tuple[int, int]] = None
+
+
+class CatalogIndex:
+    """
+    Índice invertido y de rangos sobre las columnas del catálogo.
+    Las posiciones que devuelve corresponden al orden original del catálogo.
+    Solo las posiciones buscables (vehículos disponibles y no eliminados) forman parte
+    de los buckets y de los órdenes; el resto conserva sus valores pero no aparece en búsquedas.
+    """
+
+    def __init__(
+        self,
+        brands: Iterable[str],
+        models: Iterable[str],
+        prices: Iterable[float],
+        years: Iterable[int],
+        mileages: Iterable[int],
+        searchable: Optional[Iterable[bool]] = None
+    ):
+        """
+        Construye el índice a partir de las columnas del catálogo.
+
+        Args:
+            brands: Marca de cada vehículo en orden de catálogo
+            models: Modelo de cada vehículo en orden de catálogo
+            prices: Precio de cada vehículo
+            years: Año de cada vehículo
+            mileages: Kilometraje de cada vehículo
+            searchable: Si cada vehículo aparece en búsquedas (por defecto todos)
+        """
+        # Columnas numéricas por posición
+        self._prices = array('d', prices)
+        self._years = array('q', years)
+        self._mileages = array('q', mileages)
+        self._size = len(self._prices)
+
+        if searchable is None:
+            self._searchable = bytearray(repeat(1, self._size))
+        else:
+            self._searchable = bytearray(map(bool, searchable))
+        self._searchable_count = sum(self._searchable)
+
+        # Claves normalizadas por posición (las cadenas se comparten entre posiciones)
+        self._brand_keys: List[str] = []
+        self._model_keys: List[str] = []
+        self._brand_buckets: Dict[str, array] = {}
+        self._model_buckets: Dict[str, array] = {}
+        self._facets: Optional[CatalogFacets] = None
+
+        # Nombre original (primera aparición) de cada clave normalizada
+        self._display_names: Dict[str, str] = {}
+
+        lowered: Dict[str, str] = {}
+        for position, (brand, model, is_searchable) in enumerate(
+            zip(brands, models, self._searchable)
+        ):
+            brand_key = self._normalize(brand, lowered)
+            model_key = self._normalize(model, lowered)
+            self._brand_keys.append(brand_key)
+            self._model_keys.append(model_key)
+            if is_searchable:
+                self._bucket(self._brand_buckets, brand_key).append(position)
+                self._bucket(self._model_buckets, model_key).append(position)
+
+        # Resolución de marcas y modelos buscados (alias, acentos y errores de escritura)
+        self._brand_terms = TermMatcher(set(self._brand_keys), BRAND_ALIASES)
+        self._model_terms = TermMatcher(set(self._model_keys))
+
+        # Rango de precio de cada posición para las facetas
+        self._price_bands = array('q', map(self._price_band, self._prices))
+
+        # Posiciones buscables ordenadas por cada columna
+        self._price_order = self._sorted_positions(self._prices, self._searchable)
+        self._year_order = self._sorted_positions(self._years, self._searchable)
+        self._mileage_order = self._sorted_positions(self._mileages, self._searchable)
+        self._sort_columns: Dict[str, Tuple[array, array]] = {
+            'price': (self._price_order, self._prices),
+            'year': (self._year_order, self._years),
+            'mileage': (self._mileage_order, self._mileages)
+        }
+
+        logger.info(
+            f"Catalog index built: {self._searchable_count}/{self._size} searchable vehicles, "
+            f"{len(self._brand_buckets)} brands, {len(self._model_buckets)} models"
+        )
+
+    @classmethod
+    def from_vehicles(cls, vehicles: Sequence[Vehicle]) -> 'CatalogIndex':
+        """
+        Construye el índice a partir de los vehículos del catálogo.
+
+        Args:
+            vehicles: Vehículos del catálogo en su orden original
+
+        Returns:
+            Nueva instancia de CatalogIndex
+        """
+        return cls(
+            (vehicle.brand for vehicle in vehicles),
+            (vehicle.model for vehicle in vehicles),
+            (vehicle.price for vehicle in vehicles),
+            (vehicle.year for vehicle in vehicles),
+            (vehicle.mileage for vehicle in vehicles),
+            (vehicle.is_available() for vehicle in vehicles)
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def searchable_count(self) -> int:
+        """Cantidad de vehículos que aparecen en búsquedas."""
+        return self._searchable_count
+
+    def upsert(self, position: int, vehicle: Vehicle) -> None:
+        """
+        Agrega o actualiza la entrada de un vehículo.
+        Si la posición es la siguiente al final del índice, se agrega; si no, se reemplaza.
+        El vehículo solo queda buscable si está disponible.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+            vehicle: Datos actuales del vehículo
+        """
+        if position == self._size:
+            self._brand_keys.append('')
+            self._model_keys.append('')
+            self._prices.append(0.0)
+            self._price_bands.append(0)
+            self._years.append(0)
+            self._mileages.append(0)
+            self._searchable.append(0)
+            self._size += 1
+        else:
+            self._exclude(position)
+
+        self._brand_keys[position] = fold_text(vehicle.brand)
+        self._model_keys[position] = fold_text(vehicle.model)
+        self._brand_terms.add(self._brand_keys[position])
+        self._model_terms.add(self._model_keys[position])
+        self._display_names.setdefault(self._brand_keys[position], vehicle.brand)
+        self._display_names.setdefault(self._model_keys[position], vehicle.model)
+        self._prices[position] = vehicle.price
+        self._price_bands[position] = self._price_band(vehicle.price)
+        self._years[position] = vehicle.year
+        self._mileages[position] = vehicle.mileage
+
+        if vehicle.is_available():
+            self._include(position)
+
+    def remove(self, position: int) -> None:
+        """
+        Quita un vehículo de las búsquedas. La posición se conserva para no
+        desplazar al resto del catálogo.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+        """
+        self._exclude(position)
+
+    def search(self, query: VehicleQuery, limit: Optional[int] = None) -> List[int]:
+        """
+        Obtiene las posiciones de los vehículos que cumplen con el query.
+        Usa como candidatos el filtro más selectivo y verifica el resto sobre ellos.
+        Ignora el orden y la paginación del query (ver search_page).
+
+        Semántica de filtros:
+            - brand/model: subcadena sin distinguir mayúsculas
+            - min/max price y min/max year: rangos inclusivos
+            - max_mileage: kilometraje menor o igual
+
+        Args:
+            query: Criterios de búsqueda
+            limit: Cantidad máxima de posiciones a devolver (opcional)
+
+        Returns:
+            Posiciones de los vehículos coincidentes en orden de catálogo
+        """
+        filters = self._plan(query)
+
+        if not filters:
+            return list(islice(compress(range(self._size), self._searchable), limit))
+
+        positions = self._collect(filters)
+        if limit is None:
+            positions.sort()
+            return positions
+
+        return heapq.nsmallest(limit, positions)
+
+    def search_page(self, query: VehicleQuery) -> Tuple[List[int], int]:
+        """
+        Obtiene una página de resultados ordenada según query.sort_by (o en orden de catálogo),
+        desde query.offset y con a lo sumo query.limit posiciones.
+        Con un filtro o ninguno, el total se conoce sin recorrer coincidencias y la página
+        se toma recorriendo el orden de la columna (top-k sin ordenar resultados); con varios
+        filtros se seleccionan los k mejores con un heap en lugar de ordenar todas las coincidencias.
+
+        Args:
+            query: Criterios de búsqueda, orden y paginación
+
+        Returns:
+            Tupla (posiciones de la página, total de coincidencias)
+        """
+        filters = self._plan(query)
+        offset = max(query.offset, 0)
+        end = None if query.limit is None else offset + max(query.limit, 0)
+
+        if query.sort_by is None:
+            if not filters:
+                positions = compress(range(self._size), self._searchable)
+                return list(islice(positions, offset, end)), self._searchable_count
+
+            positions = self._collect(filters)
+            if end is None:
+                positions.sort()
+                return positions[offset:], len(positions)
+            return heapq.nsmallest(end, positions)[offset:], len(positions)
+
+        order, values = self._sort_columns[query.sort_by.field]
+        descending = query.sort_by.descending
+
+        # Con a lo sumo un filtro se recorre el orden de la columna de ordenamiento
+        if len(filters) <= 1:
+            start, stop, check, total = 0, len(order), None, self._searchable_count
+
+            if filters:
+                only = filters[0]
+                if only.column == query.sort_by.field:
+                    start, stop = only.bounds
+                    total = only.size
+                elif self._prefer_walk(only.size, len(order), end):
+                    check, total = only.check, only.size
+                else:
+                    start = None
+
+            if start is not None:
+                return self._walk(order, start, stop, descending, check, offset, end), total
+
+        positions = self._collect(filters)
+
+        # Con muchas coincidencias, recorrer el orden marcándolas evita ordenar con una clave en Python
+        if self._prefer_walk(len(positions), len(order), end):
+            matched = bytearray(self._size)
+            for position in positions:
+                matched[position] = 1
+            page = self._walk(order, 0, len(order), descending, matched.__getitem__, offset, end)
+            return page, len(positions)
+
+        key = lambda position: (values[position], position)
+
+        if end is None:
+            page = sorted(positions, key=key, reverse=descending)
+        elif descending:
+            page = heapq.nlargest(end, positions, key=key)
+        else:
+            page = heapq.nsmallest(end, positions, key=key)
+
+        return page[offset:], len(positions)
+
+    @staticmethod
+    def _walk(
+        order: array,
+        start: int,
+        stop: int,
+        descending: bool,
+        check: Optional[Callable[[int], bool]],
+        offset: int,
+        end: Optional[int]
+    ) -> List[int]:
+        """
+        Recorre un tramo del orden de una columna y toma la página de posiciones que pasan la verificación.
+
+        Args:
+            order: Posiciones ordenadas por el valor de la columna
+            start: Índice inicial del tramo
+            stop: Índice final (exclusivo) del tramo
+            descending: Si se recorre de mayor a menor
+            check: Verificación por posición (None si todas pasan)
+            offset: Posiciones coincidentes a saltar
+            end: Índice final de la página entre las coincidentes (None si no hay límite)
+
+        Returns:
+            Posiciones de la página
+        """
+        indexes = range(start, stop)
+        if descending:
+            indexes = indexes[::-1]
+
+        if check is None:
+            return [order[index] for index in indexes[offset:end]]
+
+        walked = filter(check, map(order.__getitem__, indexes))
+        return list(islice(walked, offset, end))
+
+    def facets(self, query: VehicleQuery) -> CatalogFacets:
+        """
+        Agrega los vehículos que cumplen el query: conteos por marca, modelo, año y rango
+        de precio, y mínimos/máximos. Las facetas del catálogo completo se calculan una vez
+        y se reutilizan hasta que un delta modifica el índice.
+
+        Args:
+            query: Criterios de búsqueda (se ignoran orden y paginación)
+
+        Returns:
+            Facetas de las coincidencias
+        """
+        filters = self._plan(query)
+
+        if filters:
+            return self._aggregate(self._collect(filters))
+
+        if self._facets is None:
+            self._facets = self._aggregate(list(compress(range(self._size), self._searchable)))
+        return self._facets
+
+    def _aggregate(self, positions: List[int]) -> CatalogFacets:
+        """
+        Calcula las facetas de un conjunto de posiciones.
+
+        Args:
+            positions: Posiciones a agregar
+
+        Returns:
+            Facetas con conteos ordenados de mayor a menor (años y rangos de precio en orden ascendente)
+        """
+        if not positions:
+            return CatalogFacets(price_band_width=PRICE_BAND_WIDTH)
+
+        display = self._display_names
+        brands = Counter(map(self._brand_keys.__getitem__, positions))
+        models = Counter(map(self._model_keys.__getitem__, positions))
+        years = Counter(map(self._years.__getitem__, positions))
+        bands = Counter(map(self._price_bands.__getitem__, positions))
+        prices = list(map(self._prices.__getitem__, positions))
+        mileages = list(map(self._mileages.__getitem__, positions))
+
+        return CatalogFacets(
+            total=len(positions),
+            brands={display[key]: count for key, count in brands.most_common()},
+            models={display[key]: count for key, count in models.most_common()},
+            years=dict(sorted(years.items())),
+            price_bands={band * PRICE_BAND_WIDTH: count for band, count in sorted(bands.items())},
+            price_band_width=PRICE_BAND_WIDTH,
+            min_price=min(prices),
+            max_price=max(prices),
+            min_year=min(years),
+            max_year=max(years),
+            min_mileage=min(mileages),
+            max_mileage=max(mileages)
+        )
+
+    def _plan(self, query: VehicleQuery) -> List['_Filter']:
+        """
+        Prepara los filtros del query ordenados del más al menos selectivo.
+
+        Args:
+            query: Criterios de búsqueda
+
+        Returns:
+            Filtros a aplicar
+        """
+        filters: List[_Filter] = []
+
+        if query.brand:
+            filters.append(self._text_filter(
+                'brand', query.brand, self._brand_terms, self._brand_buckets, self._brand_keys
+            ))
+
+        if query.model:
+            filters.append(self._text_filter(
+                'model', query.model, self._model_terms, self._model_buckets, self._model_keys
+            ))
+
+        if query.min_price is not None or query.max_price is not None:
+            filters.append(self._range_filter(
+                'price', self._price_order, self._prices, query.min_price, query.max_price
+            ))
+
+        if query.min_year is not None or query.max_year is not None:
+            filters.append(self._range_filter(
+                'year', self._year_order, self._years, query.min_year, query.max_year
+            ))
+
+        if query.max_mileage is not None:
+            filters.append(self._range_filter(
+                'mileage', self._mileage_order, self._mileages, None, query.max_mileage
+            ))
+
+        filters.sort(key=lambda f: f.size)
+        return filters
+
+    @staticmethod
+    def _collect(filters: List['_Filter']) -> List[int]:
+        """
+        Obtiene las posiciones que cumplen todos los filtros (sin un orden particular).
+        Los candidatos salen del filtro más selectivo y se verifican con el resto.
+
+        Args:
+            filters: Filtros ordenados por selectividad
+
+        Returns:
+            Posiciones coincidentes
+        """
+        if filters[0].size == 0:
+            return []
+
+        checks = [f.check for f in filters[1:]]
+        return [
+            position for position in filters[0].candidates()
+            if all(check(position) for check in checks)
+        ]
+
+    @staticmethod
+    def _prefer_walk(candidates: int, ordered: int, end: Optional[int]) -> bool:
+        """
+        Decide si conviene recorrer el orden de la columna verificando las coincidencias
+        en lugar de seleccionar con un heap entre los candidatos.
+        Recorrer cuesta del orden de end * ordered / candidates posiciones;
+        el heap, del orden de candidates.
+
+        Args:
+            candidates: Cantidad de posiciones candidatas
+            ordered: Cantidad de posiciones en el orden de la columna
+            end: Posición final de la página (None si no hay límite)
+
+        Returns:
+            True si conviene recorrer el orden
+        """
+        if end is None or candidates == 0:
+            return False
+        return end * ordered <= candidates * candidates
+
+    def _include(self, position: int) -> None:
+        """Agrega una posición a los buckets y a los órdenes por columna."""
+        if self._searchable[position]:
+            return
+
+        self._bucket(self._brand_buckets, self._brand_keys[position]).append(position)
+        self._bucket(self._model_buckets, self._model_keys[position]).append(position)
+        self._insert_sorted(self._price_order, self._prices, position)
+        self._insert_sorted(self._year_order, self._years, position)
+        self._insert_sorted(self._mileage_order, self._mileages, position)
+        self._searchable[position] = 1
+        self._searchable_count += 1
+        self._facets = None
+
+    def _exclude(self, position: int) -> None:
+        """Quita una posición de los buckets y de los órdenes por columna."""
+        if not self._searchable[position]:
+            return
+
+        self._unbucket(self._brand_buckets, self._brand_keys[position], position)
+        self._unbucket(self._model_buckets, self._model_keys[position], position)
+        self._remove_sorted(self._price_order, self._prices, position)
+        self._remove_sorted(self._year_order, self._years, position)
+        self._remove_sorted(self._mileage_order, self._mileages, position)
+        self._searchable[position] = 0
+        self._searchable_count -= 1
+        self._facets = None
+
+    def _text_filter(
+        self,
+        column: str,
+        text: str,
+        terms: TermMatcher,
+        buckets: Dict[str, array],
+        keys: List[str]
+    ) -> '_Filter':
+        """
+        Prepara un filtro sobre las claves de un bucket (marca o modelo).
+        El texto se resuelve a claves con el TermMatcher (alias, subcadena o corrección
+        de errores), así que solo se recorren las claves distintas, no los vehículos.
+
+        Args:
+            column: Nombre de la columna filtrada
+            text: Texto buscado
+            terms: Índice de términos de la columna
+            buckets: Buckets por clave normalizada
+            keys: Clave normalizada de cada posición
+
+        Returns:
+            Filtro preparado
+        """
+        matching_keys: Set[str] = {key for key in terms.resolve(text) if key in buckets}
+        size = sum(len(buckets[key]) for key in matching_keys)
+
+        def candidates() -> List[int]:
+            positions: List[int] = []
+            for key in matching_keys:
+                positions.extend(buckets[key])
+            return positions
+
+        return _Filter(size, candidates, lambda position: keys[position] in matching_keys, column)
+
+    def _range_filter(
+        self,
+        column: str,
+        order: array,
+        values: array,
+        low: Optional[float],
+        high: Optional[float]
+    ) -> '_Filter':
+        """
+        Prepara un filtro de rango inclusivo usando búsqueda binaria sobre el orden de la columna.
+
+        Args:
+            column: Nombre de la columna filtrada
+            order: Posiciones ordenadas por el valor de la columna
+            values: Valores de la columna por posición
+            low: Límite inferior (opcional)
+            high: Límite superior (opcional)
+
+        Returns:
+            Filtro preparado (con el rango de índices que ocupa dentro del orden)
+        """
+        key = values.__getitem__
+        start = 0 if low is None else bisect_left(order, low, key=key)
+        end = len(order) if high is None else bisect_right(order, high, key=key)
+
+        def check(position: int) -> bool:
+            value = values[position]
+            if low is not None and value < low:
+                return False
+            if high is not None and value > high:
+                return False
+            return True
+
+        end = max(end, start)
+        return _Filter(end - start, lambda: order[start:end].tolist(), check, column, (start, end))
+
+    def _normalize(self, value: str, lowered: Dict[str, str]) -> str:
+        """
+        Normaliza una marca o modelo (ver fold_text) reutilizando la misma cadena para valores repetidos.
+        Registra la primera forma original de cada clave para mostrarla en las facetas.
+
+        Args:
+            value: Valor original
+            lowered: Caché de valores ya normalizados
+
+        Returns:
+            Valor normalizado
+        """
+        key = lowered.get(value)
+        if key is None:
+            key = fold_text(value)
+            key = lowered.setdefault(key, key)
+            lowered[value] = key
+            self._display_names.setdefault(key, value)
+        return key
+
+    @staticmethod
+    def _price_band(price: float) -> int:
+        """Obtiene el número de rango de precio de un valor (0 para valores no finitos)."""
+        return int(price // PRICE_BAND_WIDTH) if math.isfinite(price) else 0
+
+    @staticmethod
+    def _bucket(buckets: Dict[str, array], key: str) -> array:
+        """Obtiene (o crea) el bucket de posiciones para una clave."""
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = array('I')
+        return bucket
+
+    @staticmethod
+    def _unbucket(buckets: Dict[str, array], key: str, position: int) -> None:
+        """Quita una posición de su bucket y elimina el bucket si queda vacío."""
+        bucket = buckets[key]
+        bucket.remove(position)
+        if not bucket:
+            del buckets[key]
+
+    @staticmethod
+    def _insert_sorted(order: array, values: array, position: int) -> None:
+        """Inserta una posición en un orden por columna (los empates quedan en orden de catálogo)."""
+        insort(order, position, key=lambda p: (values[p], p))
+
+    @staticmethod
+    def _remove_sorted(order: array, values: array, position: int) -> None:
+        """Quita una posición de un orden por columna ubicándola por búsqueda binaria."""
+        index = bisect_left(order, (values[position], position), key=lambda p: (values[p], p))
+        del order[index]
+
+    @staticmethod
+    def _sorted_positions(values: array, searchable: bytearray) -> array:
+        """Devuelve las posiciones buscables ordenadas por el valor de la columna (estable)."""
+        return array(
+            'I', sorted(compress(range(len(values)), searchable), key=values.__getitem__)
+        )
@@ -1,19 +1,79 @@
 """
 Repositorio para cargar y consultar el catálogo de vehículos desde archivos CSV y JSON.
-Implementa caché en memoria para optimizar el rendimiento.
+Implementa caché en memoria e índices de búsqueda para optimizar el rendimiento,
+y aplica de forma incremental un feed de deltas (JSONL) sin recargar el catálogo completo.
 """
 import os
 import json
 import csv
+import time
+import asyncio
 import logging
-from typing import List, Optional, Dict
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Callable, List, Optional, Dict, Sequence, Set, Tuple
 from ...application.abstractions.interfaces import ICatalogRepository
-from ...domain.entities import Vehicle
-from ...domain.value_objects import VehicleQuery
+from ...domain.entities import Vehicle, VehicleStatus
+from ...domain.value_objects import CatalogFacets, VehicleQuery
+from .catalog_index import CatalogIndex
+from .catalog_snapshot import CatalogSnapshot
+from .columnar_catalog import ColumnarCatalog, VehicleView
+from .mapped_catalog import MappedCatalog, write_catalog_file
+from .vehicle_fragments import VehicleFragments
 
 
 logger = logging.getLogger(__name__)
 
+# Filas del CSV que se convierten por lote
+_CSV_BATCH_SIZE = 10000
+
+
+def _parse_delta_bool(value: Any) -> bool:
+    """
+    Convierte un booleano de delta de forma estricta (bool("false") sería True).
+
+    Args:
+        value: Booleano JSON o texto "true"/"false"/"1"/"0"
+
+    Returns:
+        Booleano convertido
+
+    Raises:
+        ValueError: Si el valor no es un booleano reconocido
+    """
+    if isinstance(value, bool):
+        return value
+
+    text = str(value).strip().lower() if isinstance(value, (str, int)) else None
+    if text in ('true', '1'):
+        return True
+    if text in ('false', '0'):
+        return False
+    raise ValueError(f"invalid boolean value: {value!r}")
+
+
+# Campos que un delta puede modificar y su conversión
+_DELTA_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    'brand': str,
+    'model': str,
+    'version': str,
+    'year': int,
+    'price': float,
+    'mileage': int,
+    'length': int,
+    'width': int,
+    'height': int,
+    'has_bluetooth': _parse_delta_bool,
+    'has_carplay': _parse_delta_bool,
+    'status': lambda value: VehicleStatus(str(value).lower())
+}
+
+# Campos obligatorios para dar de alta un vehículo desde un delta
+_REQUIRED_DELTA_FIELDS = {'brand', 'model', 'year', 'price'}
+
+# Campos de delta que admiten null
+_NULLABLE_DELTA_FIELDS = {'length', 'width', 'height', 'has_bluetooth', 'has_carplay'}
+
 
 class CatalogRepository(ICatalogRepository):
     """
@@ -23,7 +83,10 @@ class CatalogRepository(ICatalogRepository):
     def __init__(
         self,
         catalog_file_path: str = "./data/catalog/cars_extract.json",
-        csv_file_path: str = None
+        csv_file_path: str = None,
+        columnar: bool = False,
+        delta_file_path: str = None,
+        snapshot_file_path: str = None
     ):
         """
         Inicializa el repositorio de catálogo.
@@ -31,33 +94,53 @@ class CatalogRepository(ICatalogRepository):
         Args:
             catalog_file_path: Ruta al archivo JSON del catálogo
             csv_file_path: Ruta al archivo CSV del catálogo (opcional)
+            columnar: Si se usa el almacén columnar para reducir memoria (opcional)
+            delta_file_path: Ruta al feed JSONL de deltas del catálogo (opcional)
+            snapshot_file_path: Ruta al snapshot binario compilado; si existe, se carga
+                en lugar de los archivos CSV/JSON (opcional)
         """
         self._catalog_file_path = catalog_file_path
         self._csv_file_path = csv_file_path
-        self._cached_vehicles: Optional[List[Vehicle]] = None
-
-    async def search_vehicles(self, query: VehicleQuery) -> List[Vehicle]:
+        self._columnar = columnar
+        self._delta_file_path = delta_file_path
+        self._snapshot_file_path = snapshot_file_path
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._load_lock = asyncio.Lock()
+        self._delta_offset = 0
+        self._revision = 0
+        self._reloads_total = 0
+        self._reload_failures_total = 0
+        self._deltas_applied_total = 0
+        self._delta_errors_total = 0
+
+    async def search_vehicles(self, query: VehicleQuery) -> Sequence[Vehicle]:
         """
-        Busca vehículos en el catálogo aplicando los filtros especificados en el query.
-        Si no hay filtros, devuelve los primeros 10 vehículos.
+        Busca vehículos en el catálogo aplicando los filtros especificados en el query,
+        ordenados según query.sort_by y paginados con query.offset y query.limit.
+        Si no hay filtros ni límite, devuelve los primeros 10 vehículos.
+        Los vehículos vendidos, reservados o eliminados por deltas no aparecen.
         
         Args:
-            query: Criterios de búsqueda
+            query: Criterios de búsqueda, orden y paginación
             
         Returns:
-            Lista de vehículos que coinciden con los criterios
+            Vista con la página de vehículos que coinciden con los criterios; su atributo
+            total indica cuántos coinciden en total (los vehículos se materializan al leerlos)
         """
-        all_vehicles = await self._load_vehicles()
+        snapshot = await self._get_snapshot()
+
+        if snapshot is None:
+            return VehicleView([], [])
 
-        if not query.has_any_filter():
-            return all_vehicles[:10]
+        if query.limit is None and not query.has_any_filter():
+            query = replace(query, limit=10)
 
-        filtered = [v for v in all_vehicles if self._matches_query(v, query)]
-        return filtered
+        positions, total = snapshot.index.search_page(query)
+        return VehicleView(snapshot.vehicles, positions, total, snapshot.fragments)
 
     async def get_vehicle_by_id(self, vehicle_id: str) -> Optional[Vehicle]:
         """
-        Obtiene un vehículo específico por su ID o stock_id.
+        Obtiene un vehículo específico por su ID o stock_id, sin importar su estado.
         
         Args:
             vehicle_id: ID o stock_id del vehículo
@@ -65,108 +148,610 @@ class CatalogRepository(ICatalogRepository):
         Returns:
             Vehículo encontrado o None si no existe
         """
-        vehicles = await self._load_vehicles()
-        return next(
-            (v for v in vehicles if v.id == vehicle_id or v.stock_id == vehicle_id),
-            None
-        )
+        snapshot = await self._get_snapshot()
 
-    async def _load_vehicles(self) -> List[Vehicle]:
+        if snapshot is None:
+            return None
+
+        position = snapshot.positions_by_id.get(vehicle_id)
+        return snapshot.vehicles[position] if position is not None else None
+
+    async def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Optional[Vehicle]]:
         """
-        Carga los vehículos desde archivos CSV y JSON con caché en memoria.
+        Obtiene varios vehículos por su ID o stock_id en una sola pasada.
         
+        Args:
+            vehicle_ids: IDs o stock_ids de los vehículos
+            
         Returns:
-            Lista de vehículos cargados
+            Vehículos en el mismo orden de los IDs (None para los que no existen)
         """
-        if self._cached_vehicles is not None:
-            return self._cached_vehicles
+        snapshot = await self._get_snapshot()
 
-        try:
-            vehicles = []
+        if snapshot is None:
+            return [None] * len(vehicle_ids)
 
-            # Cargar desde CSV si existe
-            if self._csv_file_path and os.path.exists(self._csv_file_path):
-                logger.info(f"Loading vehicles from CSV: {self._csv_file_path}")
-                vehicles.extend(await self._load_from_csv(self._csv_file_path))
+        positions = [snapshot.positions_by_id.get(vehicle_id) for vehicle_id in vehicle_ids]
+        return [
+            snapshot.vehicles[position] if position is not None else None
+            for position in positions
+        ]
 
-            # Cargar desde JSON si existe
-            if os.path.exists(self._catalog_file_path):
-                logger.info(f"Loading vehicles from JSON: {self._catalog_file_path}")
-                vehicles.extend(await self._load_from_json(self._catalog_file_path))
+    async def get_catalog_facets(self, query: VehicleQuery) -> CatalogFacets:
+        """
+        Obtiene conteos por marca, modelo, año y rango de precio, y mínimos/máximos,
+        de los vehículos que cumplen el query, en una sola agregación sobre el índice.
+        
+        Args:
+            query: Criterios de búsqueda (se ignoran orden y paginación)
+            
+        Returns:
+            Facetas del catálogo para los filtros
+        """
+        snapshot = await self._get_snapshot()
+
+        if snapshot is None:
+            return CatalogFacets()
+
+        return snapshot.index.facets(query)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Indica si el catálogo ya está cargado en memoria."""
+        return self._snapshot is not None
+
+    @property
+    def revision(self) -> int:
+        """Revisión del contenido del catálogo (aumenta con cada recarga y cada lote de deltas)."""
+        return self._revision
+
+    @property
+    def source_paths(self) -> List[str]:
+        """Rutas de los archivos fuente del catálogo (para detectar cambios)."""
+        paths = (self._snapshot_file_path, self._csv_file_path, self._catalog_file_path)
+        return [path for path in paths if path]
+
+    @property
+    def delta_file_path(self) -> Optional[str]:
+        """Ruta del feed de deltas del catálogo (None si no está configurado)."""
+        return self._delta_file_path
+
+    async def warm_up(self) -> None:
+        """Carga el catálogo por adelantado para que la primera solicitud no pague el costo."""
+        snapshot = await self._get_snapshot()
+        vehicle_count = len(snapshot) if snapshot is not None else 0
+        logger.info(f"Catalog warm-up completed: {vehicle_count} vehicles")
+
+    async def reload(self) -> bool:
+        """
+        Recarga el catálogo desde los archivos y reemplaza el snapshot de forma atómica.
+        El nuevo snapshot (vehículos e índices) se construye fuera del event loop; las búsquedas
+        en curso siguen usando el anterior. Si la carga falla se conserva el snapshot actual.
+        
+        Returns:
+            True si el catálogo se recargó correctamente
+        """
+        async with self._load_lock:
+            return await self._reload_locked()
 
-            if not vehicles:
-                logger.warning("No catalog files found or loaded")
+    async def export_snapshot_file(self, file_path: str) -> int:
+        """
+        Compila el catálogo cargado a un snapshot binario que los workers pueden mapear con mmap.
+        
+        Args:
+            file_path: Ruta del snapshot a generar
+            
+        Returns:
+            Tamaño del snapshot en bytes
+        """
+        snapshot = await self._get_snapshot()
+        vehicles = snapshot.vehicles if snapshot is not None else []
+        sources = [
+            path for path in (self._csv_file_path, self._catalog_file_path)
+            if path and os.path.exists(path)
+        ]
 
-            self._cached_vehicles = vehicles
-            logger.info(f"Loaded {len(self._cached_vehicles)} vehicles from catalog")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, write_catalog_file, file_path, vehicles, sources)
 
-            return self._cached_vehicles
+    async def apply_deltas(self) -> int:
+        """
+        Aplica sobre el catálogo en memoria los deltas agregados al feed desde la última lectura.
+        Cada delta es una línea JSON con "stock_id", "op" ("upsert" o "delete") y los campos
+        a modificar; por ejemplo: {"op": "upsert", "stock_id": "243885", "status": "sold"}.
+        El lote se aplica sin puntos de espera, así que una búsqueda ve todos sus cambios o ninguno.
+        Si el feed fue truncado se recarga el catálogo completo, que vuelve a aplicarlo desde el inicio.
+        
+        Returns:
+            Cantidad de deltas aplicados
+        """
+        if not self._delta_file_path or await self._get_snapshot() is None:
+            return 0
+
+        async with self._load_lock:
+            snapshot = self._snapshot
+            loop = asyncio.get_running_loop()
+
+            try:
+                records, offset = await loop.run_in_executor(
+                    None, self._read_delta_file, self._delta_file_path, self._delta_offset
+                )
+            except Exception as ex:
+                logger.error(f"Error reading catalog deltas: {ex}")
+                self._delta_errors_total += 1
+                return 0
+
+            if records is None:
+                logger.warning("Catalog delta feed was truncated, reloading the full catalog")
+                await self._reload_locked()
+                return 0
+
+            started = time.perf_counter()
+            applied = 0
+            for record in records:
+                change = self._apply_delta(snapshot.vehicles, snapshot.positions_by_id, record)
+                if change is None:
+                    continue
+
+                position, vehicle = change
+                if vehicle is None:
+                    snapshot.index.remove(position)
+                else:
+                    snapshot.index.upsert(position, vehicle)
+                    snapshot.fragments.update(position, vehicle)
+                applied += 1
+
+            self._delta_offset = offset
+            self._deltas_applied_total += applied
+
+            if applied:
+                self._revision += 1
+                logger.info(
+                    f"Applied {applied} catalog deltas in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+
+            return applied
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Obtiene métricas del catálogo cargado y de sus recargas.
+        
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        snapshot = self._snapshot
+        return {
+            "catalog_vehicles": len(snapshot) if snapshot else 0,
+            "catalog_searchable_vehicles": snapshot.index.searchable_count if snapshot else 0,
+            "catalog_version": snapshot.version if snapshot else 0,
+            "catalog_revision": self._revision,
+            "catalog_loaded_timestamp_seconds": snapshot.loaded_at if snapshot else 0,
+            "catalog_load_duration_seconds": snapshot.load_seconds if snapshot else 0,
+            "catalog_reloads_total": self._reloads_total,
+            "catalog_reload_failures_total": self._reload_failures_total,
+            "catalog_delta_offset_bytes": self._delta_offset,
+            "catalog_deltas_applied_total": self._deltas_applied_total,
+            "catalog_delta_errors_total": self._delta_errors_total
+        }
+
+    async def _get_snapshot(self) -> Optional[CatalogSnapshot]:
+        """
+        Obtiene el snapshot actual cargándolo la primera vez.
+        Las solicitudes concurrentes comparten una única carga.
+        
+        Returns:
+            Snapshot del catálogo o None si no se pudo cargar
+        """
+        if self._snapshot is not None:
+            return self._snapshot
+
+        async with self._load_lock:
+            # Otra corrutina pudo completar la carga mientras se esperaba el lock
+            if self._snapshot is None:
+                snapshot = await self._load_snapshot()
+                if snapshot is not None:
+                    self._activate_snapshot(snapshot)
+
+            return self._snapshot
+
+    async def _reload_locked(self) -> bool:
+        """
+        Construye un snapshot nuevo y lo activa. Debe llamarse con el lock de carga tomado.
+        
+        Returns:
+            True si el catálogo se recargó correctamente
+        """
+        snapshot = await self._load_snapshot()
+
+        if snapshot is None:
+            self._reload_failures_total += 1
+            return False
+
+        self._activate_snapshot(snapshot)
+        self._reloads_total += 1
+        return True
+
+    def _activate_snapshot(self, snapshot: CatalogSnapshot) -> None:
+        """Reemplaza el snapshot actual y continúa el feed de deltas desde donde lo dejó."""
+        self._snapshot = snapshot
+        self._delta_offset = snapshot.delta_offset
+        self._revision += 1
+
+    async def _load_snapshot(self) -> Optional[CatalogSnapshot]:
+        """
+        Construye un snapshot nuevo en un hilo del executor.
+        
+        Returns:
+            Snapshot construido o None si hubo error
+        """
+        version = (self._snapshot.version if self._snapshot else 0) + 1
+        loop = asyncio.get_running_loop()
+
+        try:
+            return await loop.run_in_executor(None, self._build_snapshot, version)
         except Exception as ex:
             logger.error(f"Error loading catalog: {ex}")
-            return []
+            return None
 
-    async def _load_from_csv(self, file_path: str) -> List[Vehicle]:
+    def _build_snapshot(self, version: int) -> CatalogSnapshot:
         """
-        Carga vehículos desde un archivo CSV.
-        Formato esperado: stock_id,km,price,make,model,year,version,bluetooth,largo,ancho,altura,car_play
+        Carga los vehículos desde los archivos configurados y construye índices y mapas.
         
         Args:
-            file_path: Ruta al archivo CSV
+            version: Número de versión del nuevo snapshot
             
         Returns:
-            Lista de vehículos cargados
+            Snapshot del catálogo
+        """
+        started = time.perf_counter()
+        vehicles: Sequence[Vehicle] = ColumnarCatalog() if self._columnar else []
+
+        # Cargar el snapshot binario si existe (sin parsear CSV ni JSON)
+        if self._snapshot_file_path and os.path.exists(self._snapshot_file_path):
+            logger.info(f"Mapping catalog snapshot: {self._snapshot_file_path}")
+            vehicles = MappedCatalog(self._snapshot_file_path)
+            self._warn_if_stale(self._snapshot_file_path)
+
+        # Cargar desde CSV si existe
+        elif self._csv_file_path and os.path.exists(self._csv_file_path):
+            logger.info(f"Loading vehicles from CSV: {self._csv_file_path}")
+            vehicles = self._read_csv_file(self._csv_file_path)
+
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            logger.info(
+                f"Parsed {len(vehicles)} rows from CSV in {elapsed:.2f}s "
+                f"({len(vehicles) / elapsed:.0f} rows/s)"
+            )
+
+        # Cargar desde JSON si existe (el snapshot binario ya lo incluye)
+        if not isinstance(vehicles, MappedCatalog) and os.path.exists(self._catalog_file_path):
+            logger.info(f"Loading vehicles from JSON: {self._catalog_file_path}")
+            vehicles.extend(self._read_json_file(self._catalog_file_path))
+
+        if not vehicles:
+            logger.warning("No catalog files found or loaded")
+
+        if isinstance(vehicles, (ColumnarCatalog, MappedCatalog)):
+            positions_by_id = self._build_id_map(vehicles.ids, vehicles.stock_ids)
+        else:
+            positions_by_id = self._build_id_map(
+                [vehicle.id for vehicle in vehicles],
+                [vehicle.stock_id for vehicle in vehicles]
+            )
+
+        # Fragmentos JSON de los vehículos (del snapshot binario o serializados al pedirlos)
+        fragments = VehicleFragments(
+            vehicles, vehicles.fragments if isinstance(vehicles, MappedCatalog) else None
+        )
+
+        # Reaplicar el feed de deltas completo antes de indexar
+        removed: Set[int] = set()
+        delta_offset = 0
+        if self._delta_file_path:
+            records, delta_offset = self._read_delta_file(self._delta_file_path, 0)
+            for record in records:
+                change = self._apply_delta(vehicles, positions_by_id, record)
+                if change is None:
+                    continue
+                if change[1] is None:
+                    removed.add(change[0])
+                else:
+                    fragments.update(*change)
+            logger.info(f"Replayed {len(records)} catalog deltas ({len(removed)} deletions)")
+
+        index = self._build_index(vehicles, removed)
+
+        load_seconds = time.perf_counter() - started
+        logger.info(
+            f"Loaded {len(vehicles)} vehicles from catalog "
+            f"(version {version}, {load_seconds:.2f}s)"
+        )
+
+        return CatalogSnapshot(
+            vehicles=vehicles,
+            index=index,
+            positions_by_id=positions_by_id,
+            fragments=fragments,
+            version=version,
+            loaded_at=time.time(),
+            load_seconds=load_seconds,
+            delta_offset=delta_offset
+        )
+
+    def _warn_if_stale(self, snapshot_path: str) -> None:
+        """
+        Advierte si alguno de los archivos de origen es más reciente que el snapshot binario.
+        
+        Args:
+            snapshot_path: Ruta del snapshot binario
+        """
+        snapshot_mtime = os.path.getmtime(snapshot_path)
+        for path in (self._csv_file_path, self._catalog_file_path):
+            if path and os.path.exists(path) and os.path.getmtime(path) > snapshot_mtime:
+                logger.warning(
+                    f"Catalog snapshot {snapshot_path} is older than {path}; "
+                    f"rebuild it with 'baba-catalog build'"
+                )
+
+    def _build_index(self, vehicles: Sequence[Vehicle], removed: Set[int]) -> CatalogIndex:
+        """
+        Construye el índice de búsqueda dejando fuera los vehículos no disponibles o eliminados.
+        
+        Args:
+            vehicles: Vehículos del catálogo
+            removed: Posiciones eliminadas por deltas
+            
+        Returns:
+            Índice del catálogo
+        """
+        if isinstance(vehicles, (ColumnarCatalog, MappedCatalog)):
+            columns = (
+                vehicles.brands, vehicles.models, vehicles.prices,
+                vehicles.years, vehicles.mileages, vehicles.statuses
+            )
+        else:
+            columns = (
+                (vehicle.brand for vehicle in vehicles),
+                (vehicle.model for vehicle in vehicles),
+                (vehicle.price for vehicle in vehicles),
+                (vehicle.year for vehicle in vehicles),
+                (vehicle.mileage for vehicle in vehicles),
+                (vehicle.status for vehicle in vehicles)
+            )
+
+        *values, statuses = columns
+        searchable = [status is VehicleStatus.AVAILABLE for status in statuses]
+        for position in removed:
+            searchable[position] = False
+
+        return CatalogIndex(*values, searchable=searchable)
+
+    def _read_delta_file(self, file_path: str, offset: int) -> Tuple[Optional[List[Dict]], int]:
         """
-        vehicles = []
+        Lee los deltas escritos en el feed a partir de una posición.
+        Solo consume líneas completas: una línea a medio escribir se lee en la siguiente pasada.
         
+        Args:
+            file_path: Ruta al feed JSONL de deltas
+            offset: Posición en bytes desde la que leer
+            
+        Returns:
+            Tupla (deltas leídos, nueva posición); los deltas son None si el feed es
+            más corto que la posición (fue truncado o reemplazado)
+        """
+        if not os.path.exists(file_path):
+            return [], offset
+
+        with open(file_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < offset:
+                return None, 0
+
+            f.seek(offset)
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        records: List[Dict] = []
+
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+
+            try:
+                records.append(json.loads(line))
+            except ValueError as ex:
+                logger.warning(f"Skipping invalid catalog delta line: {ex}")
+                self._delta_errors_total += 1
+
+        return records, offset + end
+
+    def _apply_delta(
+        self,
+        vehicles: Sequence[Vehicle],
+        positions_by_id: Dict[str, int],
+        record: Dict
+    ) -> Optional[Tuple[int, Optional[Vehicle]]]:
+        """
+        Aplica un delta sobre el almacén de vehículos y el mapa de identificadores.
+        Un upsert sobre un stock_id desconocido agrega el vehículo (requiere marca, modelo,
+        año y precio); un delete conserva la fila pero la deja inaccesible.
+        
+        Args:
+            vehicles: Vehículos del catálogo (lista o catálogo columnar)
+            positions_by_id: Mapa de identificador a posición
+            record: Delta leído del feed
+            
+        Returns:
+            Tupla (posición, vehículo resultante o None si se eliminó), o None si el delta
+            no produjo cambios
+        """
+        if not isinstance(record, dict) or not record.get('stock_id'):
+            logger.warning(f"Skipping catalog delta without stock_id: {record}")
+            self._delta_errors_total += 1
+            return None
+
+        stock_id = str(record['stock_id'])
+        operation = record.get('op', 'upsert')
+        position = positions_by_id.get(stock_id)
+
+        if operation == 'delete':
+            if position is None:
+                return None
+
+            vehicle = vehicles[position]
+            for key in (vehicle.id, vehicle.stock_id):
+                if positions_by_id.get(key) == position:
+                    del positions_by_id[key]
+            return position, None
+
+        if operation != 'upsert':
+            logger.warning(f"Skipping catalog delta with unknown op '{operation}' for {stock_id}")
+            self._delta_errors_total += 1
+            return None
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for line_number, row in enumerate(reader, start=2):
-                    try:
-                        stock_id = row.get('stock_id', '').strip()
-                        km = self._parse_int(row.get('km', ''))
-                        price = self._parse_float(row.get('price', ''))
-                        make = row.get('make', '').strip()
-                        model = row.get('model', '').strip()
-                        year = self._parse_int(row.get('year', '')) or 2024
-                        version = row.get('version', '').strip()
-                        bluetooth = self._parse_bool(row.get('bluetooth', ''))
-                        length = self._parse_int(row.get('largo', ''))
-                        width = self._parse_int(row.get('ancho', ''))
-                        height = self._parse_int(row.get('altura', ''))
-                        carplay = self._parse_bool(row.get('car_play', ''))
-
-                        vehicle = Vehicle.create(
-                            vehicle_id=stock_id,
-                            brand=make,
-                            model=model,
-                            year=year,
-                            price=price or 0.0
-                        )
-
-                        vehicle.update_details(
-                            version=version,
-                            mileage=km,
-                            length=length,
-                            width=width,
-                            height=height,
-                            has_bluetooth=bluetooth,
-                            has_carplay=carplay,
-                            stock_id=stock_id
-                        )
-
-                        vehicles.append(vehicle)
-                    except Exception as ex:
-                        logger.warning(f"Error parsing line {line_number}: {ex}")
+            changes = self._parse_delta_fields(record)
+
+            if position is None:
+                missing = _REQUIRED_DELTA_FIELDS.difference(changes)
+                if missing:
+                    raise ValueError(f"new vehicle requires {', '.join(sorted(missing))}")
+
+                vehicle = Vehicle(id=str(record.get('id') or stock_id), stock_id=stock_id, **changes)
+                position = len(vehicles)
+                vehicles.append(vehicle)
+                positions_by_id.setdefault(vehicle.id, position)
+                positions_by_id.setdefault(stock_id, position)
+            else:
+                vehicle = replace(vehicles[position], **changes)
+                vehicles[position] = vehicle
+        except (TypeError, ValueError) as ex:
+            logger.warning(f"Skipping invalid catalog delta for {stock_id}: {ex}")
+            self._delta_errors_total += 1
+            return None
+
+        return position, vehicle
+
+    def _parse_delta_fields(self, record: Dict) -> Dict[str, Any]:
+        """
+        Extrae y convierte los campos de vehículo presentes en un delta.
+        
+        Args:
+            record: Delta leído del feed
+            
+        Returns:
+            Diccionario de campo de Vehicle a valor
+            
+        Raises:
+            ValueError: Si un campo tiene un valor inválido
+            TypeError: Si un campo no es un valor escalar (objeto o lista)
+        """
+        changes: Dict[str, Any] = {}
+
+        for name, convert in _DELTA_FIELDS.items():
+            if name not in record:
+                continue
+
+            value = record[name]
+            if value is None:
+                if name not in _NULLABLE_DELTA_FIELDS:
+                    raise ValueError(f"field '{name}' cannot be null")
+                changes[name] = None
+            else:
+                changes[name] = convert(value)
+
+        return changes
+
+    def _read_csv_file(self, file_path: str) -> Sequence[Vehicle]:
+        """
+        Lee un archivo CSV por lotes y convierte cada columna en bloque.
+        Las columnas se ubican por posición a partir del encabezado. Las filas más cortas que
+        el encabezado o sin stock_id o marca se descartan. En modo columnar los lotes se
+        agregan al almacén sin crear instancias de Vehicle.
+        
+        Args:
+            file_path: Ruta al archivo CSV
+            
+        Returns:
+            Vehículos cargados (lista o catálogo columnar según la configuración)
+        """
+        vehicles: Sequence[Vehicle] = ColumnarCatalog() if self._columnar else []
+
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header:
+                    return vehicles
+
+                positions = {name.strip(): position for position, name in enumerate(header)}
+                required = [
+                    positions[name] for name in ('stock_id', 'make') if name in positions
+                ]
+                skipped = 0
+                converters = [
+                    _ColumnConverter(positions.get('stock_id'), str.strip, bulk=str.strip),
+                    _ColumnConverter(positions.get('km'), self._parse_int, bulk=int),
+                    _ColumnConverter(
+                        positions.get('price'),
+                        lambda value: self._parse_float(value) or 0.0,
+                        bulk=float
+                    ),
+                    _ColumnConverter(positions.get('make'), str.strip),
+                    _ColumnConverter(positions.get('model'), str.strip),
+                    _ColumnConverter(
+                        positions.get('year'),
+                        lambda value: self._parse_int(value) or 2024
+                    ),
+                    _ColumnConverter(positions.get('version'), str.strip),
+                    _ColumnConverter(positions.get('bluetooth'), self._parse_bool),
+                    _ColumnConverter(positions.get('largo'), self._parse_int),
+                    _ColumnConverter(positions.get('ancho'), self._parse_int),
+                    _ColumnConverter(positions.get('altura'), self._parse_int),
+                    _ColumnConverter(positions.get('car_play'), self._parse_bool)
+                ]
+
+                while True:
+                    batch = list(filter(None, islice(reader, _CSV_BATCH_SIZE)))
+                    if not batch:
+                        break
+
+                    # Descartar filas truncadas o sin identificador antes de agrupar por columna
+                    rows = [
+                        row for row in batch
+                        if len(row) >= len(header) and all(row[position].strip() for position in required)
+                    ]
+                    skipped += len(batch) - len(rows)
+                    if not rows:
+                        continue
+
+                    # Agrupar por columna (las celdas extra de filas largas se ignoran)
+                    cells = list(zip(*rows))
+                    (stock_ids, kms, prices, makes, models, years, versions,
+                     bluetooth, lengths, widths, heights, carplay) = (
+                        converter.convert(cells) for converter in converters
+                    )
+                    columns = (
+                        stock_ids, makes, models, years, prices, versions, kms,
+                        lengths, widths, heights, bluetooth, carplay, stock_ids
+                    )
+
+                    if isinstance(vehicles, ColumnarCatalog):
+                        vehicles.extend_columns(*columns)
+                    else:
+                        vehicles.extend(map(Vehicle.create_with_details, *columns))
+
+                if skipped:
+                    logger.warning(f"Skipped {skipped} malformed rows in CSV file {file_path}")
         except Exception as ex:
             logger.error(f"Error reading CSV file {file_path}: {ex}")
 
         return vehicles
 
-    async def _load_from_json(self, file_path: str) -> List[Vehicle]:
+    def _read_json_file(self, file_path: str) -> List[Vehicle]:
         """
-        Carga vehículos desde un archivo JSON.
+        Lee vehículos desde un archivo JSON.
         
         Args:
             file_path: Ruta al archivo JSON
@@ -179,9 +764,16 @@ class CatalogRepository(ICatalogRepository):
                 data = json.load(f)
                 
             vehicles = []
+            skipped = 0
             for item in data:
-                vehicle = self._map_to_entity(item)
-                vehicles.append(vehicle)
+                # Un registro inválido se descarta sin perder el resto del archivo
+                if not isinstance(item, dict):
+                    skipped += 1
+                    continue
+                vehicles.append(self._map_to_entity(item))
+
+            if skipped:
+                logger.warning(f"Skipped {skipped} invalid records in JSON file {file_path}")
             
             return vehicles
         except Exception as ex:
@@ -198,12 +790,18 @@ class CatalogRepository(ICatalogRepository):
         Returns:
             Entero parseado o None
         """
-        if not value or value.strip().upper() == 'NA':
+        try:
+            return int(value)
+        except ValueError:
+            pass
+
+        value = value.strip()
+        if not value or value.upper() == 'NA':
             return None
         
         try:
-            return int(float(value.strip()))
-        except (ValueError, AttributeError):
+            return int(float(value))
+        except (ValueError, OverflowError):
             return None
 
     def _parse_float(self, value: str) -> Optional[float]:
@@ -216,12 +814,13 @@ class CatalogRepository(ICatalogRepository):
         Returns:
             Float parseado o None
         """
-        if not value or value.strip().upper() == 'NA':
+        value = value.strip()
+        if not value or value.upper() == 'NA':
             return None
         
         try:
-            return float(value.strip())
-        except (ValueError, AttributeError):
+            return float(value)
+        except ValueError:
             return None
 
     def _parse_bool(self, value: str) -> Optional[bool]:
@@ -234,11 +833,11 @@ class CatalogRepository(ICatalogRepository):
         Returns:
             Booleano parseado o None
         """
-        if not value or value.strip().upper() == 'NA':
-            return None
-        
         value = value.strip().lower()
         
+        if not value or value == 'na':
+            return None
+        
         if value in ('true', 'yes', '1'):
             return True
         elif value in ('false', 'no', '0'):
@@ -246,46 +845,32 @@ class CatalogRepository(ICatalogRepository):
         
         try:
             return int(value) != 0
-        except (ValueError, AttributeError):
+        except ValueError:
             return None
 
-    def _matches_query(self, vehicle: Vehicle, query: VehicleQuery) -> bool:
+    def _build_id_map(self, ids: Sequence[str], stock_ids: Sequence[str]) -> Dict[str, int]:
         """
-        Verifica si un vehículo cumple con los criterios del query especificado.
+        Construye el mapa de ID y stock_id a posición en el catálogo.
+        Ante claves repetidas conserva el primer vehículo, igual que una búsqueda secuencial.
         
         Args:
-            vehicle: Vehículo a verificar
-            query: Criterios de búsqueda
+            ids: ID de cada vehículo en orden de catálogo
+            stock_ids: stock_id de cada vehículo en orden de catálogo
             
         Returns:
-            True si el vehículo cumple con los criterios
+            Diccionario de identificador a posición
         """
-        if query.brand and query.brand.lower() not in vehicle.brand.lower():
-            return False
-
-        if query.model and query.model.lower() not in vehicle.model.lower():
-            return False
-
-        if query.max_price is not None and vehicle.price > query.max_price:
-            return False
-
-        if query.min_price is not None and vehicle.price < query.min_price:
-            return False
-
-        if query.min_year is not None and vehicle.year < query.min_year:
-            return False
-
-        if query.max_year is not None and vehicle.year > query.max_year:
-            return False
-
-        if query.max_mileage is not None and vehicle.mileage > query.max_mileage:
-            return False
-
-        return True
+        positions_by_id: Dict[str, int] = {}
+        for position, (vehicle_id, stock_id) in enumerate(zip(ids, stock_ids)):
+            positions_by_id.setdefault(vehicle_id, position)
+            positions_by_id.setdefault(stock_id, position)
+        return positions_by_id
 
     def _map_to_entity(self, dto: Dict) -> Vehicle:
         """
         Mapea un DTO de JSON a la entidad de dominio Vehicle.
+        Convierte los valores como el CSV (texto, null o valores inválidos usan los mismos
+        valores por defecto), ya que el índice guarda año y precio en arreglos tipados.
         
         Args:
             dto: Diccionario con datos del vehículo
@@ -294,11 +879,73 @@ class CatalogRepository(ICatalogRepository):
             Instancia de Vehicle
         """
         vehicle = Vehicle.create(
-            vehicle_id=dto.get('id', ''),
-            brand=dto.get('brand', ''),
-            model=dto.get('model', ''),
-            year=dto.get('year', 2024),
-            price=dto.get('price', 0.0)
+            vehicle_id=self._json_text(dto.get('id')),
+            brand=self._json_text(dto.get('brand')),
+            model=self._json_text(dto.get('model')),
+            year=self._parse_int(self._json_text(dto.get('year'))) or 2024,
+            price=self._parse_float(self._json_text(dto.get('price'))) or 0.0
         )
         return vehicle
 
+    def _json_text(self, value: Any) -> str:
+        """
+        Convierte un valor escalar de JSON a texto (null, objetos y listas quedan vacíos).
+        
+        Args:
+            value: Valor del JSON
+            
+        Returns:
+            Texto del valor
+        """
+        if value is None or isinstance(value, (bool, dict, list)):
+            return ''
+        return str(value)
+
+
+class _ColumnConverter:
+    """
+    Convierte en bloque una columna del CSV.
+    Primero intenta una conversión directa de toda la columna (por ejemplo, float);
+    si algún valor no la admite, convierte cada valor distinto una sola vez y reutiliza
+    el resultado (las cadenas repetidas quedan compartidas).
+    Si la columna no existe en el encabezado, produce el valor de una celda vacía.
+    """
+
+    def __init__(
+        self,
+        position: Optional[int],
+        parser: Callable[[str], Any],
+        bulk: Optional[Callable[[str], Any]] = None
+    ):
+        self._position = position
+        self._parser = parser
+        self._bulk = bulk
+        self._parsed: Dict[str, Any] = {}
+
+    def convert(self, cells: List[Tuple[str, ...]]) -> List[Any]:
+        """
+        Convierte la columna de un lote.
+
+        Args:
+            cells: Celdas del lote agrupadas por columna
+
+        Returns:
+            Valores convertidos en el orden de las filas
+        """
+        if self._position is None or self._position >= len(cells):
+            column: Tuple[str, ...] = ('',) * len(cells[0])
+        else:
+            column = cells[self._position]
+
+        if self._bulk is not None:
+            try:
+                return list(map(self._bulk, column))
+            except ValueError:
+                pass
+
+        parsed = self._parsed
+        parser = self._parser
+        for value in set(column).difference(parsed):
+            parsed[value] = parser(value)
+
+        return list(map(parsed.__getitem__, column))
@@ -0,0 +1,32 @@
+"""
+Snapshot inmutable del catálogo de vehículos cargado en memoria.
+Agrupa los vehículos con sus índices para que una búsqueda nunca combine
+estructuras de cargas distintas.
+"""
+from dataclasses import dataclass
+from typing import Dict, Sequence
+from ...domain.entities import Vehicle
+from .catalog_index import CatalogIndex
+from .vehicle_fragments import VehicleFragments
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Versión completa del catálogo: vehículos, índice de búsqueda, mapa de identificadores
+    y fragmentos JSON de los payloads de herramienta.
+    Se reemplaza de forma atómica al recargar el catálogo. Entre recargas, los deltas se
+    aplican sobre sus estructuras desde el event loop, sin puntos de espera intermedios.
+    delta_offset es la posición (en bytes) del feed de deltas hasta la que se aplicó al construirlo.
+    """
+    vehicles: Sequence[Vehicle]
+    index: CatalogIndex
+    positions_by_id: Dict[str, int]
+    fragments: VehicleFragments
+    version: int
+    loaded_at: float
+    load_seconds: float
+    delta_offset: int = 0
+
+    def __len__(self) -> int:
+        return len(self.vehicles)
@@ -0,0 +1,381 @@
+"""
+Almacén columnar del catálogo de vehículos.
+Guarda cada campo en una columna compacta (arreglos numéricos y cadenas internadas)
+y construye instancias de Vehicle solo para las filas que realmente se consultan.
+"""
+import sys
+from array import array
+from itertools import repeat
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from ...domain.entities import Vehicle, VehicleStatus
+from .vehicle_fragments import VehicleFragments, serialize_vehicle
+
+
+# Valor centinela para enteros y booleanos opcionales ausentes
+_MISSING = -1
+
+_STATUSES = tuple(VehicleStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+
+class _EncodedStrings:
+    """
+    Columna de texto codificada por diccionario: cada fila guarda un código
+    y cada valor distinto se almacena una sola vez (internado).
+    """
+
+    def __init__(self):
+        self.codes = array('I')
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        self.codes.append(self._encode(value))
+
+    def extend(self, values: List[str]) -> None:
+        for value in set(values).difference(self._lookup):
+            self._encode(value)
+        self.codes.extend(map(self._lookup.__getitem__, values))
+
+    def _encode(self, value: str) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value))
+            self._lookup[value] = code
+        return code
+
+    def __setitem__(self, position: int, value: str) -> None:
+        self.codes[position] = self._encode(value)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __getitem__(self, position: int) -> str:
+        return self.values[self.codes[position]]
+
+
+class ColumnarCatalog(Sequence):
+    """
+    Catálogo columnar que se comporta como una secuencia de vehículos.
+    Admite agregar vehículos y reemplazar uno por posición (para aplicar deltas). Solo conserva los campos que proveen las fuentes del catálogo (CSV/JSON); el resto
+    de atributos de Vehicle toma sus valores por defecto en las vistas.
+    Las vistas son copias: modificarlas no altera el catálogo.
+    """
+
+    def __init__(self):
+        """Inicializa un catálogo columnar vacío."""
+        self._ids: List[str] = []
+        self._stock_ids: List[str] = []
+        self._brands = _EncodedStrings()
+        self._models = _EncodedStrings()
+        self._versions = _EncodedStrings()
+        self._prices = array('d')
+        self._years = array('q')
+        self._mileages = array('q')
+        self._lengths = array('q')
+        self._widths = array('q')
+        self._heights = array('q')
+        self._bluetooth = array('b')
+        self._carplay = array('b')
+        self._statuses = array('B')
+
+    @classmethod
+    def from_vehicles(cls, vehicles: Iterable[Vehicle]) -> 'ColumnarCatalog':
+        """
+        Construye un catálogo columnar a partir de vehículos.
+
+        Args:
+            vehicles: Vehículos a almacenar en orden de catálogo
+
+        Returns:
+            Nueva instancia de ColumnarCatalog
+        """
+        catalog = cls()
+        for vehicle in vehicles:
+            catalog.append(vehicle)
+        return catalog
+
+    def append(self, vehicle: Vehicle) -> None:
+        """
+        Agrega un vehículo al final del catálogo.
+
+        Args:
+            vehicle: Vehículo a agregar
+        """
+        self._ids.append(sys.intern(vehicle.id))
+        self._stock_ids.append(sys.intern(vehicle.stock_id))
+        self._brands.append(vehicle.brand)
+        self._models.append(vehicle.model)
+        self._versions.append(vehicle.version)
+        self._prices.append(vehicle.price)
+        self._years.append(vehicle.year)
+        self._mileages.append(vehicle.mileage)
+        self._lengths.append(_encode_optional(vehicle.length))
+        self._widths.append(_encode_optional(vehicle.width))
+        self._heights.append(_encode_optional(vehicle.height))
+        self._bluetooth.append(_encode_optional(vehicle.has_bluetooth))
+        self._carplay.append(_encode_optional(vehicle.has_carplay))
+        self._statuses.append(_STATUS_CODES[vehicle.status])
+
+    def __setitem__(self, position: int, vehicle: Vehicle) -> None:
+        """
+        Reemplaza el vehículo de una posición existente.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+            vehicle: Nuevos datos del vehículo
+        """
+        self._ids[position] = sys.intern(vehicle.id)
+        self._stock_ids[position] = sys.intern(vehicle.stock_id)
+        self._brands[position] = vehicle.brand
+        self._models[position] = vehicle.model
+        self._versions[position] = vehicle.version
+        self._prices[position] = vehicle.price
+        self._years[position] = vehicle.year
+        self._mileages[position] = vehicle.mileage
+        self._lengths[position] = _encode_optional(vehicle.length)
+        self._widths[position] = _encode_optional(vehicle.width)
+        self._heights[position] = _encode_optional(vehicle.height)
+        self._bluetooth[position] = _encode_optional(vehicle.has_bluetooth)
+        self._carplay[position] = _encode_optional(vehicle.has_carplay)
+        self._statuses[position] = _STATUS_CODES[vehicle.status]
+
+    def extend(self, vehicles: Iterable[Vehicle]) -> None:
+        """
+        Agrega varios vehículos al final del catálogo.
+
+        Args:
+            vehicles: Vehículos a agregar
+        """
+        for vehicle in vehicles:
+            self.append(vehicle)
+
+    def extend_columns(
+        self,
+        ids: List[str],
+        brands: List[str],
+        models: List[str],
+        years: List[int],
+        prices: List[float],
+        versions: List[str],
+        mileages: List[Optional[int]],
+        lengths: List[Optional[int]],
+        widths: List[Optional[int]],
+        heights: List[Optional[int]],
+        has_bluetooth: List[Optional[bool]],
+        has_carplay: List[Optional[bool]],
+        stock_ids: List[str]
+    ) -> None:
+        """
+        Agrega un lote de vehículos disponibles recibido por columnas, sin crear instancias de Vehicle.
+        Los argumentos siguen el orden de Vehicle.create_with_details.
+
+        Args:
+            ids: Identificadores de los vehículos
+            brands: Marcas
+            models: Modelos
+            years: Años
+            prices: Precios
+            versions: Versiones
+            mileages: Kilometrajes (None equivale a 0)
+            lengths: Longitudes en mm (opcionales)
+            widths: Anchos en mm (opcionales)
+            heights: Alturas en mm (opcionales)
+            has_bluetooth: Si tienen Bluetooth (opcionales)
+            has_carplay: Si tienen CarPlay (opcionales)
+            stock_ids: IDs de stock
+        """
+        self._ids.extend(map(sys.intern, ids))
+        self._stock_ids.extend(map(sys.intern, stock_ids))
+        self._brands.extend(brands)
+        self._models.extend(models)
+        self._versions.extend(versions)
+        self._prices.extend(prices)
+        self._years.extend(years)
+        self._mileages.extend([0 if value is None else value for value in mileages])
+        self._lengths.extend([_MISSING if value is None else value for value in lengths])
+        self._widths.extend([_MISSING if value is None else value for value in widths])
+        self._heights.extend([_MISSING if value is None else value for value in heights])
+        self._bluetooth.extend([_MISSING if value is None else value for value in has_bluetooth])
+        self._carplay.extend([_MISSING if value is None else value for value in has_carplay])
+        self._statuses.extend(repeat(_STATUS_CODES[VehicleStatus.AVAILABLE], len(ids)))
+
+    @property
+    def ids(self) -> Sequence:
+        """Columna de identificadores."""
+        return self._ids
+
+    @property
+    def stock_ids(self) -> Sequence:
+        """Columna de IDs de stock."""
+        return self._stock_ids
+
+    @property
+    def brands(self) -> Iterable[str]:
+        """Columna de marcas."""
+        return self._brands
+
+    @property
+    def models(self) -> Iterable[str]:
+        """Columna de modelos."""
+        return self._models
+
+    @property
+    def prices(self) -> Sequence:
+        """Columna de precios."""
+        return self._prices
+
+    @property
+    def years(self) -> Sequence:
+        """Columna de años."""
+        return self._years
+
+    @property
+    def mileages(self) -> Sequence:
+        """Columna de kilometrajes."""
+        return self._mileages
+
+    def columns(self) -> Dict[str, Union[array, List[str]]]:
+        """
+        Obtiene las columnas internas por nombre, tal como se guardan en un snapshot binario.
+
+        Returns:
+            Diccionario de nombre de columna a arreglo o lista de cadenas
+        """
+        return {
+            "ids": self._ids,
+            "stock_ids": self._stock_ids,
+            "brands.codes": self._brands.codes,
+            "brands.values": self._brands.values,
+            "models.codes": self._models.codes,
+            "models.values": self._models.values,
+            "versions.codes": self._versions.codes,
+            "versions.values": self._versions.values,
+            "prices": self._prices,
+            "years": self._years,
+            "mileages": self._mileages,
+            "lengths": self._lengths,
+            "widths": self._widths,
+            "heights": self._heights,
+            "bluetooth": self._bluetooth,
+            "carplay": self._carplay,
+            "statuses": self._statuses
+        }
+
+    @property
+    def statuses(self) -> Iterable[VehicleStatus]:
+        """Columna de estados."""
+        return map(_STATUSES.__getitem__, self._statuses)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Vehicle, List[Vehicle]]:
+        if isinstance(index, slice):
+            return [self._vehicle_at(position) for position in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("catalog index out of range")
+
+        return self._vehicle_at(index)
+
+    def _vehicle_at(self, position: int) -> Vehicle:
+        """
+        Construye la vista de un vehículo a partir de sus columnas.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+
+        Returns:
+            Instancia de Vehicle con los datos de la fila
+        """
+        has_bluetooth = self._bluetooth[position]
+        has_carplay = self._carplay[position]
+
+        return Vehicle(
+            id=self._ids[position],
+            brand=self._brands[position],
+            model=self._models[position],
+            year=self._years[position],
+            price=self._prices[position],
+            version=self._versions[position],
+            mileage=self._mileages[position],
+            status=_STATUSES[self._statuses[position]],
+            length=_decode_optional(self._lengths[position]),
+            width=_decode_optional(self._widths[position]),
+            height=_decode_optional(self._heights[position]),
+            has_bluetooth=None if has_bluetooth == _MISSING else bool(has_bluetooth),
+            has_carplay=None if has_carplay == _MISSING else bool(has_carplay),
+            stock_id=self._stock_ids[position]
+        )
+
+
+class VehicleView(Sequence):
+    """
+    Secuencia perezosa de vehículos seleccionados por posición.
+    Solo materializa los vehículos que se leen (por ejemplo, los primeros 10 resultados).
+    Cuando representa una página de resultados, total indica cuántos vehículos coinciden en total.
+    """
+
+    def __init__(
+        self,
+        vehicles: Sequence,
+        positions: List[int],
+        total: Optional[int] = None,
+        fragments: Optional[VehicleFragments] = None
+    ):
+        """
+        Inicializa la vista.
+
+        Args:
+            vehicles: Secuencia completa del catálogo
+            positions: Posiciones seleccionadas en orden
+            total: Total de coincidencias de la búsqueda (por defecto, las posiciones de la vista)
+            fragments: Fragmentos JSON del catálogo para serializar la vista (opcional)
+        """
+        self._vehicles = vehicles
+        self._positions = positions
+        self._total = total
+        self._fragments = fragments
+
+    @property
+    def total(self) -> int:
+        """Total de vehículos que coinciden con la búsqueda (no solo los de la vista)."""
+        return len(self._positions) if self._total is None else self._total
+
+    def to_json(self) -> str:
+        """
+        Serializa los vehículos de la vista como arreglo JSON de payloads de herramienta.
+        Usa los fragmentos del catálogo si están disponibles, sin materializar los vehículos.
+
+        Returns:
+            Arreglo JSON con el payload de cada vehículo
+        """
+        if self._fragments is not None:
+            return self._fragments.join(self._positions)
+        return f"[{', '.join(map(serialize_vehicle, self))}]"
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Vehicle, List[Vehicle]]:
+        if isinstance(index, slice):
+            return [self._vehicles[position] for position in self._positions[index]]
+        return self._vehicles[self._positions[index]]
+
+
+def _encode_optional(value: Optional[int]) -> int:
+    """Codifica un entero o booleano opcional usando el valor centinela para None."""
+    return _MISSING if value is None else int(value)
+
+
+def _decode_optional(value: int) -> Optional[int]:
+    """Decodifica un entero opcional almacenado con valor centinela."""
+    return None if value == _MISSING else value
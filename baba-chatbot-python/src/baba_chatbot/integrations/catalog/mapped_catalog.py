@@ -0,0 +1,255 @@
+"""
+Catálogo de vehículos respaldado por un snapshot binario mapeado en memoria.
+Los workers que abren el mismo archivo comparten sus páginas en lugar de mantener
+cada uno una copia privada del catálogo; los deltas se guardan aparte, en memoria.
+"""
+import sys
+import time
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Union
+from ...domain.entities import Vehicle, VehicleStatus
+from ..storage import MappedColumnFile, write_columns
+from .columnar_catalog import ColumnarCatalog, _MISSING, _STATUSES, _decode_optional
+from .vehicle_fragments import FRAGMENT_FORMAT_VERSION, serialize_vehicle
+
+
+CATALOG_FILE_FORMAT = "baba-catalog"
+CATALOG_FILE_VERSION = 1
+
+
+def write_catalog_file(file_path: str, vehicles: Sequence, sources: List[str]) -> int:
+    """
+    Compila un catálogo a un snapshot binario columnar, incluyendo el fragmento JSON
+    de cada vehículo para que los workers no tengan que serializarlos.
+
+    Args:
+        file_path: Ruta del snapshot a generar
+        vehicles: Vehículos del catálogo (lista, catálogo columnar o mapeado)
+        sources: Archivos de origen del catálogo (se guardan como referencia)
+
+    Returns:
+        Tamaño del snapshot en bytes
+    """
+    if not isinstance(vehicles, ColumnarCatalog):
+        vehicles = ColumnarCatalog.from_vehicles(vehicles)
+
+    columns = vehicles.columns()
+    columns["fragments"] = [serialize_vehicle(vehicle) for vehicle in vehicles]
+
+    return write_columns(file_path, columns, {
+        "format": CATALOG_FILE_FORMAT,
+        "version": CATALOG_FILE_VERSION,
+        "fragment_version": FRAGMENT_FORMAT_VERSION,
+        "rows": len(vehicles),
+        "created_at": time.time(),
+        "sources": sources
+    })
+
+
+class MappedCatalog(Sequence):
+    """
+    Secuencia de vehículos leída de un snapshot binario mapeado con mmap.
+    Las columnas no se copian: cada vehículo se construye al leerlo. Los vehículos
+    reemplazados o agregados por deltas se guardan en memoria y tienen prioridad
+    sobre las filas del archivo.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Abre el snapshot.
+
+        Args:
+            file_path: Ruta del snapshot binario
+
+        Raises:
+            ValueError: Si el archivo no es un snapshot de catálogo compatible
+        """
+        columns = MappedColumnFile(file_path)
+        metadata = columns.metadata
+        if metadata.get("format") != CATALOG_FILE_FORMAT or metadata.get("version") != CATALOG_FILE_VERSION:
+            raise ValueError(f"{file_path} is not a compatible catalog snapshot")
+
+        self._metadata = metadata
+        self._ids = columns.strings("ids")
+        self._stock_ids = columns.strings("stock_ids")
+        self._brand_codes = columns.array("brands.codes")
+        self._brand_values = [sys.intern(value) for value in columns.strings("brands.values")]
+        self._model_codes = columns.array("models.codes")
+        self._model_values = [sys.intern(value) for value in columns.strings("models.values")]
+        self._version_codes = columns.array("versions.codes")
+        self._version_values = [sys.intern(value) for value in columns.strings("versions.values")]
+        self._prices = columns.array("prices")
+        self._years = columns.array("years")
+        self._mileages = columns.array("mileages")
+        self._lengths = columns.array("lengths")
+        self._widths = columns.array("widths")
+        self._heights = columns.array("heights")
+        self._bluetooth = columns.array("bluetooth")
+        self._carplay = columns.array("carplay")
+        self._statuses = columns.array("statuses")
+        self._base_size = len(self._prices)
+
+        # Fragmentos JSON precalculados (solo si coinciden con el formato actual)
+        self._fragments = None
+        if "fragments" in columns and metadata.get("fragment_version") == FRAGMENT_FORMAT_VERSION:
+            self._fragments = columns.strings("fragments")
+
+        # Cambios aplicados sobre el snapshot (deltas)
+        self._overrides: Dict[int, Vehicle] = {}
+        self._appended: List[Vehicle] = []
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadatos del snapshot (filas, fecha de creación y archivos de origen)."""
+        return self._metadata
+
+    @property
+    def fragments(self) -> Optional[Sequence]:
+        """
+        Fragmentos JSON de las filas del archivo (None si el snapshot no los incluye
+        o se generó con otro formato). No reflejan los cambios aplicados por deltas.
+        """
+        return self._fragments
+
+    def append(self, vehicle: Vehicle) -> None:
+        """
+        Agrega un vehículo al final del catálogo (en memoria).
+
+        Args:
+            vehicle: Vehículo a agregar
+        """
+        self._appended.append(vehicle)
+
+    def extend(self, vehicles: Iterable[Vehicle]) -> None:
+        """
+        Agrega varios vehículos al final del catálogo (en memoria).
+
+        Args:
+            vehicles: Vehículos a agregar
+        """
+        self._appended.extend(vehicles)
+
+    def __setitem__(self, position: int, vehicle: Vehicle) -> None:
+        """
+        Reemplaza el vehículo de una posición existente sin modificar el archivo.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+            vehicle: Nuevos datos del vehículo
+        """
+        if position < self._base_size:
+            self._overrides[position] = vehicle
+        else:
+            self._appended[position - self._base_size] = vehicle
+
+    @property
+    def ids(self) -> Iterable[str]:
+        """Columna de identificadores."""
+        return self._patched(self._ids, "id")
+
+    @property
+    def stock_ids(self) -> Iterable[str]:
+        """Columna de IDs de stock."""
+        return self._patched(self._stock_ids, "stock_id")
+
+    @property
+    def brands(self) -> Iterable[str]:
+        """Columna de marcas."""
+        return self._patched(map(self._brand_values.__getitem__, self._brand_codes), "brand")
+
+    @property
+    def models(self) -> Iterable[str]:
+        """Columna de modelos."""
+        return self._patched(map(self._model_values.__getitem__, self._model_codes), "model")
+
+    @property
+    def prices(self) -> Iterable[float]:
+        """Columna de precios."""
+        return self._patched(self._prices, "price")
+
+    @property
+    def years(self) -> Iterable[int]:
+        """Columna de años."""
+        return self._patched(self._years, "year")
+
+    @property
+    def mileages(self) -> Iterable[int]:
+        """Columna de kilometrajes."""
+        return self._patched(self._mileages, "mileage")
+
+    @property
+    def statuses(self) -> Iterable[VehicleStatus]:
+        """Columna de estados."""
+        return self._patched(map(_STATUSES.__getitem__, self._statuses), "status")
+
+    def _patched(self, column: Iterable[Any], attribute: str) -> Iterable[Any]:
+        """
+        Combina una columna del archivo con los cambios en memoria.
+
+        Args:
+            column: Valores de la columna en el archivo
+            attribute: Atributo de Vehicle que corresponde a la columna
+
+        Returns:
+            Valores de la columna para todo el catálogo
+        """
+        if not self._overrides and not self._appended:
+            return column
+
+        values = list(column)
+        for position, vehicle in self._overrides.items():
+            values[position] = getattr(vehicle, attribute)
+
+        return chain(values, (getattr(vehicle, attribute) for vehicle in self._appended))
+
+    def __len__(self) -> int:
+        return self._base_size + len(self._appended)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Vehicle, List[Vehicle]]:
+        if isinstance(index, slice):
+            return [self._vehicle_at(position) for position in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("catalog index out of range")
+
+        return self._vehicle_at(index)
+
+    def _vehicle_at(self, position: int) -> Vehicle:
+        """
+        Construye el vehículo de una posición a partir del archivo o de los cambios en memoria.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+
+        Returns:
+            Instancia de Vehicle con los datos de la fila
+        """
+        if position >= self._base_size:
+            return self._appended[position - self._base_size]
+
+        vehicle = self._overrides.get(position)
+        if vehicle is not None:
+            return vehicle
+
+        has_bluetooth = self._bluetooth[position]
+        has_carplay = self._carplay[position]
+
+        return Vehicle(
+            id=self._ids[position],
+            brand=self._brand_values[self._brand_codes[position]],
+            model=self._model_values[self._model_codes[position]],
+            year=self._years[position],
+            price=self._prices[position],
+            version=self._version_values[self._version_codes[position]],
+            mileage=self._mileages[position],
+            status=_STATUSES[self._statuses[position]],
+            length=_decode_optional(self._lengths[position]),
+            width=_decode_optional(self._widths[position]),
+            height=_decode_optional(self._heights[position]),
+            has_bluetooth=None if has_bluetooth == _MISSING else bool(has_bluetooth),
+            has_carplay=None if has_carplay == _MISSING else bool(has_carplay),
+            stock_id=self._stock_ids[position]
+        )
@@ -0,0 +1,230 @@
+"""
+Resolución tolerante de marcas y modelos.
+Normaliza los textos (minúsculas, sin acentos ni signos de puntuación), expande alias
+conocidos ("VW" -> "volkswagen") y corrige errores de escritura con un índice de trigramas,
+de modo que una sola búsqueda encuentre "Mercedes-Benz" a partir de "mercedez benz".
+"""
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+
+# Alias de marcas frecuentes en conversaciones (forma normalizada -> marca normalizada)
+BRAND_ALIASES: Dict[str, str] = {
+    "vw": "volkswagen",
+    "vocho": "volkswagen",
+    "chevy": "chevrolet",
+    "chevi": "chevrolet",
+    "mb": "mercedes benz",
+    "range rover": "land rover",
+    "mini cooper": "mini",
+}
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+_NON_DIGITS = re.compile(r'[^0-9]+')
+
+# Longitud mínima de un texto para intentar corregirlo
+_MIN_CORRECTION_LENGTH = 3
+
+# Tamaño de la caché de consultas resueltas por instancia
+_RESOLVE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=8192)
+def fold_text(value: str) -> str:
+    """
+    Normaliza un texto para compararlo: minúsculas, sin acentos y con los signos de
+    puntuación convertidos en espacios ("Citroën", "CITROEN" -> "citroen";
+    "Mercedes-Benz" -> "mercedes benz").
+
+    Args:
+        value: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub(' ', stripped).strip()
+
+
+def _compact(folded: str) -> str:
+    """Quita los espacios de un texto normalizado ("mercedes benz" -> "mercedesbenz")."""
+    return folded.replace(' ', '')
+
+
+def _trigrams(term: str) -> Set[str]:
+    """Obtiene los trigramas de un término delimitado por '$' al inicio y al final."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distancia de edición con transposiciones (Damerau-Levenshtein restringida).
+    Deja de calcular en cuanto la distancia supera el límite.
+
+    Args:
+        a: Primer término
+        b: Segundo término
+        limit: Distancia máxima de interés
+
+    Returns:
+        Distancia entre los términos (limit + 1 si lo supera)
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous: List[int] = []
+    current = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        before, previous, current = previous, current, [i]
+        for j, other in enumerate(b, 1):
+            distance = previous[j - 1] if char == other else previous[j - 1] + 1
+            if previous[j] < distance:
+                distance = previous[j] + 1
+            if current[j - 1] < distance:
+                distance = current[j - 1] + 1
+            if j > 1 and i > 1 and char == b[j - 2] and a[i - 2] == other and before[j - 2] < distance:
+                distance = before[j - 2] + 1
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+
+    return min(current[-1], limit + 1)
+
+
+class TermMatcher:
+    """
+    Índice de términos normalizados (marcas o modelos) para resolver el texto de una
+    búsqueda a las claves del catálogo que le corresponden.
+
+    El orden de resolución es:
+        1. Alias conocido -> texto canónico.
+        2. Coincidencia por subcadena sin espacios ni signos ("cx5" encuentra "cx 5").
+        3. Si no hay coincidencias, corrección de errores: claves (o palabras de claves)
+           a la menor distancia de edición permitida, con candidatos por trigramas.
+
+    Las resoluciones se guardan en caché hasta que se agrega una clave nueva.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), aliases: Optional[Dict[str, str]] = None):
+        """
+        Inicializa el índice.
+
+        Args:
+            keys: Claves normalizadas iniciales (ver fold_text)
+            aliases: Alias por texto normalizado (opcional)
+        """
+        self._aliases = {fold_text(alias): fold_text(target) for alias, target in (aliases or {}).items()}
+        self._compact_keys: Dict[str, str] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, FrozenSet[str]] = {}
+
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self._compact_keys)
+
+    def add(self, key: str) -> None:
+        """
+        Agrega una clave normalizada al índice (si no existe).
+
+        Args:
+            key: Clave normalizada
+        """
+        if key in self._compact_keys:
+            return
+
+        self._compact_keys[key] = _compact(key)
+
+        # La clave completa y cada una de sus palabras son términos corregibles
+        for term in {_compact(key), *key.split()}:
+            self._terms.setdefault(term, set()).add(key)
+            for trigram in _trigrams(term):
+                self._postings.setdefault(trigram, set()).add(term)
+
+        self._cache.clear()
+
+    def resolve(self, text: str) -> FrozenSet[str]:
+        """
+        Obtiene las claves del índice que corresponden al texto de una búsqueda.
+
+        Args:
+            text: Texto buscado (marca o modelo, tal como lo escribió el usuario)
+
+        Returns:
+            Claves coincidentes (vacío si no hay ninguna)
+        """
+        matches = self._cache.get(text)
+        if matches is None:
+            matches = self._resolve(text)
+            if len(self._cache) >= _RESOLVE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[text] = matches
+        return matches
+
+    def _resolve(self, text: str) -> FrozenSet[str]:
+        """Resuelve un texto sin usar la caché."""
+        folded = fold_text(text)
+        folded = self._aliases.get(folded) or self._aliases.get(_compact(folded)) or folded
+        needle = _compact(folded)
+        if not needle:
+            return frozenset(self._compact_keys)
+
+        matches = frozenset(key for key, compact in self._compact_keys.items() if needle in compact)
+        if matches:
+            return matches
+
+        return self._correct(needle)
+
+    def _correct(self, needle: str) -> FrozenSet[str]:
+        """
+        Busca las claves con algún término a la menor distancia de edición del texto.
+        Se permite una edición en términos de hasta 5 caracteres y dos en los más largos;
+        los números no se corrigen ("cx5" no se convierte en "cx3").
+
+        Args:
+            needle: Texto normalizado y sin espacios
+
+        Returns:
+            Claves con los términos más cercanos (vacío si ninguno está dentro del límite)
+        """
+        if len(needle) < _MIN_CORRECTION_LENGTH:
+            return frozenset()
+
+        limit = 1 if len(needle) <= 5 else 2
+        digits = _NON_DIGITS.sub('', needle)
+
+        if len(needle) <= 4:
+            # Los términos cortos comparten pocos trigramas: se comparan todos los de longitud similar
+            candidates: Set[str] = {term for term in self._terms if abs(len(term) - len(needle)) <= limit}
+        else:
+            # Cada edición altera como mucho 4 trigramas (una transposición): los términos
+            # que comparten menos trigramas no pueden estar dentro del límite
+            trigrams = _trigrams(needle)
+            shared: Counter = Counter()
+            for trigram in trigrams:
+                shared.update(self._postings.get(trigram, ()))
+            required = len(trigrams) - 4 * limit
+            candidates = {term for term, count in shared.items() if count >= required}
+
+        best = limit + 1
+        closest: Set[str] = set()
+        for term in candidates:
+            if _NON_DIGITS.sub('', term) != digits:
+                continue
+            distance = _edit_distance(needle, term, min(best, limit))
+            if distance < best:
+                best, closest = distance, {term}
+            elif distance == best and distance <= limit:
+                closest.add(term)
+
+        if best > limit:
+            return frozenset()
+
+        return frozenset(key for term in closest for key in self._terms[term])
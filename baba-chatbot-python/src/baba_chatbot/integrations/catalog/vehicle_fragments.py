@@ -0,0 +1,110 @@
+"""
+Fragmentos JSON con el payload de cada vehículo para las herramientas del LLM.
+Cada vehículo se serializa una sola vez por carga del catálogo y las respuestas se arman
+concatenando fragmentos, sin construir diccionarios ni volver a codificar JSON por solicitud.
+"""
+import json
+from typing import Any, Dict, Iterable, Optional, Sequence
+from ...domain.entities import Vehicle
+
+
+# Versión del formato del payload; los fragmentos guardados con otra versión se ignoran
+FRAGMENT_FORMAT_VERSION = 1
+
+
+def vehicle_payload(vehicle: Vehicle) -> Dict[str, Any]:
+    """
+    Construye el payload de un vehículo que reciben las herramientas del LLM.
+
+    Args:
+        vehicle: Vehículo del catálogo
+
+    Returns:
+        Diccionario serializable en JSON
+    """
+    return {
+        "id": vehicle.stock_id,
+        "marca": vehicle.brand,
+        "modelo": vehicle.model,
+        "año": vehicle.year,
+        "version": vehicle.version,
+        "precio": vehicle.price,
+        "kilometraje": vehicle.mileage,
+        "estado": vehicle.status.value,
+        "dimensiones": {
+            "largo": vehicle.length,
+            "ancho": vehicle.width,
+            "alto": vehicle.height
+        },
+        "caracteristicas": {
+            "bluetooth": vehicle.has_bluetooth,
+            "carplay": vehicle.has_carplay
+        }
+    }
+
+
+def serialize_vehicle(vehicle: Vehicle) -> str:
+    """
+    Serializa el payload de un vehículo a JSON.
+
+    Args:
+        vehicle: Vehículo del catálogo
+
+    Returns:
+        Fragmento JSON del vehículo
+    """
+    return json.dumps(vehicle_payload(vehicle), ensure_ascii=False)
+
+
+class VehicleFragments:
+    """
+    Fragmentos JSON por posición del catálogo.
+    Si el snapshot binario trae los fragmentos precalculados se leen de él (páginas compartidas
+    entre workers); si no, cada fragmento se serializa la primera vez que se pide y se conserva
+    hasta la siguiente recarga. Los vehículos modificados por deltas se vuelven a serializar.
+    """
+
+    def __init__(self, vehicles: Sequence[Vehicle], precomputed: Optional[Sequence[str]] = None):
+        """
+        Inicializa los fragmentos del catálogo.
+
+        Args:
+            vehicles: Vehículos del catálogo
+            precomputed: Fragmentos ya serializados por posición (opcional)
+        """
+        self._vehicles = vehicles
+        self._precomputed = precomputed
+        self._serialized: Dict[int, str] = {}
+
+    def __getitem__(self, position: int) -> str:
+        fragment = self._serialized.get(position)
+        if fragment is not None:
+            return fragment
+
+        if self._precomputed is not None and position < len(self._precomputed):
+            return self._precomputed[position]
+
+        fragment = self._serialized[position] = serialize_vehicle(self._vehicles[position])
+        return fragment
+
+    def update(self, position: int, vehicle: Vehicle) -> None:
+        """
+        Vuelve a serializar un vehículo agregado o modificado.
+
+        Args:
+            position: Posición del vehículo en el catálogo
+            vehicle: Datos actuales del vehículo
+        """
+        self._serialized[position] = serialize_vehicle(vehicle)
+
+    def join(self, positions: Iterable[int]) -> str:
+        """
+        Arma un arreglo JSON con los fragmentos de varias posiciones.
+
+        Args:
+            positions: Posiciones en el orden deseado
+
+        Returns:
+            Arreglo JSON de payloads de vehículos
+        """
+        return f"[{', '.join(map(self.__getitem__, positions))}]"
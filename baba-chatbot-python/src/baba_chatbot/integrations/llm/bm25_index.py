@@ -0,0 +1,226 @@
+"""
+Índice invertido con puntuación BM25 para la base de conocimiento.
+Las listas de postings se guardan aplanadas en arreglos (documentos y pesos por término)
+y el peso BM25 de cada posting se precalcula al construir el índice: una consulta solo
+recorre los postings de sus términos y suma, así que su costo depende de cuántos documentos
+contienen esos términos y no del tamaño del corpus. Con la poda MaxScore, los términos
+frecuentes (de poco peso) solo se consultan para los candidatos que aún pueden entrar en
+el top-k, por búsqueda binaria, en lugar de recorrer sus postings completos.
+"""
+import math
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from .text_analysis import analyze
+
+
+# Parámetros BM25 habituales: saturación de frecuencia y normalización por longitud
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Margen para comparaciones de puntajes en la poda (errores de redondeo en las sumas)
+_EPSILON = 1e-9
+
+
+class Bm25Index:
+    """
+    Índice BM25 sobre una colección de documentos (secciones de la base de conocimiento).
+    Los documentos se identifican por su posición en la colección.
+    """
+
+    def __init__(self, documents: Iterable[Sequence[str]], k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Construye el índice.
+
+        Args:
+            documents: Términos de cada documento (ver text_analysis.analyze)
+            k1: Saturación de la frecuencia de un término
+            b: Peso de la normalización por longitud del documento
+        """
+        frequencies: List[Counter] = [Counter(terms) for terms in documents]
+        lengths = [sum(counts.values()) for counts in frequencies]
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for document, counts in enumerate(frequencies):
+            for term, frequency in counts.items():
+                postings.setdefault(term, []).append((document, frequency))
+
+        self._size = len(frequencies)
+        self._terms: Dict[str, int] = {}
+        self._offsets = array('Q', [0])
+        self._documents = array('I')
+        self._weights = array('d')
+        self._max_weights = array('d')
+
+        for term_id, (term, entries) in enumerate(sorted(postings.items())):
+            self._terms[term] = term_id
+            idf = math.log(1.0 + (self._size - len(entries) + 0.5) / (len(entries) + 0.5))
+            for document, frequency in entries:
+                norm = k1 * (1.0 - b + b * lengths[document] / average_length) if average_length else k1
+                self._documents.append(document)
+                self._weights.append(idf * frequency * (k1 + 1.0) / (frequency + norm))
+            self._offsets.append(len(self._documents))
+            self._max_weights.append(max(self._weights[self._offsets[-2]:]))
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], k1: float = DEFAULT_K1, b: float = DEFAULT_B) -> 'Bm25Index':
+        """
+        Construye el índice analizando textos en español.
+
+        Args:
+            texts: Texto de cada documento
+            k1: Saturación de la frecuencia de un término
+            b: Peso de la normalización por longitud del documento
+
+        Returns:
+            Nueva instancia de Bm25Index
+        """
+        return cls((analyze(text) for text in texts), k1, b)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        size: int,
+        terms: Iterable[str],
+        offsets: Sequence[int],
+        documents: Sequence[int],
+        weights: Sequence[float],
+        max_weights: Sequence[float]
+    ) -> 'Bm25Index':
+        """
+        Crea un índice a partir de postings ya calculados (ver arrays()), por ejemplo vistas
+        sobre un archivo mapeado en memoria; los arreglos no se copian.
+
+        Args:
+            size: Cantidad de documentos
+            terms: Términos en orden de identificador
+            offsets: Inicio de los postings de cada término (más el final del último)
+            documents: Documentos de los postings, ordenados dentro de cada término
+            weights: Peso BM25 de cada posting
+            max_weights: Peso máximo de los postings de cada término
+
+        Returns:
+            Nueva instancia de Bm25Index
+        """
+        index = cls([])
+        index._size = size
+        index._terms = {term: term_id for term_id, term in enumerate(terms)}
+        index._offsets = offsets
+        index._documents = documents
+        index._weights = weights
+        index._max_weights = max_weights
+        return index
+
+    def arrays(self) -> Dict[str, Any]:
+        """
+        Exporta las estructuras del índice para persistirlas (ver from_arrays).
+
+        Returns:
+            Diccionario con "terms" (lista en orden de identificador) y los arreglos
+            "offsets", "documents", "weights" y "max_weights"
+        """
+        return {
+            "terms": sorted(self._terms, key=self._terms.__getitem__),
+            "offsets": self._offsets,
+            "documents": self._documents,
+            "weights": self._weights,
+            "max_weights": self._max_weights
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Cantidad de términos distintos indexados."""
+        return len(self._terms)
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        Busca los documentos más relevantes para una consulta.
+
+        Args:
+            query: Texto de la consulta
+            limit: Cantidad máxima de resultados
+
+        Returns:
+            Pares (documento, puntaje) ordenados por puntaje descendente
+            (a igual puntaje, en orden de colección); solo documentos con algún término en común
+        """
+        return self.search_terms(analyze(query), limit)
+
+    def search_terms(self, terms: Iterable[str], limit: int) -> List[Tuple[int, float]]:
+        """
+        Busca los documentos más relevantes para términos ya analizados.
+
+        Args:
+            terms: Términos de la consulta (los repetidos cuentan una vez)
+            limit: Cantidad máxima de resultados
+
+        Returns:
+            Pares (documento, puntaje) ordenados por puntaje descendente
+        """
+        if limit <= 0:
+            return []
+
+        # Términos del de mayor al de menor peso máximo, con la cota de lo que aún pueden sumar
+        term_ids = sorted(
+            {self._terms[term] for term in terms if term in self._terms},
+            key=self._max_weights.__getitem__,
+            reverse=True
+        )
+        remaining = [0.0] * (len(term_ids) + 1)
+        for position in range(len(term_ids) - 1, -1, -1):
+            remaining[position] = remaining[position + 1] + self._max_weights[term_ids[position]]
+
+        scores: Dict[int, float] = {}
+        for position, term_id in enumerate(term_ids):
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            threshold = heapq.nlargest(limit, scores.values())[-1] if len(scores) >= limit else 0.0
+
+            if threshold and remaining[position] < threshold - _EPSILON:
+                # Ningún documento nuevo alcanza el top-k: solo se completan los candidatos viables
+                scores = self._complete(scores, threshold - remaining[position] - _EPSILON, start, end)
+            elif not scores:
+                scores = dict(zip(self._documents[start:end], self._weights[start:end]))
+            else:
+                get = scores.get
+                for document, weight in zip(self._documents[start:end], self._weights[start:end]):
+                    scores[document] = get(document, 0.0) + weight
+
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _complete(self, scores: Dict[int, float], minimum: float, start: int, end: int) -> Dict[int, float]:
+        """
+        Suma el peso de un término a los candidatos que aún pueden entrar en el top-k.
+        Con pocos candidatos se ubican por búsqueda binaria en los postings del término
+        (ordenados por documento); con muchos, conviene recorrer los postings una vez.
+
+        Args:
+            scores: Puntajes acumulados por documento
+            minimum: Puntaje acumulado mínimo para seguir siendo candidato
+            start: Inicio de los postings del término
+            end: Fin de los postings del término
+
+        Returns:
+            Puntajes de los candidatos viables
+        """
+        documents = self._documents
+        weights = self._weights
+        viable = {document: score for document, score in scores.items() if score >= minimum}
+
+        if len(viable) * (end - start).bit_length() > end - start:
+            for document, weight in zip(documents[start:end], weights[start:end]):
+                if document in viable:
+                    viable[document] += weight
+            return viable
+
+        for document, score in viable.items():
+            index = bisect_left(documents, document, start, end)
+            if index < end and documents[index] == document:
+                viable[document] = score + weights[index]
+
+        return viable
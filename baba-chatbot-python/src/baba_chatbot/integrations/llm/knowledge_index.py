@@ -0,0 +1,173 @@
+"""
+Índice compilado de la base de conocimiento en un archivo binario mapeado en memoria.
+Guarda las secciones, los postings BM25 y (si se generaron) los vectores de n-gramas, para
+que los workers arranquen sin recorrer ni analizar los documentos markdown y compartan
+las páginas del archivo en lugar de construir cada uno su propia copia del índice.
+"""
+import time
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional
+from ..storage import MappedColumnFile, write_columns
+from .bm25_index import Bm25Index
+from .vector_index import VECTOR_FORMAT_VERSION, HashedVectorIndex, numpy_available
+
+
+KB_INDEX_FILE_FORMAT = "baba-kb-index"
+KB_INDEX_FILE_VERSION = 1
+
+
+class KnowledgeSection(NamedTuple):
+    """Sección de un documento de la base de conocimiento."""
+    document: str
+    text: str
+
+
+@dataclass(frozen=True)
+class KnowledgeSnapshot:
+    """
+    Versión completa de la base de conocimiento: secciones e índices construidos juntos.
+    Se reemplaza de forma atómica al recargar, así que una búsqueda nunca combina
+    el índice de una carga con las secciones de otra.
+    """
+    sections: Sequence
+    index: Bm25Index
+    vectors: Optional[HashedVectorIndex]
+    document_sizes: Dict[str, int]
+    loaded_at: float
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+
+def write_knowledge_index_file(
+    file_path: str,
+    sections: Sequence,
+    document_sizes: Dict[str, int],
+    index: Bm25Index,
+    vectors: Optional[HashedVectorIndex],
+    sources: List[str]
+) -> int:
+    """
+    Compila la base de conocimiento a un archivo binario de columnas.
+
+    Args:
+        file_path: Ruta del archivo a generar
+        sections: Secciones (KnowledgeSection) en el orden del índice
+        document_sizes: Caracteres de cada documento (para las estadísticas)
+        index: Índice BM25 de las secciones
+        vectors: Índice vectorial de las secciones (opcional)
+        sources: Directorios de origen (se guardan como referencia)
+
+    Returns:
+        Tamaño del archivo en bytes
+    """
+    postings = index.arrays()
+    columns: Dict[str, Any] = {
+        "sections.documents": [section.document for section in sections],
+        "sections.texts": [section.text for section in sections],
+        "bm25.terms": postings["terms"],
+        "bm25.offsets": postings["offsets"],
+        "bm25.documents": postings["documents"],
+        "bm25.weights": postings["weights"],
+        "bm25.max_weights": postings["max_weights"]
+    }
+    metadata: Dict[str, Any] = {
+        "format": KB_INDEX_FILE_FORMAT,
+        "version": KB_INDEX_FILE_VERSION,
+        "sections": len(sections),
+        "documents": document_sizes,
+        "created_at": time.time(),
+        "sources": sources
+    }
+
+    if vectors is not None:
+        columns["vectors.matrix"] = _to_array(vectors.matrix)
+        columns["vectors.idf"] = _to_array(vectors.idf)
+        metadata["vectors"] = {
+            "version": VECTOR_FORMAT_VERSION,
+            "dimensions": vectors.dimensions,
+            "ngram_range": list(vectors.ngram_range),
+            "fingerprint": vectors.fingerprint
+        }
+
+    return write_columns(file_path, columns, metadata)
+
+
+def _to_array(values: Any) -> array:
+    """Copia un arreglo de NumPy float32 a un array('f') para escribirlo como columna."""
+    column = array('f')
+    column.frombytes(values.astype('float32').tobytes())
+    return column
+
+
+class MappedSections(Sequence):
+    """
+    Secciones de la base de conocimiento leídas de un índice compilado.
+    El texto de cada sección se decodifica al leerla.
+    """
+
+    def __init__(self, documents: Sequence, texts: Sequence):
+        self._documents = documents
+        self._texts = texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, position: int) -> KnowledgeSection:
+        return KnowledgeSection(self._documents[position], self._texts[position])
+
+
+class MappedKnowledgeIndex:
+    """
+    Índice compilado de la base de conocimiento abierto con mmap de solo lectura.
+    Los postings y la matriz de vectores son vistas sobre el mapa: no se copian.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Abre el índice.
+
+        Args:
+            file_path: Ruta del índice compilado
+
+        Raises:
+            ValueError: Si el archivo no es un índice de conocimiento compatible
+        """
+        columns = MappedColumnFile(file_path)
+        metadata = columns.metadata
+        if metadata.get("format") != KB_INDEX_FILE_FORMAT or metadata.get("version") != KB_INDEX_FILE_VERSION:
+            raise ValueError(f"{file_path} is not a compatible knowledge base index")
+
+        self._metadata = metadata
+        self.sections = MappedSections(columns.strings("sections.documents"), columns.strings("sections.texts"))
+        self.document_sizes: Dict[str, int] = dict(metadata.get("documents", {}))
+        self.index = Bm25Index.from_arrays(
+            len(self.sections),
+            columns.strings("bm25.terms"),
+            columns.array("bm25.offsets"),
+            columns.array("bm25.documents"),
+            columns.array("bm25.weights"),
+            columns.array("bm25.max_weights")
+        )
+
+        # Vectores (solo si se generaron con el formato actual y NumPy está disponible)
+        self.vectors: Optional[HashedVectorIndex] = None
+        vectors = metadata.get("vectors")
+        if vectors and vectors.get("version") == VECTOR_FORMAT_VERSION and numpy_available():
+            import numpy as np
+
+            idf = np.frombuffer(columns.array("vectors.idf"), dtype=np.float32)
+            matrix = np.frombuffer(columns.array("vectors.matrix"), dtype=np.float32)
+            self.vectors = HashedVectorIndex.from_arrays(
+                matrix.reshape(len(self.sections), vectors["dimensions"]),
+                idf,
+                tuple(vectors["ngram_range"]),
+                vectors.get("fingerprint", "")
+            )
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadatos del índice (secciones, documentos, fecha de creación y orígenes)."""
+        return self._metadata
@@ -1,78 +1,219 @@
 """
 Repositorio de conocimiento (RAG simple basado en archivos markdown).
 Carga y busca información relevante en documentos de la base de conocimiento.
+Las secciones se indexan al cargar los documentos en un índice invertido BM25 con
+análisis de texto en español, así que cada consulta solo recorre los postings de sus términos.
+Opcionalmente (con NumPy) se indexan también como vectores de n-gramas de caracteres para
+encontrar variantes y paráfrasis sin coincidencia exacta de palabras.
+Si existe un índice compilado con `baba-kb build`, se mapea en memoria en lugar de leer
+y analizar los documentos al iniciar.
+Las recargas construyen un snapshot nuevo fuera del event loop y lo reemplazan de forma atómica.
 """
 import os
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
+from .bm25_index import Bm25Index
+from .knowledge_index import (
+    KnowledgeSection,
+    KnowledgeSnapshot,
+    MappedKnowledgeIndex,
+    write_knowledge_index_file
+)
+from .vector_index import DEFAULT_DIMENSIONS, DEFAULT_MIN_SIMILARITY, HashedVectorIndex, numpy_available
 
 
 logger = logging.getLogger(__name__)
 
+# Modos de búsqueda: solo palabras clave (BM25), solo vectores o combinación de ambos
+RETRIEVAL_MODES = ("keyword", "vector", "hybrid")
+
+# En modo híbrido, candidatos BM25 por sección pedida que se combinan con la similitud vectorial
+HYBRID_KEYWORD_CANDIDATES = 5
+
 
 class KnowledgeRepository:
     """
     Repositorio de conocimiento que implementa RAG simple basado en archivos markdown.
     """
 
-    def __init__(self, knowledge_base_path: str = None):
+    def __init__(
+        self,
+        knowledge_base_path: str = None,
+        retrieval_mode: str = "keyword",
+        hybrid_vector_weight: float = 0.5,
+        vector_dimensions: int = DEFAULT_DIMENSIONS,
+        vector_index_path: Optional[str] = None,
+        index_file_path: Optional[str] = None
+    ):
         """
         Inicializa el repositorio de conocimiento.
         
         Args:
             knowledge_base_path: Ruta al directorio con documentos markdown
+            retrieval_mode: "keyword" (BM25), "vector" (n-gramas con NumPy) o "hybrid"
+            hybrid_vector_weight: Peso de la similitud vectorial en el modo híbrido (0 a 1)
+            vector_dimensions: Dimensión de los vectores de n-gramas
+            vector_index_path: Archivo .npz donde persistir los vectores; si coincide con el
+                contenido actual se lee en lugar de vectorizar las secciones (opcional)
+            index_file_path: Índice compilado con `baba-kb build`; si existe, se mapea en
+                memoria en lugar de leer los documentos (opcional)
         """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode} (expected one of {RETRIEVAL_MODES})")
+        if retrieval_mode != "keyword" and not numpy_available():
+            logger.warning(f"NumPy is not installed; falling back from {retrieval_mode} to keyword retrieval")
+            retrieval_mode = "keyword"
+
         if knowledge_base_path is None:
             knowledge_base_path = os.path.join(
                 os.getcwd(), "..", "..", "config", "rag", "kb_sources"
             )
         
         self._knowledge_base_path = knowledge_base_path
-        self._documents: Dict[str, str] = {}
+        self._index_file_path = index_file_path
+        self._snapshot = KnowledgeSnapshot([], Bm25Index([]), None, {}, 0.0)
+        self._reload_lock = asyncio.Lock()
+        self._retrieval_mode = retrieval_mode
+        self._hybrid_vector_weight = min(max(hybrid_vector_weight, 0.0), 1.0)
+        self._vector_dimensions = vector_dimensions
+        self._vector_index_path = vector_index_path
+        self._loaded = False
         self._load_documents()
 
     def _load_documents(self) -> None:
         """
-        Carga todos los documentos markdown del directorio de conocimiento.
-        Omite archivos README.
+        Carga la base de conocimiento al iniciar. Si falla, queda vacía (sin secciones).
         """
         try:
-            logger.info(f"Loading knowledge base from: {self._knowledge_base_path}")
-
-            if not os.path.exists(self._knowledge_base_path):
-                logger.warning(f"Knowledge base directory not found: {self._knowledge_base_path}")
-                return
-
-            # Buscar todos los archivos markdown
-            for root, _, files in os.walk(self._knowledge_base_path):
-                for file in files:
-                    if file.endswith('.md'):
-                        file_name = Path(file).name
-                        
-                        # Omitir archivos README
-                        if file_name.upper().startswith('README'):
-                            continue
-
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                self._documents[file_name] = content
-                                logger.info(
-                                    f"Loaded document: {file_name} ({len(content)} characters)"
-                                )
-                        except Exception as ex:
-                            logger.error(f"Error reading file {file_path}: {ex}")
-
-            logger.info(f"Knowledge base loaded: {len(self._documents)} documents")
+            self._snapshot = self._load_snapshot()
         except Exception as ex:
             logger.error(f"Error loading knowledge base: {ex}")
+        finally:
+            self._loaded = True
+
+    def _load_snapshot(self) -> KnowledgeSnapshot:
+        """
+        Construye un snapshot de la base de conocimiento: mapea el índice compilado si existe
+        y está al día, o lee los documentos markdown del directorio (omitiendo archivos README).
+
+        Returns:
+            Snapshot con las secciones y sus índices
+        """
+        index_path = self._index_file_path
+        if index_path and os.path.exists(index_path) and not self._is_stale(index_path):
+            return self._map_index_file(index_path)
+
+        logger.info(f"Loading knowledge base from: {self._knowledge_base_path}")
+        documents: Dict[str, str] = {}
+
+        if not os.path.exists(self._knowledge_base_path):
+            logger.warning(f"Knowledge base directory not found: {self._knowledge_base_path}")
+
+        # Buscar todos los archivos markdown
+        for root, _, files in os.walk(self._knowledge_base_path):
+            for file in files:
+                if file.endswith('.md'):
+                    file_name = Path(file).name
+                    
+                    # Omitir archivos README
+                    if file_name.upper().startswith('README'):
+                        continue
+
+                    file_path = os.path.join(root, file)
+                    try:
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            content = f.read()
+                            documents[file_name] = content
+                            logger.info(
+                                f"Loaded document: {file_name} ({len(content)} characters)"
+                            )
+                    except Exception as ex:
+                        logger.error(f"Error reading file {file_path}: {ex}")
+
+        snapshot = self._build_snapshot(documents)
+        logger.info(
+            f"Knowledge base loaded: {len(snapshot.document_sizes)} documents, "
+            f"{len(snapshot)} sections, {snapshot.index.vocabulary_size} distinct terms"
+        )
+        return snapshot
+
+    def _map_index_file(self, file_path: str) -> KnowledgeSnapshot:
+        """
+        Abre el índice compilado y construye un snapshot con sus secciones e índices.
+        Si el modo de búsqueda usa vectores y el archivo no los incluye, se calculan.
+
+        Args:
+            file_path: Ruta del índice compilado
+
+        Returns:
+            Snapshot respaldado por el archivo mapeado
+        """
+        logger.info(f"Mapping knowledge base index: {file_path}")
+        mapped = MappedKnowledgeIndex(file_path)
+
+        vectors = mapped.vectors
+        if self._retrieval_mode == "keyword":
+            vectors = None
+        elif vectors is None:
+            logger.warning(f"Knowledge base index {file_path} has no vectors; computing them at startup")
+            vectors = self._build_vectors(mapped.sections)
+
+        snapshot = KnowledgeSnapshot(mapped.sections, mapped.index, vectors, mapped.document_sizes, time.time())
+        logger.info(
+            f"Knowledge base index mapped: {len(snapshot.document_sizes)} documents, "
+            f"{len(snapshot)} sections, {snapshot.index.vocabulary_size} distinct terms"
+        )
+        return snapshot
+
+    def _is_stale(self, index_path: str) -> bool:
+        """
+        Indica si algún documento de la base de conocimiento es más reciente que el índice
+        compilado; en ese caso se advierte y se cargan los documentos en su lugar.
+
+        Args:
+            index_path: Ruta del índice compilado
+
+        Returns:
+            True si el índice está desactualizado
+        """
+        index_mtime = os.path.getmtime(index_path)
+        for root, _, files in os.walk(self._knowledge_base_path):
+            for file in files:
+                path = os.path.join(root, file)
+                if file.endswith('.md') and os.path.getmtime(path) > index_mtime:
+                    logger.warning(
+                        f"Knowledge base index {index_path} is older than {path}; loading the documents "
+                        f"instead (rebuild it with 'baba-kb build')"
+                    )
+                    return True
+
+        return False
+
+    @property
+    def is_loaded(self) -> bool:
+        """Indica si la base de conocimiento ya fue cargada."""
+        return self._loaded
+
+    @property
+    def retrieval_mode(self) -> str:
+        """Modo de búsqueda efectivo ("keyword", "vector" o "hybrid")."""
+        return self._retrieval_mode
+
+    @property
+    def source_paths(self) -> List[str]:
+        """Rutas de la base de conocimiento y de su índice compilado (para detectar cambios)."""
+        return [path for path in (self._knowledge_base_path, self._index_file_path) if path]
 
     def search_relevant_context(self, query: str, max_chunks: int = 3) -> str:
         """
-        Busca información relevante en la base de conocimiento usando búsqueda por palabras clave.
-        Divide documentos en secciones y puntúa según relevancia.
+        Busca las secciones más relevantes de la base de conocimiento con puntuación BM25,
+        similitud vectorial o una combinación de ambas según el modo de búsqueda.
+        La consulta y las secciones se analizan igual (minúsculas, sin acentos ni palabras
+        vacías y con stemming ligero), así que "garantías" encuentra "garantía".
         
         Args:
             query: Consulta del usuario
@@ -81,48 +222,20 @@ class KnowledgeRepository:
         Returns:
             Contexto relevante concatenado
         """
-        if not self._documents:
+        snapshot = self._snapshot
+        if not len(snapshot):
             logger.warning("No documents loaded in knowledge base")
             return ""
 
         try:
-            # Extraer palabras clave de la consulta
-            query_words = set(
-                word.lower()
-                for word in query.replace(',', ' ').replace('.', ' ')
-                .replace('?', ' ').replace('!', ' ').split()
-                if len(word) > 3
-            )
-
-            if not query_words:
-                return ""
-
-            # Buscar secciones relevantes
-            relevant_sections: List[Tuple[str, str, int]] = []
-
-            for doc_name, content in self._documents.items():
-                sections = self._split_into_sections(content)
-                
-                for section in sections:
-                    section_lower = section.lower()
-                    score = sum(1 for word in query_words if word in section_lower)
-                    
-                    if score > 0:
-                        relevant_sections.append((doc_name, section, score))
-
-            # Ordenar por relevancia y tomar las mejores
-            top_sections = sorted(
-                relevant_sections,
-                key=lambda x: x[2],
-                reverse=True
-            )[:max_chunks]
+            top_sections = self._rank_sections(snapshot, query, max_chunks)
 
             if not top_sections:
                 logger.debug(f"No relevant context found for query: {query}")
                 return ""
 
             # Concatenar secciones
-            context = "\n\n---\n\n".join(section for _, section, _ in top_sections)
+            context = "\n\n---\n\n".join(snapshot.sections[index].text for index, _ in top_sections)
             logger.info(f"Found {len(top_sections)} relevant sections for query")
             
             return context
@@ -130,6 +243,91 @@ class KnowledgeRepository:
             logger.error(f"Error searching knowledge base: {ex}")
             return ""
 
+    def _rank_sections(self, snapshot: KnowledgeSnapshot, query: str, max_chunks: int) -> List[Tuple[int, float]]:
+        """
+        Ordena las secciones por relevancia según el modo de búsqueda.
+
+        Args:
+            snapshot: Snapshot de la base de conocimiento
+            query: Consulta del usuario
+            max_chunks: Número máximo de secciones a retornar
+
+        Returns:
+            Pares (posición de la sección, puntaje) ordenados por puntaje descendente
+        """
+        vectors = snapshot.vectors
+        if self._retrieval_mode == "keyword" or vectors is None:
+            return snapshot.index.search(query, max_chunks)
+
+        if self._retrieval_mode == "vector":
+            return vectors.search(query, max_chunks)
+
+        weight = self._hybrid_vector_weight
+        keyword_results = snapshot.index.search(query, max_chunks * HYBRID_KEYWORD_CANDIDATES)
+        return vectors.hybrid_search(
+            query, keyword_results, max_chunks, weight, min_score=weight * DEFAULT_MIN_SIMILARITY
+        )
+
+    def _build_snapshot(self, documents: Dict[str, str]) -> KnowledgeSnapshot:
+        """
+        Divide los documentos en secciones y construye su índice BM25
+        (y el vectorial, si el modo de búsqueda lo usa).
+
+        Args:
+            documents: Contenido de cada documento por nombre de archivo
+
+        Returns:
+            Snapshot con las secciones y sus índices
+        """
+        sections = [
+            KnowledgeSection(doc_name, text)
+            for doc_name, content in documents.items()
+            for text in self._split_into_sections(content)
+        ]
+        index = Bm25Index.from_texts(section.text for section in sections)
+        vectors = self._build_vectors(sections) if self._retrieval_mode != "keyword" else None
+        document_sizes = {name: len(content) for name, content in documents.items()}
+
+        return KnowledgeSnapshot(sections, index, vectors, document_sizes, time.time())
+
+    def _build_vectors(self, sections: Sequence[KnowledgeSection]) -> HashedVectorIndex:
+        """
+        Obtiene los vectores de las secciones: los lee del archivo persistido si corresponde
+        al contenido actual o los calcula (y actualiza el archivo).
+
+        Args:
+            sections: Secciones de la base de conocimiento
+
+        Returns:
+            Índice vectorial de las secciones
+        """
+        digest = hashlib.sha256(f"{self._vector_dimensions}".encode("utf-8"))
+        for section in sections:
+            digest.update(b"\0" + section.text.encode("utf-8"))
+        fingerprint = digest.hexdigest()
+
+        path = self._vector_index_path
+        if path and os.path.exists(path):
+            try:
+                vectors = HashedVectorIndex.load(path)
+                if vectors is not None and vectors.fingerprint == fingerprint:
+                    logger.info(f"Loaded knowledge base vectors from {path}")
+                    return vectors
+            except Exception as ex:
+                logger.warning(f"Ignoring unreadable knowledge base vectors at {path}: {ex}")
+
+        vectors = HashedVectorIndex(
+            (section.text for section in sections), self._vector_dimensions, fingerprint=fingerprint
+        )
+        if path:
+            try:
+                vectors.save(path)
+                logger.info(f"Saved knowledge base vectors to {path}")
+            except OSError as ex:
+                logger.warning(f"Could not save knowledge base vectors to {path}: {ex}")
+
+        return vectors
+
     def _split_into_sections(self, content: str) -> List[str]:
         """
         Divide un documento en secciones basándose en headers markdown.
@@ -163,10 +361,51 @@ class KnowledgeRepository:
 
         return sections
 
-    def reload(self) -> None:
-        """Recarga los documentos de la base de conocimiento."""
-        self._documents.clear()
-        self._load_documents()
+    async def reload(self) -> bool:
+        """
+        Recarga los documentos de la base de conocimiento (o su índice compilado) y reemplaza
+        el snapshot de forma atómica. El nuevo snapshot se construye fuera del event loop; las
+        búsquedas en curso siguen usando el anterior. Si la carga falla se conserva el actual.
+
+        Returns:
+            True si la base de conocimiento se recargó correctamente
+        """
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            try:
+                snapshot = await loop.run_in_executor(None, self._load_snapshot)
+            except Exception as ex:
+                logger.error(f"Error reloading knowledge base, keeping current version: {ex}")
+                return False
+
+            self._snapshot = snapshot
+            return True
+
+    def export_index_file(self, file_path: str, include_vectors: bool = True) -> int:
+        """
+        Compila la base de conocimiento cargada (secciones, postings BM25 y vectores)
+        a un archivo que los workers pueden mapear con mmap.
+
+        Args:
+            file_path: Ruta del índice a generar
+            include_vectors: Incluir los vectores de n-gramas (requiere NumPy)
+
+        Returns:
+            Tamaño del archivo en bytes
+        """
+        snapshot = self._snapshot
+        vectors = snapshot.vectors
+        if include_vectors and vectors is None and numpy_available():
+            vectors = self._build_vectors(snapshot.sections)
+
+        return write_knowledge_index_file(
+            file_path,
+            snapshot.sections,
+            snapshot.document_sizes,
+            snapshot.index,
+            vectors if include_vectors else None,
+            [self._knowledge_base_path]
+        )
 
     def get_stats(self) -> Tuple[int, int]:
         """
@@ -175,6 +414,6 @@ class KnowledgeRepository:
         Returns:
             Tupla con (número de documentos, total de caracteres)
         """
-        total_chars = sum(len(doc) for doc in self._documents.values())
-        return len(self._documents), total_chars
+        document_sizes = self._snapshot.document_sizes
+        return len(document_sizes), sum(document_sizes.values())
 
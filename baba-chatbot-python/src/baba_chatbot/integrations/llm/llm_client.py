@@ -4,15 +4,32 @@ Implementa generación de respuestas con RAG y function calling para búsqueda d
 """
 import json
 import logging
-from typing import List, Optional, Any, Dict
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Hashable, List, NamedTuple, Optional, Any, Dict, Tuple
 from openai import AsyncOpenAI
 from ...application.abstractions.interfaces import ILlmClient, ICatalogRepository
-from ...domain.value_objects import VehicleQuery
+from ...domain.entities import Vehicle
+from ...domain.value_objects import VehicleQuery, VehicleSortOrder
+from ..caching import TtlLruCache
+from ..catalog import serialize_vehicle
 from .knowledge_repository import KnowledgeRepository
 
 
 logger = logging.getLogger(__name__)
 
+# Vehículos por página en los resultados de search_vehicles
+SEARCH_PAGE_SIZE = 10
+
+# Marcas y modelos (los de más vehículos) incluidos en las facetas
+FACET_VALUES_LIMIT = 25
+
+
+class _ToolCall(NamedTuple):
+    """Llamada a herramienta solicitada por el LLM (de una respuesta completa o armada del stream)."""
+    id: str
+    name: str
+    arguments: str
+
 
 class LlmClient(ILlmClient):
     """
@@ -25,7 +42,9 @@ class LlmClient(ILlmClient):
         model: str = "gpt-4o-mini",
         temperature: float = 0.7,
         knowledge_repository: Optional[KnowledgeRepository] = None,
-        catalog_repository: Optional[ICatalogRepository] = None
+        catalog_repository: Optional[ICatalogRepository] = None,
+        tool_cache_max_entries: int = 1024,
+        tool_cache_ttl_seconds: float = 300.0
     ):
         """
         Inicializa el cliente LLM.
@@ -36,12 +55,18 @@ class LlmClient(ILlmClient):
             temperature: Temperatura para generación (0-1)
             knowledge_repository: Repositorio de conocimiento para RAG
             catalog_repository: Repositorio de catálogo para function calling
+            tool_cache_max_entries: Resultados de búsqueda y facetas guardados en caché (0 la deshabilita)
+            tool_cache_ttl_seconds: Segundos que un resultado en caché sigue vigente
         """
         self._client = AsyncOpenAI(api_key=api_key)
         self._model = model
         self._temperature = temperature
         self._knowledge_repository = knowledge_repository
         self._catalog_repository = catalog_repository
+
+        # Resultados serializados de herramientas de catálogo por (herramienta, revisión, query)
+        self._tool_cache: TtlLruCache[str] = TtlLruCache(tool_cache_max_entries, tool_cache_ttl_seconds)
+        self._tool_cache_revision: Optional[int] = None
         
         logger.info(f"LlmClient initialized with model: {model}")
 
@@ -64,117 +89,11 @@ class LlmClient(ILlmClient):
             Respuesta generada por el LLM
         """
         try:
-            # Buscar contexto relevante en RAG si está disponible
-            relevant_context = ""
-            if self._knowledge_repository:
-                relevant_context = self._knowledge_repository.search_relevant_context(
-                    user_message,
-                    max_chunks=3
-                )
-
-            # Enriquecer el prompt del sistema con contexto RAG
-            enhanced_system_prompt = system_prompt
-            if relevant_context:
-                enhanced_system_prompt = (
-                    f"{system_prompt}\n\n---\n\n"
-                    "## INFORMACIÓN DE CONTEXTO (Base de Conocimiento)\n\n"
-                    "Usa esta información para responder con datos precisos:\n\n"
-                    f"{relevant_context}\n\n---\n\n"
-                    "IMPORTANTE: Usa SOLO la información del contexto cuando esté disponible. "
-                    "Si la información no está en el contexto, indica que necesitas verificar con un asesor."
-                )
-                logger.info(f"Enhanced prompt with {len(relevant_context)} characters of context")
-
-            # Construir mensajes
-            messages = [
-                {"role": "system", "content": enhanced_system_prompt}
-            ]
-
-            # Agregar historial de conversación si existe
-            if conversation_history:
-                for i, msg in enumerate(conversation_history):
-                    role = "user" if i % 2 == 0 else "assistant"
-                    messages.append({"role": role, "content": msg})
-
-            messages.append({"role": "user", "content": user_message})
+            messages = self._build_messages(system_prompt, user_message, conversation_history)
 
             logger.debug(f"Sending chat completion request with {len(messages)} messages")
 
-            # Preparar herramientas (function calling) si hay catálogo disponible
-            tools = []
-            if self._catalog_repository:
-                tools = [
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": "search_vehicles",
-                            "description": "Busca vehículos en el inventario según criterios específicos como marca, modelo, precio, año, etc.",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "brand": {
-                                        "type": "string",
-                                        "description": "Marca del vehículo (ej: Toyota, Honda, BMW)"
-                                    },
-                                    "model": {
-                                        "type": "string",
-                                        "description": "Modelo del vehículo (ej: Corolla, Civic, Serie 3)"
-                                    },
-                                    "min_price": {
-                                        "type": "number",
-                                        "description": "Precio mínimo en pesos"
-                                    },
-                                    "max_price": {
-                                        "type": "number",
-                                        "description": "Precio máximo en pesos"
-                                    },
-                                    "min_year": {
-                                        "type": "integer",
-                                        "description": "Año mínimo del vehículo"
-                                    },
-                                    "max_year": {
-                                        "type": "integer",
-                                        "description": "Año máximo del vehículo"
-                                    },
-                                    "max_mileage": {
-                                        "type": "integer",
-                                        "description": "Kilometraje máximo permitido"
-                                    }
-                                },
-                                "required": []
-                            }
-                        }
-                    },
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": "get_vehicle_details",
-                            "description": "Obtiene información detallada de un vehículo específico usando su ID o stock_id",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "vehicle_id": {
-                                        "type": "string",
-                                        "description": "ID o stock_id del vehículo"
-                                    }
-                                },
-                                "required": ["vehicle_id"]
-                            }
-                        }
-                    }
-                ]
-
-            # Llamar a la API de OpenAI
-            completion_args = {
-                "model": self._model,
-                "messages": messages,
-                "temperature": self._temperature
-            }
-            
-            if tools:
-                completion_args["tools"] = tools
-
-            completion = await self._client.chat.completions.create(**completion_args)
+            completion = await self._client.chat.completions.create(**self._completion_args(messages))
 
             # Verificar si hay llamadas a funciones
             if completion.choices[0].finish_reason == "tool_calls":
@@ -190,6 +109,251 @@ class LlmClient(ILlmClient):
             logger.error(f"Error generating LLM response: {ex}")
             raise
 
+    async def stream_response(
+        self,
+        system_prompt: str,
+        user_message: str,
+        conversation_history: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Genera una respuesta en streaming (stream=True), entregando el texto a medida que llega.
+        Si el LLM pide herramientas, las ejecuta y transmite la respuesta final.
+        Cerrar el generador (aclose) corta la generación y cierra la conexión con OpenAI.
+        
+        Args:
+            system_prompt: Prompt del sistema con instrucciones
+            user_message: Mensaje del usuario
+            conversation_history: Historial de conversación opcional
+            
+        Yields:
+            Fragmentos de texto de la respuesta
+        """
+        messages = self._build_messages(system_prompt, user_message, conversation_history)
+
+        logger.debug(f"Sending streaming chat completion request with {len(messages)} messages")
+
+        content: List[str] = []
+        tool_calls: Dict[int, Dict[str, str]] = {}
+        stream = await self._client.chat.completions.create(**self._completion_args(messages), stream=True)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content.append(delta.content)
+                    yield delta.content
+
+                # Las llamadas a herramientas llegan por partes: se arman por su índice
+                for tool_call in delta.tool_calls or ():
+                    call = tool_calls.setdefault(tool_call.index, {"id": "", "name": "", "arguments": ""})
+                    if tool_call.id:
+                        call["id"] = tool_call.id
+                    if tool_call.function:
+                        call["name"] += tool_call.function.name or ""
+                        call["arguments"] += tool_call.function.arguments or ""
+        finally:
+            await stream.close()
+
+        if not tool_calls:
+            logger.info(f"Streamed response: {sum(map(len, content))} characters")
+            return
+
+        if not self._catalog_repository:
+            yield "Lo siento, no puedo consultar el catálogo en este momento."
+            return
+
+        await self._run_tool_calls(
+            messages,
+            "".join(content) or None,
+            [_ToolCall(**tool_calls[index]) for index in sorted(tool_calls)]
+        )
+
+        # Transmitir la respuesta final del LLM
+        final_stream = await self._client.chat.completions.create(
+            model=self._model,
+            messages=messages,
+            temperature=self._temperature,
+            stream=True
+        )
+        try:
+            async for chunk in final_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await final_stream.close()
+
+    def _build_messages(
+        self,
+        system_prompt: str,
+        user_message: str,
+        conversation_history: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Construye los mensajes de la solicitud, enriqueciendo el prompt del sistema
+        con información relevante de la base de conocimiento.
+        
+        Args:
+            system_prompt: Prompt del sistema con instrucciones
+            user_message: Mensaje del usuario
+            conversation_history: Historial de conversación opcional
+            
+        Returns:
+            Mensajes para la API de OpenAI
+        """
+        # Buscar contexto relevante en RAG si está disponible
+        relevant_context = ""
+        if self._knowledge_repository:
+            relevant_context = self._knowledge_repository.search_relevant_context(
+                user_message,
+                max_chunks=3
+            )
+
+        # Enriquecer el prompt del sistema con contexto RAG
+        enhanced_system_prompt = system_prompt
+        if relevant_context:
+            enhanced_system_prompt = (
+                f"{system_prompt}\n\n---\n\n"
+                "## INFORMACIÓN DE CONTEXTO (Base de Conocimiento)\n\n"
+                "Usa esta información para responder con datos precisos:\n\n"
+                f"{relevant_context}\n\n---\n\n"
+                "IMPORTANTE: Usa SOLO la información del contexto cuando esté disponible. "
+                "Si la información no está en el contexto, indica que necesitas verificar con un asesor."
+            )
+            logger.info(f"Enhanced prompt with {len(relevant_context)} characters of context")
+
+        # Construir mensajes
+        messages = [
+            {"role": "system", "content": enhanced_system_prompt}
+        ]
+
+        # Agregar historial de conversación si existe
+        if conversation_history:
+            for i, msg in enumerate(conversation_history):
+                role = "user" if i % 2 == 0 else "assistant"
+                messages.append({"role": role, "content": msg})
+
+        messages.append({"role": "user", "content": user_message})
+
+        return messages
+
+    def _completion_args(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Arma los argumentos de la solicitud inicial, con herramientas si hay catálogo.
+        
+        Args:
+            messages: Mensajes de la conversación
+            
+        Returns:
+            Argumentos para chat.completions.create
+        """
+        completion_args = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": self._temperature
+        }
+
+        if self._catalog_repository:
+            completion_args["tools"] = self._build_tools()
+
+        return completion_args
+
+    @staticmethod
+    def _build_tools() -> List[Dict[str, Any]]:
+        """
+        Construye las herramientas (function calling) de catálogo.
+        
+        Returns:
+            Definiciones de las herramientas
+        """
+        # Filtros compartidos por la búsqueda y las facetas
+        filter_properties = {
+            "brand": {
+                "type": "string",
+                "description": "Marca del vehículo tal como la escribió el cliente (ej: Toyota, Honda, VW); se toleran acentos, abreviaturas y errores de escritura"
+            },
+            "model": {
+                "type": "string",
+                "description": "Modelo del vehículo (ej: Corolla, Civic, Serie 3); se toleran acentos, guiones y errores de escritura"
+            },
+            "min_price": {
+                "type": "number",
+                "description": "Precio mínimo en pesos"
+            },
+            "max_price": {
+                "type": "number",
+                "description": "Precio máximo en pesos"
+            },
+            "min_year": {
+                "type": "integer",
+                "description": "Año mínimo del vehículo"
+            },
+            "max_year": {
+                "type": "integer",
+                "description": "Año máximo del vehículo"
+            },
+            "max_mileage": {
+                "type": "integer",
+                "description": "Kilometraje máximo permitido"
+            }
+        }
+
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_vehicles",
+                    "description": "Busca vehículos en el inventario según criterios específicos como marca, modelo, precio, año, etc.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            **filter_properties,
+                            "sort_by": {
+                                "type": "string",
+                                "enum": [order.value for order in VehicleSortOrder],
+                                "description": "Orden de los resultados (ej: price_asc para los más baratos, year_desc para los más nuevos)"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Cantidad de resultados a saltar para ver la siguiente página (de 10 en 10)"
+                            }
+                        },
+                        "required": []
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_catalog_facets",
+                    "description": "Obtiene cuántos vehículos hay por marca, modelo, año y rango de precio (y precios, años y kilometrajes mínimos y máximos) para los filtros dados. Úsala para preguntas de disponibilidad como qué marcas hay por debajo de cierto precio o qué años hay de un modelo.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": filter_properties,
+                        "required": []
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_vehicle_details",
+                    "description": "Obtiene información detallada de un vehículo específico usando su ID o stock_id",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "vehicle_id": {
+                                "type": "string",
+                                "description": "ID o stock_id del vehículo"
+                            }
+                        },
+                        "required": ["vehicle_id"]
+                    }
+                }
+            }
+        ]
+
     async def _handle_tool_calls(
         self,
         messages: List[Dict[str, Any]],
@@ -209,33 +373,73 @@ class LlmClient(ILlmClient):
         if not self._catalog_repository:
             return "Lo siento, no puedo consultar el catálogo en este momento."
 
-        # Agregar el mensaje del asistente con las tool calls
         assistant_message = completion.choices[0].message
+        await self._run_tool_calls(
+            messages,
+            assistant_message.content,
+            [
+                _ToolCall(tc.id, tc.function.name, tc.function.arguments)
+                for tc in assistant_message.tool_calls
+            ]
+        )
+
+        # Obtener respuesta final del LLM
+        final_completion = await self._client.chat.completions.create(
+            model=self._model,
+            messages=messages,
+            temperature=self._temperature
+        )
+
+        return final_completion.choices[0].message.content
+
+    async def _run_tool_calls(
+        self,
+        messages: List[Dict[str, Any]],
+        content: Optional[str],
+        tool_calls: List[_ToolCall]
+    ) -> None:
+        """
+        Agrega a los mensajes la respuesta del asistente con sus tool calls
+        y el resultado de ejecutar cada una.
+        
+        Args:
+            messages: Lista de mensajes de la conversación
+            content: Texto del asistente que acompaña a las tool calls
+            tool_calls: Tool calls solicitadas por el LLM
+        """
+        # Agregar el mensaje del asistente con las tool calls
         messages.append({
             "role": "assistant",
-            "content": assistant_message.content,
+            "content": content,
             "tool_calls": [
                 {
                     "id": tc.id,
                     "type": "function",
                     "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments
+                        "name": tc.name,
+                        "arguments": tc.arguments
                     }
                 }
-                for tc in assistant_message.tool_calls
+                for tc in tool_calls
             ]
         })
 
+        # Resolver en una sola pasada los vehículos pedidos por get_vehicle_details
+        prefetched_vehicles = await self._prefetch_vehicle_details(tool_calls)
+
         # Ejecutar cada tool call
-        for tool_call in assistant_message.tool_calls:
-            function_name = tool_call.function.name
-            function_args = tool_call.function.arguments
+        for tool_call in tool_calls:
+            function_name = tool_call.name
+            function_args = tool_call.arguments
 
             logger.info(f"Processing tool call: {function_name} with args: {function_args}")
 
             try:
-                function_result = await self._execute_tool(function_name, function_args)
+                function_result = await self._execute_tool(
+                    function_name,
+                    function_args,
+                    prefetched_vehicles
+                )
             except Exception as ex:
                 logger.error(f"Error executing tool {function_name}: {ex}")
                 function_result = json.dumps({"error": "Error ejecutando la búsqueda"})
@@ -247,23 +451,53 @@ class LlmClient(ILlmClient):
                 "content": function_result
             })
 
-        # Obtener respuesta final del LLM
-        final_completion = await self._client.chat.completions.create(
-            model=self._model,
-            messages=messages,
-            temperature=self._temperature
-        )
+    async def _prefetch_vehicle_details(self, tool_calls: List[_ToolCall]) -> Dict[str, Optional[Vehicle]]:
+        """
+        Obtiene con una sola consulta al catálogo todos los vehículos solicitados
+        por las llamadas a get_vehicle_details de un mismo turno.
+        
+        Args:
+            tool_calls: Tool calls solicitadas por el LLM
+            
+        Returns:
+            Diccionario de ID solicitado a vehículo (None si no existe)
+        """
+        vehicle_ids: List[str] = []
+        for tool_call in tool_calls:
+            if tool_call.name != "get_vehicle_details":
+                continue
+            try:
+                vehicle_id = json.loads(tool_call.arguments).get("vehicle_id")
+            except (ValueError, AttributeError):
+                continue
+            if vehicle_id and vehicle_id not in vehicle_ids:
+                vehicle_ids.append(vehicle_id)
 
-        return final_completion.choices[0].message.content
+        if len(vehicle_ids) < 2:
+            return {}
+
+        try:
+            vehicles = await self._catalog_repository.get_vehicles_by_ids(vehicle_ids)
+        except Exception as ex:
+            logger.error(f"Error prefetching vehicle details: {ex}")
+            return {}
+
+        return dict(zip(vehicle_ids, vehicles))
 
-    async def _execute_tool(self, function_name: str, function_args: str) -> str:
+    async def _execute_tool(
+        self,
+        function_name: str,
+        function_args: str,
+        prefetched_vehicles: Optional[Dict[str, Optional[Vehicle]]] = None
+    ) -> str:
         """
         Ejecuta una función/herramienta específica según su nombre.
-        Soporta búsqueda de vehículos y obtención de detalles.
+        Soporta búsqueda de vehículos, facetas del catálogo y obtención de detalles.
         
         Args:
             function_name: Nombre de la función a ejecutar
             function_args: Argumentos de la función en formato JSON
+            prefetched_vehicles: Vehículos ya resueltos por ID en este turno (opcional)
             
         Returns:
             Resultado de la función en formato JSON
@@ -274,47 +508,18 @@ class LlmClient(ILlmClient):
         try:
             if function_name == "search_vehicles":
                 params = json.loads(function_args)
-                
-                query = VehicleQuery(
-                    brand=params.get("brand"),
-                    model=params.get("model"),
-                    min_price=params.get("min_price"),
-                    max_price=params.get("max_price"),
-                    min_year=params.get("min_year"),
-                    max_year=params.get("max_year"),
-                    max_mileage=params.get("max_mileage")
-                )
+                query = self._build_vehicle_query(params)
+                query.sort_by = self._parse_sort_order(params.get("sort_by"))
+                query.offset = int(params.get("offset") or 0)
+                query.limit = SEARCH_PAGE_SIZE
 
-                vehicles = await self._catalog_repository.search_vehicles(query)
-                
-                # Limitar a 10 resultados
-                limited_vehicles = [
-                    {
-                        "id": v.stock_id,
-                        "marca": v.brand,
-                        "modelo": v.model,
-                        "año": v.year,
-                        "version": v.version,
-                        "precio": v.price,
-                        "kilometraje": v.mileage,
-                        "dimensiones": {
-                            "largo": v.length,
-                            "ancho": v.width,
-                            "alto": v.height
-                        },
-                        "caracteristicas": {
-                            "bluetooth": v.has_bluetooth,
-                            "carplay": v.has_carplay
-                        }
-                    }
-                    for v in vehicles[:10]
-                ]
+                return await self._cached_tool_result(function_name, query, self._search_vehicles_result)
+
+            elif function_name == "get_catalog_facets":
+                params = json.loads(function_args)
+                query = self._build_vehicle_query(params)
 
-                return json.dumps({
-                    "total": len(vehicles),
-                    "resultados_mostrados": len(limited_vehicles),
-                    "vehiculos": limited_vehicles
-                }, ensure_ascii=False)
+                return await self._cached_tool_result(function_name, query, self._catalog_facets_result)
 
             elif function_name == "get_vehicle_details":
                 params = json.loads(function_args)
@@ -323,29 +528,15 @@ class LlmClient(ILlmClient):
                 if not vehicle_id:
                     return json.dumps({"error": "ID de vehículo requerido"})
 
-                vehicle = await self._catalog_repository.get_vehicle_by_id(vehicle_id)
+                if prefetched_vehicles and vehicle_id in prefetched_vehicles:
+                    vehicle = prefetched_vehicles[vehicle_id]
+                else:
+                    vehicle = await self._catalog_repository.get_vehicle_by_id(vehicle_id)
                 
                 if not vehicle:
                     return json.dumps({"error": "Vehículo no encontrado"})
 
-                return json.dumps({
-                    "id": vehicle.stock_id,
-                    "marca": vehicle.brand,
-                    "modelo": vehicle.model,
-                    "año": vehicle.year,
-                    "version": vehicle.version,
-                    "precio": vehicle.price,
-                    "kilometraje": vehicle.mileage,
-                    "dimensiones": {
-                        "largo": vehicle.length,
-                        "ancho": vehicle.width,
-                        "alto": vehicle.height
-                    },
-                    "caracteristicas": {
-                        "bluetooth": vehicle.has_bluetooth,
-                        "carplay": vehicle.has_carplay
-                    }
-                }, ensure_ascii=False)
+                return serialize_vehicle(vehicle)
 
             else:
                 return json.dumps({"error": f"Función desconocida: {function_name}"})
@@ -353,6 +544,146 @@ class LlmClient(ILlmClient):
             logger.error(f"Error in _execute_tool for {function_name}: {ex}")
             return json.dumps({"error": "Error interno al procesar la solicitud"})
 
+    async def _cached_tool_result(
+        self,
+        function_name: str,
+        query: VehicleQuery,
+        execute: Callable[[VehicleQuery], Awaitable[str]]
+    ) -> str:
+        """
+        Obtiene el resultado serializado de una herramienta de catálogo desde la caché
+        o ejecutándola. La clave incluye la revisión del catálogo: al recargarlo o aplicarle
+        deltas, los resultados anteriores se descartan. Un resultado no se guarda si el
+        catálogo cambió mientras se calculaba.
+        
+        Args:
+            function_name: Nombre de la herramienta
+            query: Query de la herramienta
+            execute: Función que ejecuta la herramienta y serializa su resultado
+            
+        Returns:
+            Resultado de la herramienta en formato JSON
+        """
+        if not self._tool_cache.enabled:
+            return await execute(query)
+
+        revision = self._catalog_repository.revision
+        if revision != self._tool_cache_revision:
+            self._tool_cache.clear()
+            self._tool_cache_revision = revision
+
+        cache_key: Tuple[Hashable, ...] = (function_name, revision, query.cache_key())
+        result = self._tool_cache.get(cache_key)
+        if result is None:
+            result = await execute(query)
+            if self._catalog_repository.revision == revision:
+                self._tool_cache.set(cache_key, result)
+
+        return result
+
+    async def _search_vehicles_result(self, query: VehicleQuery) -> str:
+        """
+        Ejecuta search_vehicles y serializa la página de resultados.
+        
+        Args:
+            query: Filtros, orden y página de la búsqueda
+            
+        Returns:
+            Resultado en formato JSON
+        """
+        vehicles = await self._catalog_repository.search_vehicles(query)
+
+        # La búsqueda ya devuelve solo la página pedida; si la vista trae los fragmentos
+        # JSON precalculados de los vehículos, la respuesta se arma concatenándolos
+        to_json = getattr(vehicles, "to_json", None)
+        if to_json is not None and len(vehicles) <= SEARCH_PAGE_SIZE:
+            shown, vehicles_json = len(vehicles), to_json()
+        else:
+            page = vehicles[:SEARCH_PAGE_SIZE]
+            shown, vehicles_json = len(page), f"[{', '.join(map(serialize_vehicle, page))}]"
+
+        total = getattr(vehicles, "total", len(vehicles))
+        return f'{{"total": {total}, "resultados_mostrados": {shown}, "vehiculos": {vehicles_json}}}'
+
+    async def _catalog_facets_result(self, query: VehicleQuery) -> str:
+        """
+        Ejecuta get_catalog_facets y serializa las facetas.
+        
+        Args:
+            query: Filtros de las facetas
+            
+        Returns:
+            Resultado en formato JSON
+        """
+        facets = await self._catalog_repository.get_catalog_facets(query)
+
+        return json.dumps({
+            "total": facets.total,
+            "marcas": dict(islice(facets.brands.items(), FACET_VALUES_LIMIT)),
+            "modelos": dict(islice(facets.models.items(), FACET_VALUES_LIMIT)),
+            "años": facets.years,
+            "rangos_precio": [
+                {
+                    "desde": start,
+                    "hasta": start + facets.price_band_width,
+                    "cantidad": count
+                }
+                for start, count in facets.price_bands.items()
+            ],
+            "precio": {"min": facets.min_price, "max": facets.max_price},
+            "año": {"min": facets.min_year, "max": facets.max_year},
+            "kilometraje": {"min": facets.min_mileage, "max": facets.max_mileage},
+            "marcas_distintas": len(facets.brands),
+            "modelos_distintos": len(facets.models)
+        }, ensure_ascii=False)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Obtiene métricas de la caché de resultados de herramientas.
+        
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return self._tool_cache.get_metrics("llm_tool_cache")
+
+    @staticmethod
+    def _build_vehicle_query(params: Dict[str, Any]) -> VehicleQuery:
+        """
+        Construye los filtros de catálogo a partir de los argumentos de una herramienta.
+        
+        Args:
+            params: Argumentos de la herramienta
+            
+        Returns:
+            Query con los filtros indicados
+        """
+        return VehicleQuery(
+            brand=params.get("brand"),
+            model=params.get("model"),
+            min_price=params.get("min_price"),
+            max_price=params.get("max_price"),
+            min_year=params.get("min_year"),
+            max_year=params.get("max_year"),
+            max_mileage=params.get("max_mileage")
+        )
+
+    @staticmethod
+    def _parse_sort_order(value: Optional[str]) -> Optional[VehicleSortOrder]:
+        """
+        Convierte el orden pedido por el LLM; los valores desconocidos se ignoran.
+        
+        Args:
+            value: Valor del parámetro sort_by
+            
+        Returns:
+            Orden de búsqueda o None
+        """
+        try:
+            return VehicleSortOrder(value) if value else None
+        except ValueError:
+            logger.warning(f"Ignoring unknown sort order: {value}")
+            return None
+
     async def generate_structured_response(self, prompt: str, response_type: type):
         """
         Genera una respuesta estructurada del LLM según un esquema específico.
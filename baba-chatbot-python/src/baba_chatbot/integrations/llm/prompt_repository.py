@@ -1,14 +1,27 @@
 """
 Repositorio de prompts del sistema.
 Carga y gestiona los prompts desde archivos markdown.
+Los prompts se leen una vez a memoria y el prompt del sistema completo (sistema, guardrails,
+propuesta de valor y estilo) se compone una sola vez; las recargas leen los archivos fuera del
+event loop y solo vuelven a componerlo si algún archivo cambió.
 """
 import os
+import asyncio
 import logging
-from pathlib import Path
+from typing import Dict, List, Optional
 
 
 logger = logging.getLogger(__name__)
 
+# Archivos de prompt conocidos, en el orden en que se componen en el prompt del sistema
+PROMPT_FILES = ("system.md", "guardrails.md", "value-prop.md", "response-style.md")
+
+# Prompt del sistema a usar si system.md no existe o está vacío
+DEFAULT_SYSTEM_PROMPT = "Eres Baba, un asistente virtual de Kavak que ayuda a clientes a encontrar vehículos."
+
+# Separador entre las partes del prompt del sistema compuesto
+PROMPT_SEPARATOR = "\n\n---\n\n"
+
 
 class PromptRepository:
     """
@@ -17,73 +30,146 @@ class PromptRepository:
 
     def __init__(self, prompts_path: str = None):
         """
-        Inicializa el repositorio de prompts.
-        
+        Inicializa el repositorio de prompts y carga los archivos a memoria.
+
         Args:
             prompts_path: Ruta al directorio de prompts
         """
         if prompts_path is None:
             prompts_path = os.path.join(os.getcwd(), "config", "prompts")
-        
+
         self._prompts_path = prompts_path
+        self._prompts: Dict[str, str] = self._read_prompts()
+        self._composed_system_prompt = self._compose(self._prompts)
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def source_paths(self) -> List[str]:
+        """Ruta del directorio de prompts (para detectar cambios)."""
+        return [self._prompts_path]
 
     async def get_system_prompt(self) -> str:
         """
         Obtiene el prompt del sistema.
-        
+
         Returns:
             Contenido del prompt del sistema
         """
-        return await self._load_prompt("system.md")
+        return self._prompts.get("system.md", "")
 
     async def get_guardrails_prompt(self) -> str:
         """
         Obtiene el prompt de guardrails.
-        
+
         Returns:
             Contenido del prompt de guardrails
         """
-        return await self._load_prompt("guardrails.md")
+        return self._prompts.get("guardrails.md", "")
 
     async def get_value_prop_prompt(self) -> str:
         """
         Obtiene el prompt de propuesta de valor.
-        
+
         Returns:
             Contenido del prompt de propuesta de valor
         """
-        return await self._load_prompt("value-prop.md")
+        return self._prompts.get("value-prop.md", "")
 
     async def get_response_style_prompt(self) -> str:
         """
         Obtiene el prompt de estilo de respuestas.
-        
+
         Returns:
             Contenido del prompt de estilo de respuestas
         """
-        return await self._load_prompt("response-style.md")
+        return self._prompts.get("response-style.md", "")
+
+    async def get_composed_system_prompt(self) -> str:
+        """
+        Obtiene el prompt del sistema completo: sistema, guardrails, propuesta de valor
+        y estilo de respuestas. Se compone al cargar los prompts, no por solicitud.
+
+        Returns:
+            Prompt del sistema compuesto
+        """
+        return self._composed_system_prompt
+
+    async def reload(self) -> None:
+        """
+        Vuelve a leer los archivos de prompt fuera del event loop. Si alguno cambió,
+        recompone el prompt del sistema y reemplaza ambos de una sola vez.
+        """
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            prompts = await loop.run_in_executor(None, self._read_prompts)
+            if prompts == self._prompts:
+                logger.debug(f"Prompts in {self._prompts_path} unchanged")
+                return
+
+            self._prompts, self._composed_system_prompt = prompts, self._compose(prompts)
+            logger.info(
+                f"Reloaded {len(prompts)} prompts from {self._prompts_path} "
+                f"(system prompt: {len(self._composed_system_prompt)} characters)"
+            )
+
+    def _compose(self, prompts: Dict[str, str]) -> str:
+        """
+        Compone el prompt del sistema con las partes disponibles, en el orden de PROMPT_FILES.
+
+        Args:
+            prompts: Contenido por nombre de archivo
+
+        Returns:
+            Prompt del sistema compuesto
+        """
+        system = prompts.get("system.md", "").strip()
+        if not system:
+            logger.warning("System prompt is empty, using default")
+            system = DEFAULT_SYSTEM_PROMPT
+
+        parts = [system]
+        for file_name in PROMPT_FILES[1:]:
+            content = prompts.get(file_name, "").strip()
+            if content:
+                parts.append(content)
 
-    async def _load_prompt(self, file_name: str) -> str:
+        return PROMPT_SEPARATOR.join(parts)
+
+    def _read_prompts(self) -> Dict[str, str]:
+        """
+        Lee todos los archivos de prompt conocidos.
+
+        Returns:
+            Contenido por nombre de archivo (solo los que se pudieron leer)
+        """
+        prompts: Dict[str, str] = {}
+        for file_name in PROMPT_FILES:
+            content = self._load_prompt(file_name)
+            if content is not None:
+                prompts[file_name] = content
+
+        return prompts
+
+    def _load_prompt(self, file_name: str) -> Optional[str]:
         """
         Carga un archivo de prompt específico.
-        
+
         Args:
             file_name: Nombre del archivo de prompt
-            
+
         Returns:
-            Contenido del prompt o cadena vacía si hay error
+            Contenido del prompt o None si no existe o hay error
         """
         try:
             file_path = os.path.join(self._prompts_path, file_name)
-            
+
             if not os.path.exists(file_path):
                 logger.warning(f"Prompt file not found: {file_path}")
-                return ""
+                return None
 
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 return content
         except Exception as ex:
             logger.error(f"Error loading prompt file {file_name}: {ex}")
-            return ""
-
+            return None
@@ -0,0 +1,95 @@
+"""
+Análisis de texto en español para la búsqueda en la base de conocimiento.
+Convierte un texto en términos: minúsculas, sin acentos, sin palabras vacías y con un
+stemming ligero de plurales y género ("autos" y "auto" comparten término, pero no
+"auto" y "automático").
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+
+_WORD = re.compile(r'[0-9a-z]+')
+
+# Palabras vacías del español (ya sin acentos) que no aportan a la relevancia
+SPANISH_STOPWORDS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes aqui asi aun bajo bien cada como con
+contra cual cuales cuando cuanta cuantas cuanto cuantos de del desde donde el ella ellas ello
+ellos en entre era eran es esa esas ese eso esos esta estaba estan estar estas este esto estos
+fue fueron ha habia han hasta hay la las le les lo los mas me mi mis mucho muy nada ni no nos
+nosotros o os otra otras otro otros para pero poco por porque puede pueden que quien se sea ser
+si sin sobre solo son su sus tambien tan tanto te tiene tienen todo todos tu tus un una unas
+uno unos usted ustedes y ya yo
+""".split())
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Stemming ligero para español: quita plurales y la vocal final de género.
+
+    Args:
+        word: Palabra en minúsculas y sin acentos
+
+    Returns:
+        Raíz de la palabra
+    """
+    if len(word) <= 3 or word.isdigit():
+        return word
+
+    if word.endswith('ces') and len(word) >= 5:
+        word = word[:-3] + 'z'
+    elif word.endswith('es') and len(word) >= 5 and word[-3] not in 'aeiou':
+        word = word[:-2]
+    elif word.endswith('s'):
+        word = word[:-1]
+
+    if len(word) > 4 and word[-1] in 'aeo':
+        word = word[:-1]
+
+    return word
+
+
+def fold_accents(text: str) -> str:
+    """
+    Pasa un texto a minúsculas y le quita los acentos ("Garantía" -> "garantia").
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def words(text: str) -> List[str]:
+    """
+    Extrae las palabras significativas de un texto: minúsculas, sin acentos y sin palabras vacías.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Palabras en el orden del texto (con repeticiones)
+    """
+    return [
+        word
+        for word in _WORD.findall(fold_accents(text))
+        if word not in SPANISH_STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Convierte un texto en la secuencia de términos que se indexan o se buscan.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Términos en el orden del texto (con repeticiones)
+    """
+    return [stem(word) for word in words(text)]
@@ -0,0 +1,338 @@
+"""
+Índice vectorial local para la base de conocimiento, sin API de embeddings.
+Cada sección se representa con un vector TF-IDF de n-gramas de caracteres proyectados por
+hashing a una dimensión fija, así que variantes como "pago", "pagar" y "pagos" comparten
+la mayoría de sus componentes. Los vectores se guardan normalizados en una matriz de NumPy
+y puntuar una consulta es un solo producto matriz-vector (similitud coseno).
+
+NumPy es una dependencia opcional (extra "vector"): sin ella numpy_available() devuelve
+False y la base de conocimiento usa solo la búsqueda por palabras.
+"""
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .text_analysis import words
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+# Dimensión de los vectores (cantidad de buckets del hashing)
+DEFAULT_DIMENSIONS = 2048
+
+# Largos de los n-gramas de caracteres (incluyendo los bordes de la palabra)
+DEFAULT_NGRAM_RANGE = (3, 5)
+
+# Similitud mínima para considerar relevante una sección en el modo vectorial
+DEFAULT_MIN_SIMILARITY = 0.1
+
+# Palabras cuyos n-gramas se conservan calculados (vocabulario del corpus y consultas frecuentes)
+_MAX_CACHED_WORDS = 65536
+
+# Versión del formato de archivo; los archivos con otra versión se ignoran
+VECTOR_FORMAT_VERSION = 1
+
+
+def numpy_available() -> bool:
+    """Indica si NumPy está instalado (requerido por el índice vectorial)."""
+    return np is not None
+
+
+class HashedVectorIndex:
+    """
+    Matriz de vectores TF-IDF (una fila por documento) con hashing de n-gramas de caracteres.
+    Los documentos se identifican por su posición en la colección, igual que en Bm25Index.
+    """
+
+    def __init__(
+        self,
+        texts: Iterable[str],
+        dimensions: int = DEFAULT_DIMENSIONS,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        fingerprint: str = ""
+    ):
+        """
+        Construye el índice vectorizando los textos.
+
+        Args:
+            texts: Texto de cada documento
+            dimensions: Dimensión de los vectores
+            ngram_range: Largo mínimo y máximo de los n-gramas
+            fingerprint: Huella del contenido indexado (para validar archivos persistidos)
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for vector retrieval (pip install baba-chatbot[vector])")
+
+        self._dimensions = dimensions
+        self._ngram_range = ngram_range
+        self._features: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+        self.fingerprint = fingerprint
+
+        rows = [self._count(text) for text in texts]
+        matrix = np.zeros((len(rows), dimensions), dtype=np.float32)
+        for row, counts in enumerate(rows):
+            matrix[row] = self._to_vector(counts)
+
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        self._idf = (np.log((1.0 + len(rows)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        matrix *= self._idf
+        self._matrix = _normalize_rows(matrix)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        matrix: 'np.ndarray',
+        idf: 'np.ndarray',
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        fingerprint: str = ""
+    ) -> 'HashedVectorIndex':
+        """
+        Crea un índice a partir de una matriz ya calculada (por ejemplo, leída de disco).
+
+        Args:
+            matrix: Vectores normalizados, una fila por documento
+            idf: Peso IDF de cada dimensión
+            ngram_range: Largo mínimo y máximo de los n-gramas usados al construirla
+            fingerprint: Huella del contenido indexado
+
+        Returns:
+            Nueva instancia de HashedVectorIndex
+        """
+        index = cls([], dimensions=len(idf), ngram_range=ngram_range, fingerprint=fingerprint)
+        index._matrix = matrix
+        index._idf = idf
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional['HashedVectorIndex']:
+        """
+        Lee un índice guardado con save().
+
+        Args:
+            path: Ruta del archivo .npz
+
+        Returns:
+            Índice leído, o None si el archivo tiene otro formato
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for vector retrieval (pip install baba-chatbot[vector])")
+
+        with np.load(path, allow_pickle=False) as data:
+            version, minimum, maximum = (int(value) for value in data["config"])
+            if version != VECTOR_FORMAT_VERSION:
+                return None
+            return cls.from_arrays(data["matrix"], data["idf"], (minimum, maximum), str(data["fingerprint"]))
+
+    def save(self, path: str) -> None:
+        """
+        Guarda la matriz, los pesos IDF y la configuración en un archivo .npz.
+
+        Args:
+            path: Ruta del archivo
+        """
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                matrix=self._matrix,
+                idf=self._idf,
+                config=np.array([VECTOR_FORMAT_VERSION, *self._ngram_range]),
+                fingerprint=np.array(self.fingerprint)
+            )
+
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
+
+    @property
+    def dimensions(self) -> int:
+        """Dimensión de los vectores."""
+        return self._dimensions
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        """Vectores normalizados de los documentos (una fila por documento)."""
+        return self._matrix
+
+    @property
+    def idf(self) -> 'np.ndarray':
+        """Peso IDF de cada dimensión."""
+        return self._idf
+
+    @property
+    def ngram_range(self) -> Tuple[int, int]:
+        """Largo mínimo y máximo de los n-gramas."""
+        return self._ngram_range
+
+    def similarities(self, query: str) -> 'np.ndarray':
+        """
+        Calcula la similitud coseno de una consulta con todos los documentos.
+
+        Args:
+            query: Texto de la consulta
+
+        Returns:
+            Similitud de cada documento (0 si la consulta no tiene n-gramas)
+        """
+        vector = self._to_vector(self._count(query)) * self._idf
+        norm = float(np.linalg.norm(vector))
+        if not norm or not len(self):
+            return np.zeros(len(self), dtype=np.float32)
+
+        return self._matrix @ (vector / norm)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY
+    ) -> List[Tuple[int, float]]:
+        """
+        Busca los documentos más similares a una consulta.
+
+        Args:
+            query: Texto de la consulta
+            limit: Cantidad máxima de resultados
+            min_similarity: Similitud mínima de un resultado
+
+        Returns:
+            Pares (documento, similitud) ordenados por similitud descendente
+        """
+        return _top(self.similarities(query), limit, min_similarity)
+
+    def hybrid_search(
+        self,
+        query: str,
+        keyword_results: Sequence[Tuple[int, float]],
+        limit: int,
+        vector_weight: float,
+        min_score: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """
+        Combina la similitud vectorial con puntajes de palabras clave (por ejemplo, BM25).
+        Los puntajes de palabras clave se escalan a [0, 1] respecto del mejor resultado;
+        los documentos que no aparecen en keyword_results aportan solo su similitud.
+
+        Args:
+            query: Texto de la consulta
+            keyword_results: Pares (documento, puntaje) de la búsqueda por palabras clave
+            limit: Cantidad máxima de resultados
+            vector_weight: Peso de la similitud vectorial (el resto es de las palabras clave)
+            min_score: Puntaje combinado mínimo de un resultado
+
+        Returns:
+            Pares (documento, puntaje combinado) ordenados por puntaje descendente
+        """
+        scores = self.similarities(query) * vector_weight
+
+        best = max((score for _, score in keyword_results), default=0.0)
+        if best > 0:
+            documents = np.fromiter((document for document, _ in keyword_results), dtype=np.intp)
+            keyword = np.fromiter((score for _, score in keyword_results), dtype=np.float32)
+            scores[documents] += (1.0 - vector_weight) * keyword / best
+
+        return _top(scores, limit, min_score)
+
+    def _count(self, text: str) -> Dict[int, float]:
+        """
+        Cuenta los n-gramas de un texto proyectados a sus buckets (con signo, para que las
+        colisiones del hashing se compensen en lugar de acumularse).
+
+        Args:
+            text: Texto a vectorizar
+
+        Returns:
+            Valor acumulado por bucket
+        """
+        counts: Dict[int, float] = {}
+        get = counts.get
+
+        for word in words(text):
+            features = self._features.get(word)
+            if features is None:
+                features = self._word_features(word)
+                if len(self._features) < _MAX_CACHED_WORDS:
+                    self._features[word] = features
+            for bucket, sign in features:
+                counts[bucket] = get(bucket, 0.0) + sign
+
+        return counts
+
+    def _word_features(self, word: str) -> Tuple[Tuple[int, float], ...]:
+        """
+        Calcula los buckets de los n-gramas de una palabra (con los bordes marcados por espacios).
+        Se usa CRC32 y no hash() para que los buckets sean estables entre procesos.
+
+        Args:
+            word: Palabra normalizada
+
+        Returns:
+            Pares (bucket, signo) de cada n-grama
+        """
+        padded = f" {word} "
+        minimum, maximum = self._ngram_range
+        grams = {
+            padded[start:start + size]
+            for size in range(minimum, maximum + 1)
+            for start in range(len(padded) - size + 1)
+        } or {padded}
+
+        features = []
+        for gram in sorted(grams):
+            digest = zlib.crc32(gram.encode("utf-8"))
+            features.append((digest % self._dimensions, 1.0 if digest & 0x80000000 else -1.0))
+
+        return tuple(features)
+
+    def _to_vector(self, counts: Dict[int, float]) -> 'np.ndarray':
+        """
+        Convierte los conteos por bucket en un vector con frecuencia sublineal (1 + log tf).
+
+        Args:
+            counts: Valor acumulado por bucket
+
+        Returns:
+            Vector sin ponderar por IDF
+        """
+        vector = np.zeros(self._dimensions, dtype=np.float32)
+        if counts:
+            buckets = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            magnitudes = np.abs(values)
+            nonzero = magnitudes > 0
+            vector[buckets[nonzero]] = np.sign(values[nonzero]) * (1.0 + np.log(magnitudes[nonzero]))
+
+        return vector
+
+
+def _normalize_rows(matrix: 'np.ndarray') -> 'np.ndarray':
+    """Normaliza cada fila a norma 1 (las filas vacías quedan en cero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _top(scores: 'np.ndarray', limit: int, minimum: float) -> List[Tuple[int, float]]:
+    """
+    Selecciona los mejores puntajes sin ordenar el arreglo completo.
+
+    Args:
+        scores: Puntaje de cada documento
+        limit: Cantidad máxima de resultados
+        minimum: Puntaje mínimo de un resultado
+
+    Returns:
+        Pares (documento, puntaje) ordenados por puntaje descendente
+        (a igual puntaje, en orden de colección)
+    """
+    if limit <= 0 or not len(scores):
+        return []
+
+    if limit < len(scores):
+        candidates = np.argpartition(-scores, limit - 1)[:limit]
+    else:
+        candidates = np.arange(len(scores))
+
+    ranked = sorted(((float(scores[document]), int(document)) for document in candidates),
+                    key=lambda item: (-item[0], item[1]))
+    return [(document, score) for score, document in ranked if score > minimum]
@@ -0,0 +1,21 @@
+"""
+Sesiones de conversación: historial reciente por usuario en memoria, SQLite o Redis
+"""
+from .session_store import ConversationTurn, MemorySessionStore, SessionStore, flatten_turns
+from .sqlite_session_store import SqliteSessionStore
+from .resp_client import RespClient, RespError
+from .redis_session_store import RedisSessionStore
+from .session_factory import SESSION_BACKENDS, create_session_store
+
+__all__ = [
+    "ConversationTurn",
+    "SessionStore",
+    "MemorySessionStore",
+    "SqliteSessionStore",
+    "RedisSessionStore",
+    "RespClient",
+    "RespError",
+    "SESSION_BACKENDS",
+    "create_session_store",
+    "flatten_turns"
+]
@@ -0,0 +1,57 @@
+"""
+Almacén de sesiones de conversación en un servidor compatible con Redis (protocolo RESP).
+Comparte el historial entre todos los workers y máquinas; cada sesión es una lista con
+expiración, y el límite de memoria lo aplica el servidor (maxmemory con política allkeys-lru).
+"""
+import json
+from typing import List
+from .resp_client import RespClient
+from .session_store import ConversationTurn, SessionStore
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sesiones como listas RESP: RPUSH del turno, LTRIM a los últimos max_turns y EXPIRE
+    en un solo pipeline, así que la lista nunca crece más allá del buffer circular.
+    """
+
+    def __init__(
+        self,
+        client: RespClient,
+        max_turns: int = 6,
+        ttl_seconds: float = 86400.0,
+        key_prefix: str = "baba:session:"
+    ):
+        """
+        Inicializa el almacén.
+
+        Args:
+            client: Cliente RESP
+            max_turns: Turnos conservados por usuario
+            ttl_seconds: Segundos de inactividad tras los que se descarta la sesión
+            key_prefix: Prefijo de las claves
+        """
+        super().__init__(max_turns, ttl_seconds)
+        self._client = client
+        self._key_prefix = key_prefix
+
+    async def get_turns(self, user_id: str) -> List[ConversationTurn]:
+        entries = await self._client.execute("LRANGE", self._key(user_id), 0, -1)
+        return [tuple(json.loads(entry)) for entry in entries or []]
+
+    async def append_turn(self, user_id: str, user_message: str, assistant_message: str) -> None:
+        key = self._key(user_id)
+        await self._client.pipeline([
+            ["RPUSH", key, json.dumps([user_message, assistant_message], ensure_ascii=False)],
+            ["LTRIM", key, -self._max_turns, -1],
+            ["PEXPIRE", key, int(self._ttl_seconds * 1000)]
+        ])
+
+    async def clear(self, user_id: str) -> None:
+        await self._client.execute("DEL", self._key(user_id))
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def _key(self, user_id: str) -> str:
+        return f"{self._key_prefix}{user_id}"
@@ -0,0 +1,223 @@
+"""
+Cliente asíncrono mínimo del protocolo RESP (Redis) sobre asyncio, sin dependencias externas.
+Soporta comandos y pipelines sobre una conexión persistente; sirve con Redis o con cualquier
+servidor compatible (Valkey, KeyDB o un servidor local de pruebas).
+"""
+import asyncio
+import logging
+from typing import Any, List, Optional, Sequence, Union
+from urllib.parse import unquote, urlparse
+
+
+logger = logging.getLogger(__name__)
+
+CommandArgument = Union[str, bytes, int, float]
+
+
+class RespError(Exception):
+    """Error devuelto por el servidor (respuesta -ERR)."""
+
+
+def encode_command(arguments: Sequence[CommandArgument]) -> bytes:
+    """
+    Codifica un comando como arreglo RESP de bulk strings.
+
+    Args:
+        arguments: Nombre del comando y sus argumentos
+
+    Returns:
+        Comando codificado
+    """
+    parts = [f"*{len(arguments)}\r\n".encode()]
+    for argument in arguments:
+        data = argument if isinstance(argument, bytes) else str(argument).encode("utf-8")
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+class RespClient:
+    """
+    Conexión RESP persistente. Los comandos concurrentes se serializan sobre la conexión;
+    si la conexión falla se descarta y el siguiente comando vuelve a conectar.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        username: Optional[str] = None,
+        timeout_seconds: float = 5.0
+    ):
+        """
+        Inicializa el cliente (la conexión se abre con el primer comando).
+
+        Args:
+            host: Host del servidor
+            port: Puerto del servidor
+            db: Base de datos a seleccionar
+            password: Contraseña (AUTH)
+            username: Usuario (AUTH con ACL)
+            timeout_seconds: Timeout de conexión y de cada comando
+        """
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._username = username
+        self._timeout_seconds = timeout_seconds
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout_seconds: float = 5.0) -> "RespClient":
+        """
+        Crea un cliente desde una URL redis://[usuario:contraseña@]host[:puerto][/db].
+
+        Args:
+            url: URL del servidor
+            timeout_seconds: Timeout de conexión y de cada comando
+
+        Returns:
+            Cliente configurado
+
+        Raises:
+            ValueError: Si la URL no usa el esquema redis://
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported session store URL: {url}")
+
+        path = parsed.path.lstrip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(path) if path else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            username=unquote(parsed.username) if parsed.username else None,
+            timeout_seconds=timeout_seconds
+        )
+
+    async def execute(self, *arguments: CommandArgument) -> Any:
+        """
+        Ejecuta un comando.
+
+        Args:
+            arguments: Nombre del comando y sus argumentos
+
+        Returns:
+            Respuesta del servidor (str, int, bytes decodificados, None o lista)
+
+        Raises:
+            RespError: Si el servidor devuelve un error
+        """
+        return (await self.pipeline([arguments]))[0]
+
+    async def pipeline(self, commands: Sequence[Sequence[CommandArgument]]) -> List[Any]:
+        """
+        Envía varios comandos en una sola escritura y lee sus respuestas.
+
+        Args:
+            commands: Comandos a ejecutar en orden
+
+        Returns:
+            Respuesta de cada comando
+
+        Raises:
+            RespError: Si el servidor devuelve un error en alguno de los comandos
+        """
+        async with self._lock:
+            try:
+                await self._ensure_connected()
+                self._writer.write(b"".join(encode_command(command) for command in commands))
+                await asyncio.wait_for(self._writer.drain(), self._timeout_seconds)
+                replies = [
+                    await asyncio.wait_for(self._read_reply(), self._timeout_seconds)
+                    for _ in commands
+                ]
+            except BaseException:
+                # Cualquier interrupción (error de red, timeout o cancelación) puede dejar
+                # respuestas sin leer que recibiría el siguiente comando: la conexión se
+                # descarta y se reconecta después
+                await self._disconnect()
+                raise
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def close(self) -> None:
+        """Cierra la conexión."""
+        async with self._lock:
+            await self._disconnect()
+
+    async def _ensure_connected(self) -> None:
+        """Abre la conexión si no está abierta y se autentica y selecciona la base."""
+        if self._writer is not None:
+            return
+
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port),
+            self._timeout_seconds
+        )
+
+        handshake: List[List[CommandArgument]] = []
+        if self._password:
+            handshake.append(["AUTH", self._username, self._password] if self._username else ["AUTH", self._password])
+        if self._db:
+            handshake.append(["SELECT", self._db])
+        for command in handshake:
+            self._writer.write(encode_command(command))
+            await self._writer.drain()
+            reply = await asyncio.wait_for(self._read_reply(), self._timeout_seconds)
+            if isinstance(reply, RespError):
+                await self._disconnect()
+                raise reply
+
+        logger.info(f"Connected to RESP server at {self._host}:{self._port}/{self._db}")
+
+    async def _disconnect(self) -> None:
+        """Cierra la conexión actual ignorando errores."""
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, asyncio.CancelledError):
+                pass
+
+    async def _read_reply(self) -> Any:
+        """
+        Lee una respuesta RESP completa.
+
+        Returns:
+            Respuesta decodificada; los errores se devuelven como RespError para que
+            el resto del pipeline se siga leyendo
+        """
+        line = await self._reader.readuntil(b"\r\n")
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload.decode("utf-8")
+        if prefix == b"-":
+            return RespError(payload.decode("utf-8"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2].decode("utf-8")
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+
+        raise EOFError(f"Unexpected RESP reply: {line!r}")
@@ -0,0 +1,52 @@
+"""
+Creación del almacén de sesiones según la configuración.
+"""
+from typing import Optional
+from .redis_session_store import RedisSessionStore
+from .resp_client import RespClient
+from .session_store import MemorySessionStore, SessionStore
+from .sqlite_session_store import SqliteSessionStore
+
+
+SESSION_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def create_session_store(
+    backend: str,
+    max_turns: int = 6,
+    ttl_seconds: float = 86400.0,
+    max_sessions: int = 10000,
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None
+) -> SessionStore:
+    """
+    Crea el almacén de sesiones indicado.
+
+    Args:
+        backend: memory, sqlite o redis
+        max_turns: Turnos conservados por usuario
+        ttl_seconds: Segundos de inactividad tras los que se descarta la sesión
+        max_sessions: Usuarios conservados como máximo (memory y sqlite; en redis lo limita el servidor)
+        sqlite_path: Archivo SQLite (backend sqlite)
+        redis_url: URL redis:// del servidor (backend redis)
+
+    Returns:
+        Almacén de sesiones
+
+    Raises:
+        ValueError: Si el backend no existe o le falta su ruta o URL
+    """
+    if backend == "memory":
+        return MemorySessionStore(max_turns, ttl_seconds, max_sessions)
+
+    if backend == "sqlite":
+        if not sqlite_path:
+            raise ValueError("The sqlite session store requires a database path")
+        return SqliteSessionStore(sqlite_path, max_turns, ttl_seconds, max_sessions)
+
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("The redis session store requires a redis:// URL")
+        return RedisSessionStore(RespClient.from_url(redis_url), max_turns, ttl_seconds)
+
+    raise ValueError(f"Unknown session store backend '{backend}', expected one of {', '.join(SESSION_BACKENDS)}")
@@ -0,0 +1,147 @@
+"""
+Almacén de sesiones de conversación por usuario.
+Guarda los últimos turnos (mensaje del usuario y respuesta) de cada usuario para enviarlos
+como historial al LLM. Las sesiones expiran por inactividad y el almacén está acotado.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+from ..caching import TtlLruCache
+
+
+# Turno de conversación: (mensaje del usuario, respuesta del asistente)
+ConversationTurn = Tuple[str, str]
+
+
+def flatten_turns(turns: List[ConversationTurn]) -> List[str]:
+    """
+    Convierte turnos al historial que recibe el orquestador (usuario y asistente alternados).
+
+    Args:
+        turns: Turnos en orden cronológico
+
+    Returns:
+        Mensajes alternados empezando por el usuario
+    """
+    return [message for turn in turns for message in turn]
+
+
+class SessionStore(ABC):
+    """
+    Almacén de historial de conversación por usuario.
+    Cada usuario conserva a lo sumo max_turns turnos (los más recientes) y su sesión
+    se descarta ttl_seconds después de su último turno.
+    """
+
+    def __init__(self, max_turns: int, ttl_seconds: float):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_turns: Turnos conservados por usuario
+            ttl_seconds: Segundos de inactividad tras los que se descarta la sesión
+        """
+        self._max_turns = max_turns
+        self._ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def get_turns(self, user_id: str) -> List[ConversationTurn]:
+        """
+        Obtiene los turnos vigentes de un usuario.
+
+        Args:
+            user_id: Identificador del usuario
+
+        Returns:
+            Turnos en orden cronológico (vacío si no hay sesión o expiró)
+        """
+        pass
+
+    @abstractmethod
+    async def append_turn(self, user_id: str, user_message: str, assistant_message: str) -> None:
+        """
+        Agrega un turno a la sesión del usuario, descartando los más antiguos
+        si supera max_turns, y renueva su expiración.
+
+        Args:
+            user_id: Identificador del usuario
+            user_message: Mensaje del usuario
+            assistant_message: Respuesta enviada
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self, user_id: str) -> None:
+        """
+        Descarta la sesión de un usuario.
+
+        Args:
+            user_id: Identificador del usuario
+        """
+        pass
+
+    async def get_history(self, user_id: str) -> List[str]:
+        """
+        Obtiene el historial de un usuario en el formato del orquestador.
+
+        Args:
+            user_id: Identificador del usuario
+
+        Returns:
+            Mensajes alternados de usuario y asistente
+        """
+        return flatten_turns(await self.get_turns(user_id))
+
+    async def close(self) -> None:
+        """Libera las conexiones o recursos del almacén."""
+        pass
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        """
+        Obtiene métricas del almacén.
+
+        Args:
+            prefix: Prefijo de los nombres de métrica
+
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return {}
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sesiones en memoria del proceso: un buffer circular de turnos por usuario en una
+    caché LRU con expiración, acotada a max_sessions usuarios.
+    """
+
+    def __init__(self, max_turns: int = 6, ttl_seconds: float = 86400.0, max_sessions: int = 10000):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_turns: Turnos conservados por usuario
+            ttl_seconds: Segundos de inactividad tras los que se descarta la sesión
+            max_sessions: Usuarios en memoria como máximo (se descartan los menos recientes)
+        """
+        super().__init__(max_turns, ttl_seconds)
+        self._sessions: TtlLruCache[Deque[ConversationTurn]] = TtlLruCache(max_sessions, ttl_seconds)
+
+    async def get_turns(self, user_id: str) -> List[ConversationTurn]:
+        turns = self._sessions.get(user_id)
+        return list(turns) if turns is not None else []
+
+    async def append_turn(self, user_id: str, user_message: str, assistant_message: str) -> None:
+        turns = self._sessions.get(user_id)
+        if turns is None:
+            turns = deque(maxlen=self._max_turns)
+        turns.append((user_message, assistant_message))
+
+        # Volver a guardarlo renueva la expiración
+        self._sessions.set(user_id, turns)
+
+    async def clear(self, user_id: str) -> None:
+        self._sessions.pop(user_id)
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        return self._sessions.get_metrics(prefix)
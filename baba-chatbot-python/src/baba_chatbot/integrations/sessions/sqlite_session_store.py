@@ -0,0 +1,177 @@
+"""
+Almacén de sesiones de conversación en SQLite.
+Persiste el historial entre reinicios y lo comparte entre los workers de una misma máquina.
+Las consultas se ejecutan en un hilo dedicado para no bloquear el event loop.
+"""
+import time
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+from .session_store import ConversationTurn, SessionStore
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Turnos agregados entre cada limpieza de sesiones expiradas o sobrantes
+PRUNE_INTERVAL = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id TEXT PRIMARY KEY,
+    last_active REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_sessions_last_active ON sessions (last_active);
+CREATE TABLE IF NOT EXISTS session_turns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    user_message TEXT NOT NULL,
+    assistant_message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_session_turns_user ON session_turns (user_id, id);
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sesiones en una base SQLite: los últimos max_turns turnos por usuario, con expiración
+    por inactividad y a lo sumo max_sessions usuarios (se descartan los menos recientes).
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        max_turns: int = 6,
+        ttl_seconds: float = 86400.0,
+        max_sessions: int = 10000
+    ):
+        """
+        Inicializa el almacén (la base se abre y se crea en el primer uso).
+
+        Args:
+            database_path: Ruta del archivo SQLite
+            max_turns: Turnos conservados por usuario
+            ttl_seconds: Segundos de inactividad tras los que se descarta la sesión
+            max_sessions: Usuarios conservados como máximo
+        """
+        super().__init__(max_turns, ttl_seconds)
+        self._database_path = database_path
+        self._max_sessions = max_sessions
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-store")
+        self._appends_since_prune = 0
+        self._pruned = 0
+
+    async def get_turns(self, user_id: str) -> List[ConversationTurn]:
+        return await self._run(self._get_turns, user_id)
+
+    async def append_turn(self, user_id: str, user_message: str, assistant_message: str) -> None:
+        await self._run(self._append_turn, user_id, user_message, assistant_message)
+
+    async def clear(self, user_id: str) -> None:
+        await self._run(self._delete_sessions, [user_id])
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    def get_metrics(self, prefix: str) -> Dict[str, float]:
+        return {f"{prefix}_pruned_total": self._pruned}
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """Ejecuta una operación en el hilo de la base."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre la base (en el hilo de la base) y crea el esquema si no existe."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._database_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # Espera a que otro proceso libere la base en lugar de fallar de inmediato
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._prune()
+            logger.info(f"Session store opened at {self._database_path}")
+
+        return self._connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _get_turns(self, user_id: str) -> List[ConversationTurn]:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT last_active FROM sessions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return []
+
+        if row[0] < time.time() - self._ttl_seconds:
+            self._delete_sessions([user_id])
+            return []
+
+        rows = connection.execute(
+            "SELECT user_message, assistant_message FROM session_turns WHERE user_id = ? ORDER BY id",
+            (user_id,)
+        ).fetchall()
+        return [(user_message, assistant_message) for user_message, assistant_message in rows]
+
+    def _append_turn(self, user_id: str, user_message: str, assistant_message: str) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT INTO session_turns (user_id, user_message, assistant_message) VALUES (?, ?, ?)",
+                (user_id, user_message, assistant_message)
+            )
+            # Buffer circular: conservar solo los max_turns turnos más recientes
+            connection.execute(
+                "DELETE FROM session_turns WHERE user_id = ? AND id NOT IN "
+                "(SELECT id FROM session_turns WHERE user_id = ? ORDER BY id DESC LIMIT ?)",
+                (user_id, user_id, self._max_turns)
+            )
+            connection.execute(
+                "INSERT INTO sessions (user_id, last_active) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET last_active = excluded.last_active",
+                (user_id, time.time())
+            )
+
+        self._appends_since_prune += 1
+        if self._appends_since_prune >= PRUNE_INTERVAL:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Descarta las sesiones expiradas y las menos recientes que excedan max_sessions."""
+        self._appends_since_prune = 0
+        connection = self._connection
+        expired = [
+            user_id for user_id, in connection.execute(
+                "SELECT user_id FROM sessions WHERE last_active < ?",
+                (time.time() - self._ttl_seconds,)
+            )
+        ]
+        overflow = [
+            user_id for user_id, in connection.execute(
+                "SELECT user_id FROM sessions WHERE last_active >= ? "
+                "ORDER BY last_active DESC LIMIT -1 OFFSET ?",
+                (time.time() - self._ttl_seconds, self._max_sessions)
+            )
+        ]
+
+        if expired or overflow:
+            self._delete_sessions(expired + overflow)
+            self._pruned += len(expired) + len(overflow)
+            logger.info(f"Pruned {len(expired)} expired and {len(overflow)} least recent sessions")
+
+    def _delete_sessions(self, user_ids: List[str]) -> None:
+        connection = self._connect()
+        with connection:
+            connection.executemany("DELETE FROM session_turns WHERE user_id = ?", [(user_id,) for user_id in user_ids])
+            connection.executemany("DELETE FROM sessions WHERE user_id = ?", [(user_id,) for user_id in user_ids])
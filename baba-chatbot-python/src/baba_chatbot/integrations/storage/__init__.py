@@ -0,0 +1,13 @@
+"""
+Utilidades de almacenamiento local: detección de cambios en archivos y archivos de columnas mapeados
+"""
+from .file_watcher import PollingFileWatcher, compute_signature
+from .mapped_columns import MappedColumnFile, MappedStrings, write_columns
+
+__all__ = [
+    "PollingFileWatcher",
+    "compute_signature",
+    "MappedColumnFile",
+    "MappedStrings",
+    "write_columns"
+]
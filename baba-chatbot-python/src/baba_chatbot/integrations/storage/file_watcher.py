@@ -0,0 +1,116 @@
+"""
+Observador de archivos basado en sondeo de metadatos (mtime y tamaño).
+Permite detectar cambios en archivos o directorios sin dependencias externas.
+"""
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+FileSignature = Tuple[Tuple[str, int, int], ...]
+
+
+def compute_signature(paths: Iterable[str]) -> FileSignature:
+    """
+    Calcula la firma (ruta, mtime, tamaño) de un conjunto de archivos o directorios.
+    Los directorios se recorren recursivamente; las rutas inexistentes se omiten.
+
+    Args:
+        paths: Rutas de archivos o directorios a observar
+
+    Returns:
+        Tupla ordenada con la firma de cada archivo encontrado
+    """
+    entries: List[Tuple[str, int, int]] = []
+
+    for path in paths:
+        if not path:
+            continue
+
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in files:
+                    entries.append(_stat_entry(os.path.join(root, file)))
+        elif os.path.exists(path):
+            entries.append(_stat_entry(path))
+
+    return tuple(sorted(entry for entry in entries if entry is not None))
+
+
+def _stat_entry(path: str) -> Optional[Tuple[str, int, int]]:
+    """Obtiene (ruta, mtime en ns, tamaño) de un archivo o None si desapareció."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+class PollingFileWatcher:
+    """
+    Observa rutas periódicamente e invoca un callback asíncrono cuando su firma cambia.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        on_change: Callable[[], Awaitable[None]],
+        interval_seconds: float = 5.0,
+        name: str = "files"
+    ):
+        """
+        Inicializa el observador.
+
+        Args:
+            paths: Rutas de archivos o directorios a observar
+            on_change: Callback a ejecutar cuando cambian las rutas
+            interval_seconds: Intervalo de sondeo en segundos
+            name: Nombre descriptivo para los logs
+        """
+        self._paths = paths
+        self._on_change = on_change
+        self._interval_seconds = interval_seconds
+        self._name = name
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Inicia el sondeo en segundo plano en el event loop actual."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Watching {self._name} every {self._interval_seconds}s: {self._paths}")
+
+    async def stop(self) -> None:
+        """Detiene el sondeo y espera a que la tarea termine."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Bucle de sondeo: compara firmas y dispara el callback ante cambios."""
+        loop = asyncio.get_running_loop()
+        signature = await loop.run_in_executor(None, compute_signature, self._paths)
+
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+
+            try:
+                current = await loop.run_in_executor(None, compute_signature, self._paths)
+                if current == signature:
+                    continue
+
+                logger.info(f"Change detected in {self._name}, reloading")
+                signature = current
+                await self._on_change()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.error(f"Error handling change in {self._name}: {ex}")
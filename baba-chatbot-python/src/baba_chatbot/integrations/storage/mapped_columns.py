@@ -0,0 +1,215 @@
+"""
+Archivo binario de columnas mapeado en memoria.
+Guarda columnas numéricas (arreglos) y columnas de texto (tabla de offsets + bytes UTF-8)
+para que varios procesos puedan abrir el mismo archivo con mmap y compartir sus páginas.
+
+Formato:
+    MAGIC (8 bytes) | offset del encabezado (uint64) | secciones alineadas a 8 bytes | encabezado JSON
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Union
+
+
+MAGIC = b'BABACOL1'
+
+_PREFIX = struct.Struct('<8sQ')
+_ALIGNMENT = 8
+
+ColumnData = Union[array, List[str]]
+
+
+def write_columns(file_path: str, columns: Dict[str, ColumnData], metadata: Dict[str, Any]) -> int:
+    """
+    Escribe columnas en un archivo binario de forma atómica (archivo temporal + reemplazo),
+    de modo que los procesos que ya lo tienen mapeado conservan la versión anterior.
+
+    Args:
+        file_path: Ruta del archivo a generar
+        columns: Columnas por nombre: arreglos numéricos o listas de cadenas
+        metadata: Metadatos serializables en JSON que se guardan en el encabezado
+
+    Returns:
+        Tamaño del archivo generado en bytes
+    """
+    temp_path = f"{file_path}.tmp"
+    descriptors: Dict[str, Dict[str, Any]] = {}
+
+    with open(temp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, 0))
+
+        for name, column in columns.items():
+            if isinstance(column, array):
+                descriptors[name] = {
+                    "kind": "array",
+                    "typecode": column.typecode,
+                    "itemsize": column.itemsize,
+                    "count": len(column),
+                    "offset": _write_aligned(f, column.tobytes())
+                }
+            else:
+                encoded = [value.encode('utf-8') for value in column]
+                offsets = array('Q', [0])
+                total = 0
+                for value in encoded:
+                    total += len(value)
+                    offsets.append(total)
+
+                descriptors[name] = {
+                    "kind": "strings",
+                    "count": len(encoded),
+                    "offsets": _write_aligned(f, offsets.tobytes()),
+                    "data": _write_aligned(f, b''.join(encoded))
+                }
+
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "metadata": metadata,
+            "columns": descriptors
+        }).encode('utf-8')
+        header_offset = _write_aligned(f, header)
+
+        f.seek(0)
+        f.write(_PREFIX.pack(MAGIC, header_offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_path, file_path)
+    return os.path.getsize(file_path)
+
+
+def _write_aligned(f, data: bytes) -> int:
+    """Escribe datos alineados a 8 bytes y devuelve su offset en el archivo."""
+    padding = -f.tell() % _ALIGNMENT
+    if padding:
+        f.write(b'\0' * padding)
+
+    offset = f.tell()
+    f.write(data)
+    return offset
+
+
+class MappedColumnFile:
+    """
+    Archivo de columnas abierto con mmap de solo lectura.
+    Las columnas se exponen como vistas sobre el mapa: no se copian a memoria privada.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Abre y valida el archivo.
+
+        Args:
+            file_path: Ruta del archivo de columnas
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato esperado
+        """
+        self._file_path = file_path
+
+        with open(file_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_offset = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{file_path} is not a mapped column file")
+
+        header = json.loads(self._map[header_offset:].decode('utf-8'))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{file_path} was written with {header['byteorder']} byte order")
+
+        self._metadata: Dict[str, Any] = header["metadata"]
+        self._columns: Dict[str, Dict[str, Any]] = header["columns"]
+        self._view = memoryview(self._map)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadatos guardados al escribir el archivo."""
+        return self._metadata
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def array(self, name: str) -> memoryview:
+        """
+        Obtiene una columna numérica como vista tipada sobre el mapa.
+
+        Args:
+            name: Nombre de la columna
+
+        Returns:
+            memoryview con el typecode original de la columna
+        """
+        column = self._descriptor(name, "array")
+        typecode = column["typecode"]
+        if array(typecode).itemsize != column["itemsize"]:
+            raise ValueError(f"Column {name} uses an incompatible item size")
+
+        start = column["offset"]
+        end = start + column["count"] * column["itemsize"]
+        return self._view[start:end].cast(typecode)
+
+    def strings(self, name: str) -> 'MappedStrings':
+        """
+        Obtiene una columna de texto que decodifica cada valor al leerlo.
+
+        Args:
+            name: Nombre de la columna
+
+        Returns:
+            Secuencia de cadenas respaldada por el mapa
+        """
+        column = self._descriptor(name, "strings")
+        start = column["offsets"]
+        offsets = self._view[start:start + (column["count"] + 1) * 8].cast('Q')
+        return MappedStrings(self._view, offsets, column["data"])
+
+    def _descriptor(self, name: str, kind: str) -> Dict[str, Any]:
+        """Obtiene la descripción de una columna validando su tipo."""
+        column = self._columns.get(name)
+        if column is None or column["kind"] != kind:
+            raise KeyError(f"Column {name} ({kind}) not found in {self._file_path}")
+        return column
+
+
+class MappedStrings(Sequence):
+    """
+    Columna de texto respaldada por un archivo mapeado.
+    """
+
+    def __init__(self, view: memoryview, offsets: memoryview, data_offset: int):
+        self._view = view
+        self._offsets = offsets
+        self._data_offset = data_offset
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        start = self._data_offset + self._offsets[index]
+        end = self._data_offset + self._offsets[index + 1]
+        return str(self._view[start:end], 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        view = self._view
+        base = self._data_offset
+        offsets = self._offsets
+        text = str(view[base:base + offsets[-1]], 'utf-8')
+
+        # En texto ASCII los offsets en bytes coinciden con los de caracteres
+        if len(text) == offsets[-1]:
+            return map(text.__getitem__, map(slice, offsets[:-1], offsets[1:]))
+
+        return (
+            str(view[base + offsets[index]:base + offsets[index + 1]], 'utf-8')
+            for index in range(len(offsets) - 1)
+        )
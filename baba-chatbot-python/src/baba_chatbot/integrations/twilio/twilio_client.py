@@ -1,13 +1,29 @@
 """
 Cliente para integración con Twilio WhatsApp API.
+Envía mensajes con httpx de forma asíncrona sobre un pool de conexiones keep-alive compartido,
+con concurrencia acotada, reintentos con backoff aleatorio ante 429/5xx y orden garantizado
+de los mensajes a un mismo destinatario.
 """
+import random
+import asyncio
 import logging
-from typing import Optional
-from twilio.rest import Client
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import httpx
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://api.twilio.com"
+
+# Respuestas de Twilio que vale la pena reintentar
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Errores de transporte en los que la solicitud seguro no llegó a Twilio. Ante los demás
+# (timeout de lectura, conexión cortada) Twilio pudo haber aceptado el mensaje y, como su
+# API no tiene clave de idempotencia, reintentar podría enviarlo dos veces
+RETRYABLE_TRANSPORT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
 
 class TwilioClient:
     """
@@ -18,40 +34,158 @@ class TwilioClient:
         self,
         account_sid: str,
         auth_token: str,
-        phone_number: str
+        phone_number: str,
+        base_url: str = DEFAULT_BASE_URL,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 8.0,
+        timeout_seconds: float = 10.0
     ):
         """
         Inicializa el cliente de Twilio.
-        
+
         Args:
             account_sid: SID de la cuenta de Twilio
             auth_token: Token de autenticación de Twilio
             phone_number: Número de teléfono de Twilio (formato: whatsapp:+1234567890)
+            base_url: URL base de la API (permite apuntar a un servidor de pruebas)
+            max_concurrency: Solicitudes simultáneas a Twilio (y conexiones del pool)
+            max_retries: Reintentos ante 429, 5xx o errores al conectar
+            backoff_seconds: Espera base entre reintentos (se duplica en cada intento)
+            max_backoff_seconds: Espera máxima entre reintentos
+            timeout_seconds: Timeout de cada solicitud
         """
-        self._client = Client(account_sid, auth_token)
+        self._messages_path = f"/2010-04-01/Accounts/{account_sid}/Messages.json"
         self._phone_number = phone_number
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(account_sid, auth_token),
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Un lock por destinatario con envíos en curso (se descarta al quedar sin uso)
+        self._recipient_locks: Dict[str, asyncio.Lock] = {}
+        self._recipient_users: Dict[str, int] = {}
+
+        self._sent = 0
+        self._failed = 0
+        self._retries = 0
         logger.info("TwilioClient initialized")
 
-    def send_message(self, to: str, body: str) -> Optional[str]:
+    async def send_message(self, to: str, body: str) -> Optional[str]:
         """
         Envía un mensaje de WhatsApp a través de Twilio.
-        
+        Los mensajes a un mismo destinatario se envían uno a la vez en el orden en que se
+        solicitaron; los de destinatarios distintos se envían en paralelo.
+
         Args:
             to: Número de destino (formato: whatsapp:+1234567890)
             body: Contenido del mensaje
-            
+
         Returns:
             SID del mensaje enviado o None si hubo error
         """
+        async with self._recipient(to):
+            return await self._send_with_retries(to, body)
+
+    async def aclose(self) -> None:
+        """Cierra el pool de conexiones."""
+        await self._client.aclose()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Obtiene métricas de los envíos.
+
+        Returns:
+            Diccionario de nombre de métrica a valor
+        """
+        return {
+            "twilio_messages_sent_total": self._sent,
+            "twilio_messages_failed_total": self._failed,
+            "twilio_retries_total": self._retries,
+            "twilio_pending_recipients": len(self._recipient_locks)
+        }
+
+    @asynccontextmanager
+    async def _recipient(self, to: str) -> AsyncIterator[None]:
+        """Reserva el turno de envío de un destinatario (FIFO)."""
+        lock = self._recipient_locks.get(to)
+        if lock is None:
+            lock = self._recipient_locks[to] = asyncio.Lock()
+        self._recipient_users[to] = self._recipient_users.get(to, 0) + 1
+
         try:
-            message = self._client.messages.create(
-                from_=self._phone_number,
-                body=body,
-                to=to
+            async with lock:
+                yield
+        finally:
+            self._recipient_users[to] -= 1
+            if not self._recipient_users[to]:
+                del self._recipient_users[to]
+                del self._recipient_locks[to]
+
+    async def _send_with_retries(self, to: str, body: str) -> Optional[str]:
+        """
+        Envía un mensaje reintentando ante 429, 5xx o errores al conectar. Los errores
+        posteriores al envío de la solicitud no se reintentan para no duplicar el mensaje.
+
+        Args:
+            to: Número de destino
+            body: Contenido del mensaje
+
+        Returns:
+            SID del mensaje enviado o None si hubo error
+        """
+        data = {"From": self._phone_number, "To": to, "Body": body}
+
+        for attempt in range(self._max_retries + 1):
+            retry_after: Optional[float] = None
+            try:
+                async with self._semaphore:
+                    response = await self._client.post(self._messages_path, data=data)
+            except httpx.TransportError as ex:
+                error = f"{type(ex).__name__}: {ex}"
+                if not isinstance(ex, RETRYABLE_TRANSPORT_ERRORS):
+                    break
+            else:
+                if response.is_success:
+                    sid = response.json().get("sid")
+                    self._sent += 1
+                    logger.info(f"Message sent to {to}, SID: {sid}")
+                    return sid
+
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    break
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt == self._max_retries:
+                break
+
+            # Backoff exponencial con jitter completo (Retry-After de Twilio tiene prioridad)
+            self._retries += 1
+            delay = retry_after if retry_after is not None else random.uniform(
+                0,
+                min(self._max_backoff_seconds, self._backoff_seconds * 2 ** attempt)
             )
-            logger.info(f"Message sent to {to}, SID: {message.sid}")
-            return message.sid
-        except Exception as ex:
-            logger.error(f"Error sending message to {to}: {ex}")
-            return None
+            logger.warning(f"Retrying message to {to} in {delay:.2f}s after {error}")
+            await asyncio.sleep(delay)
+
+        self._failed += 1
+        logger.error(f"Error sending message to {to}: {error}")
+        return None
 
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Convierte el encabezado Retry-After (en segundos) acotándolo a la espera máxima."""
+        try:
+            return min(max(float(value), 0.0), self._max_backoff_seconds) if value else None
+        except ValueError:
+            return None